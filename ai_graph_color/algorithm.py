@@ -1,43 +1,138 @@
+import os
+import random
+
+from checkpoint import load_checkpoint, save_checkpoint
+from graph import as_graph
+
+
 class LimitedAlgorithm:
     """
     Handles the direct running of algorithms as generators and saving
     their intermediate results and setup.
+
+    Given a checkpoint path, the algorithm's state is saved there every
+    so many iterations, and a run started with a checkpoint already at
+    the path continues from it instead of starting over.
     """
-    def __init__(self, module, problem, setup, params):
+    def __init__(self, module, problem, setup, params, checkpoint_path=None,
+                 checkpoint_interval=None):
         """
         :param module: the module of the algorithm to run
         :type module: module
-        :param problem: the problem to run with the algorithm
-        :type problem: object
+        :param problem: the graph to run the algorithm on, which is
+            made into a Graph if it isn't one
+        :type problem: list[list[int]] or Graph
         :param setup: the pre-setup objects useful for running
             any algorithm
         :type setup: one of {Evaluation, TestRun}
         :param params: the parameters to the algorithm
         :type params: map<str, object>
+        :param checkpoint_path: the path to save checkpoints to and
+            resume from, or None to not checkpoint
+        :type checkpoint_path: str
+        :param checkpoint_interval: the number of iterations between
+            checkpoints, or None to only save them when asked to
+        :type checkpoint_interval: int
         """
         self.setup = setup
-        self.problem = problem
+        self.problem = as_graph(problem)
         self.module = module
 
         self.params = self.module.params.copy()
         self.params.update(params)
 
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_interval = checkpoint_interval
+        if checkpoint_path is not None and os.path.exists(checkpoint_path):
+            self.resume(load_checkpoint(checkpoint_path))
+        self.last_checkpoint = self.setup.counter.counter
+        self.limit = self.setup.counter.limit
+
         self.runner = module.run(self.problem, self.setup, self.params)
 
         self.output_history = []
 
     def set_limit(self, limit):
+        self.limit = limit
         self.setup.counter.limit = limit
 
     def next_output(self):
         """
         Get the next intermediate output from the algorithm, or its
         final output if it is done.
+
+        While checkpointing, the algorithm is stopped at each checkpoint
+        along the way to save its state, then continued.
         """
-        try:
-            output = self.runner.next()
-        except StopIteration:
-            output = None
+        counter = self.setup.counter
+        output = None
+        while True:
+            checkpoint_due = None
+            if (self.checkpoint_path is not None and
+                    self.checkpoint_interval is not None):
+                checkpoint_due = (self.last_checkpoint +
+                                  self.checkpoint_interval)
+                if self.limit is not None and checkpoint_due >= self.limit:
+                    checkpoint_due = None
+            counter.limit = self.limit
+            if checkpoint_due is not None:
+                counter.limit = checkpoint_due
+
+            try:
+                output = self.runner.next()
+            except StopIteration:
+                # the output at the last checkpoint, if any, was the final
+                # one
+                break
+            if checkpoint_due is None or counter.counter < checkpoint_due:
+                break
+            self.save_checkpoint()
+        counter.limit = self.limit
 
         self.output_history.append(output)
         return output
+
+    def save_checkpoint(self):
+        """
+        Saves the algorithm's state as it is at its last output, along with
+        the iterations run and the state of the random number generator.
+
+        :return: Nothing, but the checkpoint is written
+        """
+        if self.setup.snapshot is None:
+            raise Exception("{} can't be checkpointed with its params".format(
+                self.module.__name__
+            ))
+        version, internal_state, gauss_next = random.getstate()
+        save_checkpoint(self.checkpoint_path, {
+            'algorithm': self.module.__name__.split('.')[-1],
+            'vertices': len(self.problem),
+            'colors': self.params.get('colors'),
+            'counter': self.setup.counter.counter,
+            'random': [version, list(internal_state), gauss_next],
+            'state': self.setup.snapshot()
+        })
+        self.last_checkpoint = self.setup.counter.counter
+
+    def resume(self, checkpoint):
+        """
+        Sets the algorithm up to continue from a checkpoint.
+
+        :param checkpoint: the checkpoint
+        :type checkpoint: dict
+        :return: Nothing, but the params, counter and random number
+            generator are restored
+        """
+        run = (self.module.__name__.split('.')[-1], len(self.problem),
+               self.params.get('colors'))
+        saved = (checkpoint['algorithm'], checkpoint['vertices'],
+                 checkpoint['colors'])
+        if run != saved:
+            raise Exception(
+                "Checkpoint of {} can't be resumed by {}".format(saved, run)
+            )
+
+        version, internal_state, gauss_next = checkpoint['random']
+        random.setstate((version, tuple(internal_state), gauss_next))
+        self.setup.counter.counter = checkpoint['counter']
+        self.params['resume'] = checkpoint['state']
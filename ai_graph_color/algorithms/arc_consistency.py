@@ -0,0 +1,131 @@
+"""
+Arc consistency for the backtracking algorithms, maintained after every
+decision by propagating the domains that shrink to a single color.
+"""
+from collections import deque
+
+from color_domains import color_bit, contains, lowest_color, popcount, without
+
+
+class ArcConsistency:
+    """
+    An AC-3 engine for the constraints that neighbors get different
+    colors. A color of a vertex only loses its support across an edge
+    once the neighbor has no other color left, so only vertices whose
+    domain is down to one color need their arcs revised.
+
+    Those vertices wait in a first in, first out queue, alongside a
+    bitmap of which are in it so that none is queued twice. Each vertex
+    propagated is counted, so that the work done between decisions is
+    charged against the counter's limit. The charge stops one short of
+    the limit, leaving the search's own count of the decision to reach
+    it, so that the search stops there rather than going over.
+    """
+    def __init__(self, graph, counter):
+        """
+        :param graph: the graph being colored
+        :type graph: Graph
+        :param counter: the counter to report propagations to
+        :type counter: Counter
+        """
+        self.graph = graph
+        self.counter = counter
+        self.queue = deque()
+        self.in_queue = bytearray(len(graph))
+
+    def assign(self, trail, graph, vertex, color):
+        """
+        Colors a vertex, then maintains arc consistency around it.
+
+        :param trail: the trail to record the changes on
+        :type trail: Trail
+        :param graph: the graph being colored
+        :type graph: Graph
+        :param vertex: the vertex to color
+        :type vertex: int
+        :param color: the color to give it
+        :type color: int
+        :rtype: bool
+        :return: False if a vertex has no colors left, True otherwise
+        """
+        trail.assign(vertex, color)
+        trail.set_domain(vertex, color_bit(color))
+        self.enqueue(vertex)
+        return self.propagate(trail)
+
+    def refute(self, trail, graph, vertex, color):
+        """
+        Rules out a color for a vertex, then maintains arc consistency
+        around it if it has only one color left.
+
+        :param trail: the trail to record the changes on
+        :type trail: Trail
+        :param graph: the graph being colored
+        :type graph: Graph
+        :param vertex: the vertex
+        :type vertex: int
+        :param color: the color to rule out
+        :type color: int
+        :rtype: bool
+        :return: False if a vertex has no colors left, True otherwise
+        """
+        domain = without(trail.domains[vertex], color)
+        trail.set_domain(vertex, domain)
+        if domain == 0:
+            return False
+        if popcount(domain) == 1:
+            self.enqueue(vertex)
+        return self.propagate(trail)
+
+    def enqueue(self, vertex):
+        """
+        Queues a vertex to have its arcs revised, unless it already is.
+
+        :param vertex: the vertex
+        :type vertex: int
+        :return: Nothing, but the queue is updated
+        """
+        if not self.in_queue[vertex]:
+            self.in_queue[vertex] = 1
+            self.queue.append(vertex)
+
+    def propagate(self, trail):
+        """
+        Removes the only color of each queued vertex from the domains of
+        its neighbors, queueing those left with one color in turn, and
+        stops as soon as any domain is wiped out.
+
+        :param trail: the trail to record the changes on
+        :type trail: Trail
+        :rtype: bool
+        :return: False if a vertex has no colors left, True otherwise
+        """
+        graph, queue, in_queue = self.graph, self.queue, self.in_queue
+        domains = trail.domains
+        propagated = 0
+        consistent = True
+        while consistent and len(queue) > 0:
+            vertex = queue.popleft()
+            in_queue[vertex] = 0
+            propagated += 1
+
+            color = lowest_color(domains[vertex])
+            for neighbor in graph[vertex]:
+                if contains(domains[neighbor], color):
+                    domain = without(domains[neighbor], color)
+                    trail.set_domain(neighbor, domain)
+                    if domain == 0:
+                        consistent = False
+                        break
+                    if popcount(domain) == 1:
+                        self.enqueue(neighbor)
+
+        while len(queue) > 0:
+            in_queue[queue.pop()] = 0
+
+        counter = self.counter
+        if counter.limit is not None:
+            propagated = min(propagated,
+                             max(0, counter.limit - counter.counter - 1))
+        counter.increment(propagated)
+        return consistent
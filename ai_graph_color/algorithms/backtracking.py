@@ -1,6 +1,43 @@
-params = {}  # default params
+from ai_graph_color.graph import as_graph
+from backtracking_search import search
+from color_domains import colors, color_bit, contains, intersection, without
+from nogoods import NogoodStore
+from parallel_search import parallel_search
+from restarts import restart_schedule
+
+params = {
+    'backjumping': False, 'nogoods': 0, 'workers': 1, 'prefix': [],
+    'restarts': None, 'restart_unit': 100, 'restart_factor': 1.5,
+    'resume': None
+}  # default params
 # :param 'colors': the number of colors to use for colorings
 # :type 'colors': int
+# :param 'backjumping': whether to jump back to the latest decision that
+#   caused a dead end, rather than the one just before it
+# :type 'backjumping': bool
+# :param 'nogoods': the most nogoods to learn while backjumping and keep
+#   to prune the search with, or 0 to learn none, which can only be more
+#   than 0 with 'backjumping'
+# :type 'nogoods': int
+# :param 'workers': the number of processes to search with, splitting the
+#   search between them if more than one
+# :type 'workers': int
+# :param 'prefix': colors to give vertices before searching, as (vertex,
+#   color) pairs
+# :type 'prefix': list[tuple(int, int)]
+# :param 'restarts': the schedule to restart the search on with a new
+#   random order of vertices, 'luby' or 'geometric', or None to never
+#   restart
+# :type 'restarts': str
+# :param 'restart_unit': the number of failed decisions before the first
+#   restart
+# :type 'restart_unit': int
+# :param 'restart_factor': how much longer each run is than the one before
+#   it, on a geometric schedule
+# :type 'restart_factor': float
+# :param 'resume': the state to continue the search from, as saved in a
+#   checkpoint, or None to start from scratch
+# :type 'resume': dict
 
 
 def run(graph, setup, params):
@@ -10,124 +47,89 @@ def run(graph, setup, params):
     :param setup: Setup that contains a logger and a counter
     :type setup: Setup
     :param graph: The graph to color
-    :type graph: list[list[int]]
+    :type graph: list[list[int]] or Graph
     :param num_colors: number of colors to try and color with
     :type num_colors: int
     :rtype: dict
     :return: the colored graph
     """
-    num_colors = params['colors']
-    coloring, avail_colors, stack = init(graph, num_colors)
-
-    while True:
-        if len(stack) == 0 or complete(coloring, graph):
-            if setup:
-                setup.logger.debug(
-                    "Finished, final coloring:{}".format(coloring)
-                )
-            yield coloring
-        cur_node = stack[len(stack)-1][1]
-        coloring[cur_node] = stack[len(stack)-1][3]
-        avail_colors[cur_node] -= {coloring[cur_node]}
-        if setup is not None:
-            setup.logger.debug(
-                'Coloring node:{} color{}'.format(
-                    cur_node, stack[len(stack) - 1][3]
-                )
-            )
-            if setup.counter.increment():
-                setup.logger.debug(
-                    "Preempted with coloring:{}".format(coloring)
-                )
-                yield coloring
-
-        choose_next_node(
-            stack, coloring, graph, avail_colors, num_colors, setup
-        )
+    graph = as_graph(graph)
+    if params['workers'] > 1:
+        return parallel_search(graph, setup, __name__, params, assign)
+    return search(
+        graph, setup, params['colors'], min_color_conflicts, assign, refute,
+        culprits if params['backjumping'] else None,
+        NogoodStore(params['nogoods']) if params['nogoods'] > 0 else None,
+        params['prefix'],
+        restart_schedule(
+            params['restarts'], params['restart_unit'],
+            params['restart_factor']
+        ),
+        params['resume']
+    )
 
 
-def init(graph, num_colors):
+def assign(trail, graph, cur_node, color):
     """
-    Initializes the backtracking algorithm
-    :param graph: graph to color
-    :type graph: list[list[int]]
-    :param num_colors: the number of colors to color with
-    :type num_colors: int
-    :rtype: tuple
-    :return: the inital states of coloring, avail_colors, and stack
+    Colors a node, unless one of its neighbors already has that color
+
+    :param trail: the trail to record the change on
+    :type trail: Trail
+    :param graph: the graph to color
+    :type graph: Graph
+    :param cur_node: the node to color
+    :type cur_node: int
+    :param color: the color to give it
+    :type color: int
+    :rtype: bool
+    :return: False if a neighbor has the color, True otherwise
     """
-    avail_colors = []
-    for _ in xrange(len(graph)):
-        avail_colors.append(set(xrange(num_colors)))
-    coloring = dict()
-    stack = list()
-    choose_next_node(stack, coloring, graph, avail_colors, num_colors)
-    return (
-        coloring,
-        avail_colors,
-        stack
-    )
+    if trail.queue.color_counts[cur_node][color] > 0:
+        return False
+    trail.assign(cur_node, color)
+    trail.set_domain(cur_node, color_bit(color))
+    return True
 
 
-def choose_next_node(
-        stack, coloring, graph, avail_colors, num_colors, setup=None):
+def culprits(trail, graph, cur_node, color):
     """
-    Chooses the next node and its coloring and adds it to the stack
+    Finds the neighbors that stopped a node from being given a color
 
-    :param setup: the setup containing a logger and a counter
-    :type setup: Setup
-    :param stack: the current stack of the program
-    :type stack: list[dict{int:int}, int, set{int}, int}]
-    :param coloring: the current coloring of the program
-    :type coloring: dict{int:int}
-    :param graph: the current graph to color
-    :type graph: list[list[int]]
-    :param avail_colors: the available colors to color with
-    :type avail_colors: set{int}
-    :param num_colors: the number of colors to color with
-    :type num_colors: int
-    :rtype: None
-    :return: None
+    :param trail: the trail of the search
+    :type trail: Trail
+    :param graph: the graph to color
+    :type graph: Graph
+    :param cur_node: the node that couldn't be colored
+    :type cur_node: int
+    :param color: the color it couldn't be given
+    :type color: int
+    :rtype: set(int)
+    :return: the neighbors that already have the color
     """
-    next_node = (
-        min_remaining_var(coloring, graph)
+    coloring = trail.queue.coloring
+    return set(
+        node for node in graph[cur_node] if coloring.get(node) == color
     )
 
-    while next_node is None:
-        if len(stack) == 0:
-            if setup:
-                setup.logger.debug('Stack is empty')
-            return
-        if setup:
-            setup.logger.debug('About to backtrack..')
-            setup.logger.debug('Current Stack {}'.format(stack))
-        stack.pop()
-        if setup:
-            setup.logger.debug('Just backtracked..')
-            setup.logger.debug('Current Stack {}'.format(stack))
-        next_node = (
-            min_remaining_var(coloring, graph)
-        )
 
-    chosen_color = min_color_conflicts(
-        avail_colors, graph, next_node, num_colors
-    )
+def refute(trail, graph, cur_node, color):
+    """
+    Rules out a color for a node after every coloring with it has failed
 
-    if len(avail_colors[next_node]) > 0:
-        if setup:
-            setup.logger.debug('About to append to the stack..')
-            setup.logger.debug('Current Stack {}'.format(stack))
-        stack.append(
-            [
-                coloring,
-                next_node,
-                avail_colors[next_node],
-                chosen_color
-            ]
-        )
-        if setup:
-            setup.logger.debug('Added to the stack..')
-            setup.logger.debug('Current Stack {}'.format(stack))
+    :param trail: the trail to record the change on
+    :type trail: Trail
+    :param graph: the graph to color
+    :type graph: Graph
+    :param cur_node: the node
+    :type cur_node: int
+    :param color: the color to rule out
+    :type color: int
+    :rtype: bool
+    :return: False if the node has no colors left, True otherwise
+    """
+    domain = without(trail.domains[cur_node], color)
+    trail.set_domain(cur_node, domain)
+    return domain != 0
 
 
 def min_color_conflicts(avail_colors, graph, cur_node, num_color):
@@ -143,62 +145,25 @@ def min_color_conflicts(avail_colors, graph, cur_node, num_color):
     :rtype: int
     :return: the color that causes the lease number of conflict
     """
-    available_color_count = [[0, i] for i in xrange(num_color)]
-    all_colors = set(range(num_color))
+    # colors the node can't have rank below every color it can have
+    available_color_count = [
+        [0 if contains(avail_colors[cur_node], i) else -1, i]
+        for i in xrange(num_color)
+    ]
     for node in graph[cur_node]:
-        available_colors = (
-            avail_colors[cur_node]-(all_colors - avail_colors[node])
+        available_colors = intersection(
+            avail_colors[cur_node], avail_colors[node]
         )
-        for color in available_colors:
+        for color in colors(available_colors):
             available_color_count[color][0] += 1
     return max(available_color_count)[1]
 
 
-def complete(coloring, graph):
-    """
-    Checks if the problem is solved
-
-    :param coloring: the coloring dictionary
-    :type coloring: dict{int: int}
-    :param graph: the graph to color
-    :type graph: [[(int, {int}]]
-    :rtype: bool
-    :return: True if problem is solved false otherwise
-    """
-    return len(coloring) == len(graph)
-
-
-def min_remaining_var(coloring, graph):
-    """
-    Finds the minimum remaining variable in the graph
-       - The node connected to the most nodes with colors
-
-    :param coloring: list of chosen colors
-    :type coloring: dict{int : int}
-    :param graph: graph to color
-    :type graph: [[(int, {int}]]
-    :rtype: int
-    :return: the index of the MRV
-    """
-    num_neighbors_colored = list()
-
-    for index, adj_list in enumerate(graph):
-        colored_neighbors = set()
-        if coloring.get(index) is not None:
-            continue
-        for node in adj_list:
-            if coloring.get(node) is None:
-                colored_neighbors.add(coloring.get(node))
-        num_neighbors_colored.append(
-            (len(colored_neighbors), len(adj_list), index)
-        )
-    return max(num_neighbors_colored)[2] if num_neighbors_colored else None
-
-
 if __name__ == '__main__':
     from ai_graph_color import problem_generator
     from ai_graph_color import setup
-    generated_problem = problem_generator.generate_graph(100)
+    from ai_graph_color.graph import Graph
+    generated_problem = Graph(problem_generator.generate_graph(100))
     print generated_problem
     print (
         run(generated_problem, setup.Evaluation(), {'colors': 4}).next()
@@ -0,0 +1,255 @@
+"""
+The search shared by the backtracking algorithms, which differ only in
+how they choose a color and what they infer from each decision.
+"""
+from color_domains import full_domain
+from saturation import SaturationQueue
+from trail import Trail
+
+
+def search(graph, setup, num_colors, choose_color, assign, refute,
+           culprits=None, nogoods=None, prefix=(), restarts=None,
+           resume=None):
+    """
+    Searches for a coloring by branching on whether the uncolored vertex
+    with the highest saturation gets the color chosen for it. The changes
+    made by each decision are recorded on a trail, so backtracking out of
+    a decision undoes exactly those changes before ruling the color out.
+
+    Given a way to explain failed colorings, it backjumps instead: each
+    vertex keeps a conflict set of the earlier decisions that ruled out
+    its colors, and a dead end jumps straight back to the latest decision
+    in its conflict set, skipping the decisions in between. The decisions
+    in that conflict set can't all stand, so they are also learned as a
+    nogood if given a store for them, and each color is checked against
+    the store before it is tried.
+
+    Given a restart schedule, ties between vertices are broken randomly,
+    and once a run has had as many decisions fail as the schedule allows
+    the search starts over with a new random order, keeping any nogoods
+    it learned.
+
+    Its state can be snapshotted through setup.snapshot whenever it has
+    been preempted, and a search given that state continues from it, by
+    redoing the decisions and refutations that led there.
+
+    :param graph: the graph to color
+    :type graph: Graph
+    :param setup: the setup containing the logger and the counter
+    :type setup: Setup
+    :param num_colors: the number of colors to color with
+    :type num_colors: int
+    :param choose_color: picks the color to try for a vertex from its
+        domain, given the domains, graph, vertex and number of colors
+    :type choose_color: function(list[int], Graph, int, int) -> int
+    :param assign: colors a vertex on the trail, given the trail, graph,
+        vertex and color, and returns False if that is inconsistent
+    :type assign: function(Trail, Graph, int, int) -> bool
+    :param refute: removes a color from a vertex's domain on the trail,
+        given the same arguments, and returns False if that is
+        inconsistent
+    :type refute: function(Trail, Graph, int, int) -> bool
+    :param culprits: finds the colored vertices that made assign fail,
+        given the same arguments, or None to backtrack chronologically.
+        The number of decisions backjumping skips over is reported in
+        setup.stats['backjumping']
+    :type culprits: function(Trail, Graph, int, int) -> set(int)
+    :param nogoods: the store to learn nogoods in while backjumping, whose
+        statistics are reported in setup.stats['nogoods'], which can only
+        be given along with culprits to learn them from
+    :type nogoods: NogoodStore
+    :param prefix: colors to give vertices before searching, which are
+        never backtracked over
+    :type prefix: list[tuple(int, int)]
+    :param restarts: the number of decisions that can fail in each run
+        before restarting, or None to never restart
+    :type restarts: iterator(int)
+    :param resume: the state to continue from, as snapshotted, or None
+    :type resume: dict
+    :rtype: generator(dict)
+    :return: the coloring each time the counter reaches its limit, then
+        the final coloring, which is empty if there is none
+    """
+    if nogoods is not None and culprits is None:
+        raise Exception("Nogoods can only be learned while backjumping")
+
+    full = full_domain(num_colors)
+    queue = SaturationQueue(graph, num_colors)
+    trail = Trail([full] * len(graph), queue)
+    coloring = queue.coloring
+    # the vertex, color, trail mark and number of steps before each
+    # decision being explored
+    decisions = []
+    # the vertex, color and whether it was a decision, rather than a
+    # refutation, of each step taken since the start, to redo on resuming
+    steps = []
+    # the conflict set of each vertex, and the decisions behind a failure
+    conflicts = {}
+    reason = None
+    learned = False
+    # the number of decisions backjumping skipped over, reported in
+    # setup.stats['backjumping']
+    backjumping = {'skipped': 0}
+    # checked once, rather than by every call to the logger
+    tracing = setup.tracing
+    if culprits is not None:
+        setup.stats['backjumping'] = backjumping
+    if nogoods is not None:
+        setup.stats['nogoods'] = nogoods.stats
+
+    for vertex, color in prefix:
+        if not assign(trail, graph, vertex, color):
+            setup.logger.debug('No coloring starting from: %s', prefix)
+            trail.undo(0)
+            yield coloring
+            return
+
+    # restarts undo back to here
+    start = trail.mark()
+    run_length = None
+    runs = 0
+    if restarts is not None and resume is None:
+        queue.randomize_ties()
+        run_length = next(restarts)
+        runs = 1
+    run_failures = 0
+
+    def snapshot():
+        return {
+            'steps': [value for step in steps for value in step],
+            'conflicts': dict(
+                (vertex, sorted(conflict)) for vertex, conflict
+                in conflicts.items()
+            ),
+            'nogoods': ([[value for pair in sorted(nogood) for value in pair]
+                         for nogood in nogoods.nogoods]
+                        if nogoods is not None else []),
+            'nogood_stats': (dict(nogoods.stats) if nogoods is not None
+                             else {}),
+            'tiebreaks': queue.tiebreaks if restarts is not None else [],
+            'runs': runs,
+            'run_failures': run_failures,
+            'skipped': backjumping['skipped']
+        }
+    setup.snapshot = snapshot
+
+    if resume is not None:
+        # redoing the steps isn't counted again
+        counted = setup.counter.counter
+        if restarts is not None:
+            queue.tiebreaks = resume['tiebreaks']
+            queue.rebuild()
+            for _ in xrange(resume['runs']):
+                run_length = next(restarts)
+            runs = resume['runs']
+            run_failures = resume['run_failures']
+        for index in xrange(0, len(resume['steps']), 3):
+            vertex, color, decided = resume['steps'][index:index + 3]
+            if decided:
+                decisions.append((vertex, color, trail.mark(), len(steps)))
+                assign(trail, graph, vertex, color)
+            else:
+                refute(trail, graph, vertex, color)
+            steps.append((vertex, color, decided))
+        conflicts.update(
+            (vertex, set(conflict)) for vertex, conflict
+            in resume['conflicts'].items()
+        )
+        if nogoods is not None:
+            for nogood in resume['nogoods']:
+                nogoods.add(frozenset(zip(nogood[::2], nogood[1::2])))
+            nogoods.stats.update(resume['nogood_stats'])
+        backjumping['skipped'] = resume['skipped']
+        setup.counter.counter = counted
+
+    while True:
+        if run_length is not None and run_failures >= run_length:
+            setup.logger.debug('Restarting after %s failures', run_failures)
+            trail.undo(start)
+            del decisions[:]
+            del steps[:]
+            conflicts.clear()
+            queue.randomize_ties()
+            run_length = next(restarts)
+            runs += 1
+            run_failures = 0
+
+        vertex = queue.next_vertex()
+        if vertex is None:
+            setup.logger.debug('Finished, final coloring: %s', coloring)
+            setup.logger.debug('Skipped %s decisions',
+                               backjumping['skipped'])
+            yield coloring
+            return
+
+        if culprits is not None and trail.domains[vertex] == full:
+            conflicts[vertex] = set()
+        color = choose_color(trail.domains, graph, vertex, num_colors)
+        decisions.append((vertex, color, trail.mark(), len(steps)))
+        steps.append((vertex, color, 1))
+        nogood = None
+        if nogoods is not None:
+            nogood = nogoods.find(coloring, vertex, color)
+        if nogood is not None:
+            if tracing:
+                setup.logger.debug('Coloring node: %s color: %s is a nogood',
+                                   vertex, color, extra={'event': 'decision'})
+            consistent = False
+            reason = set(other for other, _ in nogood)
+            learned = False
+        else:
+            consistent = assign(trail, graph, vertex, color)
+            if tracing:
+                setup.logger.debug('Coloring node: %s color: %s',
+                                   vertex, color, extra={'event': 'decision'})
+            if not consistent and culprits is not None:
+                reason = culprits(trail, graph, vertex, color)
+                reason.add(vertex)
+                learned = False
+
+        jumped = 0
+        if not consistent:
+            run_failures += 1
+        while not consistent:
+            if len(decisions) == 0:
+                trail.undo(0)
+                backjumping['skipped'] += jumped
+                setup.logger.debug('No coloring with %s colors', num_colors)
+                setup.logger.debug('Skipped %s decisions',
+                                   backjumping['skipped'])
+                yield coloring
+                return
+            vertex, color, mark, num_steps = decisions.pop()
+            if culprits is not None and vertex not in reason:
+                jumped += 1
+                continue
+
+            if nogoods is not None and learned:
+                nogoods.add(frozenset(
+                    (other, color if other == vertex else coloring[other])
+                    for other in reason
+                ))
+            trail.undo(mark)
+            del steps[num_steps:]
+            if jumped > 0:
+                if tracing:
+                    setup.logger.debug('Backjumped over %s decisions', jumped)
+                backjumping['skipped'] += jumped
+                jumped = 0
+            if tracing:
+                setup.logger.debug(
+                    'Backtracked, ruling out color: %s for node: %s',
+                    color, vertex, extra={'event': 'backtrack'}
+                )
+            consistent = refute(trail, graph, vertex, color)
+            steps.append((vertex, color, 0))
+
+            if culprits is not None:
+                reason.discard(vertex)
+                conflicts.setdefault(vertex, set()).update(reason)
+                reason = set(conflicts[vertex])
+                learned = True
+
+        if setup.counter.increment():
+            setup.logger.debug('Preempted with coloring: %s', coloring)
+            yield coloring
@@ -0,0 +1,99 @@
+"""
+Color domains for the backtracking algorithms, stored as integer bitmasks
+where bit c is set while color c is still available to a vertex.
+"""
+
+
+def full_domain(num_colors):
+    """
+    :param num_colors: the number of colors to color with
+    :type num_colors: int
+    :rtype: int
+    :return: the domain holding every color
+    """
+    return (1 << num_colors) - 1
+
+
+def color_bit(color):
+    """
+    :param color: a color
+    :type color: int
+    :rtype: int
+    :return: the domain holding only the color
+    """
+    return 1 << color
+
+
+def without(domain, color):
+    """
+    :param domain: a domain
+    :type domain: int
+    :param color: the color to remove
+    :type color: int
+    :rtype: int
+    :return: the domain without the color
+    """
+    return domain & ~(1 << color)
+
+
+def intersection(domain_a, domain_b):
+    """
+    :param domain_a: a domain
+    :type domain_a: int
+    :param domain_b: another domain
+    :type domain_b: int
+    :rtype: int
+    :return: the domain of the colors in both domains
+    """
+    return domain_a & domain_b
+
+
+def contains(domain, color):
+    """
+    :param domain: a domain
+    :type domain: int
+    :param color: a color
+    :type color: int
+    :rtype: bool
+    :return: whether the color is in the domain
+    """
+    return (domain >> color) & 1 == 1
+
+
+def popcount(domain):
+    """
+    :param domain: a domain
+    :type domain: int
+    :rtype: int
+    :return: the number of colors in the domain
+    """
+    count = 0
+    while domain:
+        domain &= domain - 1
+        count += 1
+    return count
+
+
+def lowest_color(domain):
+    """
+    :param domain: a domain, which must not be empty
+    :type domain: int
+    :rtype: int
+    :return: the smallest color in the domain
+    """
+    return (domain & -domain).bit_length() - 1
+
+
+def colors(domain):
+    """
+    Generates the colors in a domain, smallest first.
+
+    :param domain: a domain
+    :type domain: int
+    :rtype: generator(int)
+    :return: the colors in the domain
+    """
+    while domain:
+        lowest = domain & -domain
+        yield lowest.bit_length() - 1
+        domain ^= lowest
@@ -3,13 +3,16 @@ This file will use a genetic algorithm to solve graph coloring
 """
 import random
 
+from ai_graph_color.graph import as_graph
+
 params = {
     'colors': 4,
     'population_size': 1000,
     'mutation': 0.05,
     'tournament_size': 20,
     'children_per_generation': 20,
-    'crossover_rate': 0.25
+    'crossover_rate': 0.25,
+    'resume': None
 }
 
 
@@ -18,7 +21,7 @@ def generate_initial_population(graph, population_size, num_colors):
     Randomly initializes population, each as a potential solution
 
     :param graph: the adjacency list of nodes to be colored
-    :type: list[list[int]]
+    :type: Graph
     :param population_size: the number of potential solutions to generate
     :type: int
     :param num_colors: number of colors the program attemps
@@ -57,13 +60,15 @@ def tournament_selection(population, tournament_size,
     :rtype: list[tuple(int,list[int])]
     """
     winners = []
+    if setup.tracing:
+        max_fitness = best_fitness(population)
     for i in range(children_per_generation):
         tournament = random.sample(population, tournament_size)
         winners.append(min(tournament, key=lambda i: i[0]))
-        setup.logger.debug('Holding tournament %s, picked winner ' +
-                           'with fitness %s out of a max fitness of %s.',
-                           i, min(tournament, key=lambda i: i[0]),
-                           best_fitness(population))
+        if setup.tracing:
+            setup.logger.debug('Holding tournament %s, picked winner ' +
+                               'with fitness %s out of a max fitness of %s.',
+                               i, winners[-1], max_fitness)
 
     return winners
 
@@ -73,7 +78,7 @@ def crossover(graph, parents, children_per_generation, crossover_rate, setup):
     Mixes the genome of 2 parents to create 2 children
 
     :param graph: the adjacency list of nodes to be colored
-    :type: list[list[int]]
+    :type: Graph
     :param parents: the previously selected solutions,
         used to create children
     :type: list[tuple(int,list[int])]
@@ -103,8 +108,9 @@ def crossover(graph, parents, children_per_generation, crossover_rate, setup):
                         crossover_area.add(neighbor)
                         to_visit.append(neighbor)
 
-        setup.logger.debug('Performing crossover, crossover area: %s',
-                           crossover_area)
+        if setup.tracing:
+            setup.logger.debug('Performing crossover, crossover area: %s',
+                               crossover_area)
         children.extend([
             (None, [
                 (parent_pair[p][1][i] if i in crossover_area
@@ -133,6 +139,7 @@ def mutation(population, mutation_rate, num_colors, setup):
     :return: the population
     :rtype: list[tuple(int,list[int])]
     """
+    tracing = setup.tracing
     solutions = [individual[1] for individual in population]
     for index, solution in enumerate(solutions):
         for node in solution:
@@ -140,9 +147,10 @@ def mutation(population, mutation_rate, num_colors, setup):
                 mutated = new_color(
                     population[index][1][node], num_colors
                 )
-                setup.logger.debug('Mutated a %s to a %s',
-                                   population[index][1][node],
-                                   mutated)
+                if tracing:
+                    setup.logger.debug('Mutated a %s to a %s',
+                                       population[index][1][node],
+                                       mutated)
                 population[index][1][node] = mutated
                 population[index] = (None, population[index][1])
     return population
@@ -218,7 +226,7 @@ def calculate_fitness(solution, graph):
     :param solution: a potential solution
     :type: tuple(int, list[int])
     :param graph: the adjacency list of nodes to be colored
-    :type: list[list[int]]
+    :type: Graph
 
     :return: number of conflicts
     :rtype: int
@@ -235,10 +243,9 @@ def penalty(solution, graph):
     """
     conflicts = 0
 
-    for node, adj_list in enumerate(graph):
-        for neighbor in adj_list:
-            if neighbor > node and solution[node] == solution[neighbor]:
-                conflicts += 1
+    for node, neighbor in graph.edges:
+        if solution[node] == solution[neighbor]:
+            conflicts += 1
 
     return conflicts
 
@@ -250,7 +257,7 @@ def evaluate_population(population, graph, setup):
     :param population: the population
     :type: list[tuple(int,list[int])]
     :param graph: the adjacency list of nodes to be colored
-    :type: list[list[int]]
+    :type: Graph
     """
     num_evaluations = 0
     for index, (fitness, coloring) in enumerate(population):
@@ -280,7 +287,11 @@ def run(graph, setup, params):
           :type: int
         - :crossover_rate: likelyhood of a node to be
               part of the crossover area
+        - :resume: the population to continue from, as saved in a
+              checkpoint, or None to start from a random one
+          :type: dict
     """
+    graph = as_graph(graph)
     num_colors = params['colors']
     population_size = params['population_size']
     mutation_rate = params['mutation']
@@ -291,13 +302,27 @@ def run(graph, setup, params):
     if children_per_generation % 2 != 0:
         raise Exception("children_per_generation must be a multiple of 2")
 
-    population = generate_initial_population(
-        graph, population_size, num_colors
-    )
-    setup.logger.debug('Initializing population of size: %s', population_size)
-    num_evaluations = evaluate_population(population, graph, setup)
-    if setup.counter.increment(num_evaluations):
-        yield best_fitness(population)
+    # every yield is between generations, once the population has been
+    # evaluated
+    setup.snapshot = lambda: {
+        'fitnesses': [fitness for fitness, _ in population],
+        'solutions': [solution for _, solution in population]
+    }
+
+    if params['resume'] is not None:
+        population = zip(params['resume']['fitnesses'],
+                         params['resume']['solutions'])
+        setup.logger.debug('Resumed population of size: %s',
+                           len(population))
+    else:
+        population = generate_initial_population(
+            graph, population_size, num_colors
+        )
+        setup.logger.debug('Initializing population of size: %s',
+                           population_size)
+        num_evaluations = evaluate_population(population, graph, setup)
+        if setup.counter.increment(num_evaluations):
+            yield best_fitness(population)
 
     while(not stopping_condition(population)):
         parents = tournament_selection(
@@ -310,8 +335,10 @@ def run(graph, setup, params):
         population = replacement(population, children)
         population = mutation(population, mutation_rate, num_colors, setup)
         num_evaluations = evaluate_population(population, graph, setup)
-        setup.logger.debug('Current best fitness: %s',
-                           best_fitness(population))
+        if setup.tracing:
+            setup.logger.debug('Current best fitness: %s',
+                               best_fitness(population),
+                               extra={'event': 'generation'})
 
         if setup.counter.increment(num_evaluations):
             yield best_fitness(population)
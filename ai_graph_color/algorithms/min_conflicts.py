@@ -1,6 +1,15 @@
 import random
 
-params = {}
+from ai_graph_color.graph import as_graph
+from ai_graph_color.indexed_set import IndexedSet
+
+params = {'selection': 'conflicted', 'resume': None}  # default params
+# :param 'selection': how to pick the node to move, 'conflicted' for a
+#   random node with conflicts or 'uniform' for any random node
+# :type 'selection': str
+# :param 'resume': the coloring to continue from, as saved in a
+#   checkpoint, or None to start from a random one
+# :type 'resume': dict
 
 
 def run(graph, setup, params):
@@ -12,56 +21,154 @@ def run(graph, setup, params):
         choose a random node in the graph, and change it to have the color
         which reduces the number of conflicts in the graph the most.
 
+    By default the node is chosen from the nodes with conflicts, which
+    are kept in a set as nodes change color, so that no iterations are
+    spent on nodes that are already fine.
+
+    The number of neighbors of each node with each color is kept up to
+    date as nodes change color, so the conflicts a node would have with
+    each color are looked up rather than counted. Looking one up counts
+    as an iteration, as counting them did.
+
     :param colors: the number of colors to color the graph with
     :type colors: int
     """
 
+    graph = as_graph(graph)
     num_colors = params['colors']
+    tracing = setup.tracing
+    if params['selection'] not in ['conflicted', 'uniform']:
+        raise Exception(
+            "Unknown node selection: {}".format(params['selection'])
+        )
+    focused = params['selection'] == 'conflicted'
 
     colors = range(num_colors)
     setup.logger.debug(
         'Trying to color min-conflicts with %s colors', num_colors
     )
 
-    coloring = [random.choice(colors) for _ in graph]
-    setup.logger.debug('Initial coloring: %s', coloring)
+    if params['resume'] is not None:
+        coloring = params['resume']['coloring']
+        setup.logger.debug('Resumed coloring: %s', coloring)
+    else:
+        coloring = [random.choice(colors) for _ in graph]
+        setup.logger.debug('Initial coloring: %s', coloring)
+
+    # the number of neighbors of each node with each color
+    table = conflict_table(graph, coloring, num_colors)
+    conflicted = IndexedSet(
+        index for index in xrange(len(graph))
+        if table[index][coloring[index]] > 0
+    )
+    setup.snapshot = lambda: {'coloring': list(coloring)}
 
     num_conflicts = num_conflicts_graph(graph, coloring)
     setup.logger.debug('Initial conflicts: %s', num_conflicts)
 
-    if setup.counter.increment():
+    counter = setup.counter
+    if counter.increment():
         yield num_conflicts
 
     while num_conflicts > 0:
-        index = random.randint(0, len(graph) - 1)
-        setup.logger.debug('Selected node: %s', index)
-
-        initial_conflicts = num_conflicts_node(graph, index, coloring)
-        if setup.counter.increment():
-            yield num_conflicts
+        if focused:
+            index = conflicted.choice()
+        else:
+            index = random.randint(0, len(graph) - 1)
+        if tracing:
+            setup.logger.debug('Selected node: %s', index)
+
+        row = table[index]
         initial_color = coloring[index]
-        min_conflicts = initial_conflicts
-        min_conflicts_value = initial_color
+        initial_conflicts = row[initial_color]
+        # keep the node's color unless another has strictly fewer
+        # conflicts, taking the first such color
+        min_conflicts = min(row)
+        if initial_conflicts == min_conflicts:
+            min_conflicts_value = initial_color
+        else:
+            min_conflicts_value = row.index(min_conflicts)
+
+        # one iteration for each color looked up, counted all at once
+        # unless the counter reaches its limit on one of them
+        if (counter.limit is None or
+                counter.counter + num_colors < counter.limit):
+            counter.counter += num_colors
+        else:
+            for _ in xrange(num_colors):
+                if counter.increment():
+                    yield num_conflicts
+
+        if min_conflicts_value != initial_color:
+            recolor(graph, coloring, table, conflicted, index,
+                    min_conflicts_value)
+        num_conflicts -= initial_conflicts - min_conflicts
+        if tracing:
+            setup.logger.debug('Moved node: %s to color: %s, conflicts: %s',
+                               index, min_conflicts_value, num_conflicts,
+                               extra={'event': 'move'})
+            setup.logger.debug('Updated coloring: %s', coloring)
 
-        colors = range(num_colors)
-        colors.remove(initial_color)  # don't recheck the same color
+    yield num_conflicts
 
-        for color in colors:
-            coloring[index] = color
 
-            conflicts = num_conflicts_node(graph, index, coloring)
-            if setup.counter.increment():
-                yield num_conflicts
-            if conflicts < min_conflicts:
-                min_conflicts = conflicts
-                min_conflicts_value = color
+def recolor(graph, coloring, table, conflicted, index, color):
+    """
+    Changes the color of a node, updating the rows of its neighbors in
+    the conflict table, and which of them have conflicts.
 
-        coloring[index] = min_conflicts_value
-        setup.logger.debug('Updated coloring: %s', coloring)
-        num_conflicts -= initial_conflicts - min_conflicts
-        setup.logger.debug('Updated conflicts: %s', num_conflicts)
+    :param graph: the graph
+    :type graph: Graph
+    :param coloring: the coloring of the graph
+    :type coloring: list[int]
+    :param table: the count of each color among each node's neighbors
+    :type table: list[list[int]]
+    :param conflicted: the nodes with conflicts
+    :type conflicted: IndexedSet
+    :param index: the node to recolor
+    :type index: int
+    :param color: its new color
+    :type color: int
+    :return: Nothing, but the coloring, table and conflicted nodes are
+        updated
+    """
+    old_color = coloring[index]
+    coloring[index] = color
+    for neighbor in graph[index]:
+        neighbor_row = table[neighbor]
+        neighbor_row[old_color] -= 1
+        neighbor_row[color] += 1
+        neighbor_color = coloring[neighbor]
+        if neighbor_color == color:
+            conflicted.add(neighbor)
+        elif neighbor_color == old_color and neighbor_row[old_color] == 0:
+            conflicted.discard(neighbor)
+
+    if table[index][color] > 0:
+        conflicted.add(index)
+    else:
+        conflicted.discard(index)
+
+
+def conflict_table(graph, coloring, num_colors):
+    """
+    Counts the neighbors of each node with each color, which is the
+    number of conflicting edges the node would have with that color.
 
-    yield num_conflicts
+    :param graph: the graph
+    :type graph: Graph
+    :param coloring: the coloring of the graph
+    :type coloring: list[int]
+    :param num_colors: the number of colors
+    :type num_colors: int
+    :rtype: list[list[int]]
+    :return: the count of each color among the neighbors of each node
+    """
+    table = [[0] * num_colors for _ in xrange(len(graph))]
+    for from_index, to_index in graph.edges:
+        table[from_index][coloring[to_index]] += 1
+        table[to_index][coloring[from_index]] += 1
+    return table
 
 
 def num_conflicts_graph(graph, coloring):
@@ -69,8 +176,8 @@ def num_conflicts_graph(graph, coloring):
     Compute the number of conflicting edges on a graph for a given
     coloring.
 
-    :param graph: the graph, in adjacency list form
-    :type graph: list[list[int]]
+    :param graph: the graph
+    :type graph: Graph
     :param coloring: the coloring of the graph
     :type coloring: list[int]
     :rtype: int
@@ -78,11 +185,9 @@ def num_conflicts_graph(graph, coloring):
         given graph.
     """
     conflicts = 0
-    for from_index, connections in enumerate(graph):
-        for to_index in connections:
-            if (from_index < to_index and
-                    coloring[to_index] == coloring[from_index]):
-                conflicts += 1
+    for from_index, to_index in graph.edges:
+        if coloring[to_index] == coloring[from_index]:
+            conflicts += 1
     return conflicts
 
 
@@ -92,7 +197,7 @@ def num_conflicts_node(graph, index, coloring):
     node on a graph with a particular coloring.
 
     :param graph: a graph in adjacency list form
-    :type graph: list[list[int]]
+    :type graph: Graph
     :param index: the index of the node in the graph
     :type index: int
     :param coloring: the coloring of the graph
@@ -0,0 +1,82 @@
+"""
+A bounded store of nogoods for the backtracking algorithms, partial
+colorings that have been proven not to extend to a full coloring, so
+that a dead end found in one branch is not searched again in another.
+"""
+from collections import OrderedDict
+
+
+class NogoodStore:
+    """
+    Holds up to a fixed number of nogoods, each a frozenset of (vertex,
+    color) pairs, evicting the least recently learned or used one when
+    it is full. Each pair is indexed by the nogoods containing it, so
+    only those need checking when a vertex is about to be colored.
+    """
+    def __init__(self, capacity):
+        """
+        :param capacity: the most nogoods to hold at once
+        :type capacity: int
+        """
+        self.capacity = capacity
+        self.nogoods = OrderedDict()
+        self.index = {}
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'learned': 0}
+
+    def add(self, nogood):
+        """
+        Remembers a nogood, evicting the least recently used one if the
+        store is full.
+
+        :param nogood: the (vertex, color) pairs of the partial coloring
+        :type nogood: frozenset(tuple(int, int))
+        :return: Nothing, but the store is updated
+        """
+        if nogood in self.nogoods or self.capacity <= 0:
+            return
+        if len(self.nogoods) >= self.capacity:
+            self.remove(self.nogoods.popitem(last=False)[0])
+            self.stats['evictions'] += 1
+
+        self.nogoods[nogood] = True
+        for pair in nogood:
+            self.index.setdefault(pair, set()).add(nogood)
+        self.stats['learned'] += 1
+
+    def remove(self, nogood):
+        """
+        Drops a nogood that has left the store from the index.
+
+        :param nogood: the nogood
+        :type nogood: frozenset(tuple(int, int))
+        :return: Nothing, but the index is updated
+        """
+        for pair in nogood:
+            watching = self.index[pair]
+            watching.discard(nogood)
+            if len(watching) == 0:
+                del self.index[pair]
+
+    def find(self, coloring, vertex, color):
+        """
+        Finds a nogood that coloring a vertex would complete.
+
+        :param coloring: the current coloring
+        :type coloring: dict{int: int}
+        :param vertex: the vertex about to be colored
+        :type vertex: int
+        :param color: the color it is about to be given
+        :type color: int
+        :rtype: frozenset(tuple(int, int))
+        :return: the nogood, or None if there isn't one
+        """
+        for nogood in self.index.get((vertex, color), ()):
+            if all(coloring.get(other) == other_color
+                   for other, other_color in nogood if other != vertex):
+                # move it to the most recently used end
+                del self.nogoods[nogood]
+                self.nogoods[nogood] = True
+                self.stats['hits'] += 1
+                return nogood
+        self.stats['misses'] += 1
+        return None
@@ -0,0 +1,275 @@
+"""
+Runs a backtracking algorithm on several cores, by splitting the top of
+its decision tree into subproblems that are searched independently.
+
+A subproblem a worker is preempted in is continued from the state its
+search snapshotted the next time the search is resumed, rather than
+searched again from the start. The search as a whole can't be
+checkpointed though, since it takes no snapshot of the subproblems left
+and their states, so a parallel search that dies starts over.
+"""
+from collections import deque
+import importlib
+import multiprocessing
+import Queue
+
+from color_domains import colors, full_domain
+from saturation import SaturationQueue
+from trail import Trail
+
+# how many subproblems to split off for each worker, so that workers
+# which finish early have more to take
+subproblems_per_worker = 8
+
+# the graph being searched, set once in each worker process
+worker_graph = None
+
+
+def split(graph, num_colors, assign, counter, num_subproblems, prefix=()):
+    """
+    Splits the search into subproblems, each coloring the vertices at the
+    top of the decision tree one consistent way, going a level deeper
+    until there are enough of them. Every coloring of the graph extends
+    exactly one of them.
+
+    Each coloring tried counts as an iteration, and once the counter
+    reaches its limit the split stops at the last level it finished,
+    so that splitting never takes more iterations than are left.
+
+    :param graph: the graph to color
+    :type graph: Graph
+    :param num_colors: the number of colors to color with
+    :type num_colors: int
+    :param assign: the algorithm's way of coloring a vertex on a trail
+    :type assign: function(Trail, Graph, int, int) -> bool
+    :param counter: the counter to count each coloring tried with, whose
+        limit stops the split
+    :type counter: Counter
+    :param num_subproblems: how many subproblems to aim for
+    :type num_subproblems: int
+    :param prefix: colors already given to vertices
+    :type prefix: list[tuple(int, int)]
+    :rtype: list[list[tuple(int, int)]]
+    :return: the vertex and color of each decision in each subproblem
+    """
+    queue = SaturationQueue(graph, num_colors)
+    trail = Trail([full_domain(num_colors)] * len(graph), queue)
+    for vertex, color in prefix:
+        if not assign(trail, graph, vertex, color):
+            return []
+
+    # returns False if the counter reached its limit before the level
+    # was finished
+    def expand(subproblem, depth, subproblems):
+        vertex = queue.next_vertex()
+        if depth == 0 or vertex is None:
+            subproblems.append(subproblem)
+            return True
+        for color in colors(trail.domains[vertex]):
+            mark = trail.mark()
+            finished = True
+            if assign(trail, graph, vertex, color):
+                finished = expand(subproblem + [(vertex, color)], depth - 1,
+                                  subproblems)
+            trail.undo(mark)
+            if not finished or counter.increment():
+                return False
+        return True
+
+    subproblems = [list(prefix)]
+    depth = 0
+    while 0 < len(subproblems) < num_subproblems and depth < len(graph):
+        depth += 1
+        deeper = []
+        if not expand(list(prefix), depth, deeper):
+            break
+        subproblems = deeper
+    return subproblems
+
+
+def set_worker_graph(graph):
+    """
+    Gives a worker process the graph, so it is only sent to it once.
+
+    :param graph: the graph being searched
+    :type graph: Graph
+    """
+    global worker_graph
+    worker_graph = graph
+
+
+def search_subproblem(job):
+    """
+    Searches a subproblem in a worker process, with the algorithm running
+    on its own.
+
+    :param job: the number of the job, the name of the algorithm's
+        module, its params, the subproblem, the state to continue
+        searching it from or None, and the most iterations to search it
+        for, or None
+    :type job: tuple(int, str, dict, list[tuple(int, int)], dict, int)
+    :rtype: tuple(int, list[tuple(int, int)], dict, int, dict, dict)
+    :return: the number of the job, the subproblem, the coloring found,
+        the iterations taken, the statistics reported, and the state the
+        search was preempted in, or None if it wasn't
+    """
+    from ai_graph_color.setup import Evaluation
+
+    job_number, module_name, params, subproblem, state, limit = job
+    setup = Evaluation()
+    setup.counter.limit = limit
+    params = dict(params, workers=1, prefix=subproblem, resume=state)
+
+    coloring = importlib.import_module(module_name).run(
+        worker_graph, setup, params
+    ).next()
+    state = None
+    if (limit is not None and setup.counter.counter >= limit and
+            len(coloring) < len(worker_graph)):
+        state = setup.snapshot()
+    return (job_number, subproblem, dict(coloring), setup.counter.counter,
+            setup.stats, state)
+
+
+def add_stats(stats, worker_stats):
+    """
+    Adds the statistics a worker reported to the totals.
+
+    :param stats: the totals, by name then statistic
+    :type stats: dict{str: dict{str: int}}
+    :param worker_stats: the statistics the worker reported
+    :type worker_stats: dict{str: dict{str: int}}
+    :return: Nothing, but the totals are updated
+    """
+    for name, values in worker_stats.items():
+        totals = stats.setdefault(name, {})
+        for statistic, value in values.items():
+            totals[statistic] = totals.get(statistic, 0) + value
+
+
+def parallel_search(graph, setup, module_name, params, assign):
+    """
+    Searches for a coloring with a pool of worker processes. The top of
+    the decision tree is split into many more subproblems than there are
+    workers, and each worker takes the next one from a shared queue as
+    soon as it is free, so that the load stays balanced. The first full
+    coloring found ends the search, terminating the other workers.
+
+    The iterations every worker takes are added to the setup's counter.
+    Subproblems are only handed out while it is below its limit, and the
+    iterations left are shared out between the workers, so a round never
+    takes more iterations than the limit allows. Any subproblem a worker
+    couldn't finish is continued from where it was once the search is
+    resumed. It can't be checkpointed, as its state is spread across the
+    workers.
+
+    :param graph: the graph to color
+    :type graph: Graph
+    :param setup: the setup containing the logger and the counter
+    :type setup: Setup
+    :param module_name: the name of the algorithm's module
+    :type module_name: str
+    :param params: the algorithm's params, with 'workers' the number of
+        worker processes
+    :type params: dict
+    :param assign: the algorithm's way of coloring a vertex on a trail
+    :type assign: function(Trail, Graph, int, int) -> bool
+    :rtype: generator(dict)
+    :return: the largest partial coloring found each time the counter
+        reaches its limit, then the final coloring, which is empty if
+        there is none
+    """
+    if params['resume'] is not None:
+        raise Exception("A parallel search can't be resumed")
+    counter = setup.counter
+    workers = params['workers']
+    # each subproblem, with the state to continue searching it from
+    pending = deque((subproblem, None) for subproblem in split(
+        graph, params['colors'], assign, counter,
+        workers * subproblems_per_worker, params['prefix']
+    ))
+    setup.logger.debug('Split into %s subproblems', len(pending))
+
+    pool = multiprocessing.Pool(
+        workers, initializer=set_worker_graph, initargs=(graph,)
+    )
+    results = Queue.Queue()
+    in_flight = {}
+    # the iterations each job in flight may take, and their total
+    allotments = {}
+    allotted = 0
+    job_number = 0
+    unfinished = []
+    best = {}
+    try:
+        while True:
+            while (len(pending) > 0 and len(in_flight) < workers and
+                   not (counter.limit is not None and
+                        counter.counter + allotted >= counter.limit)):
+                limit = None
+                if counter.limit is not None:
+                    # shared evenly between the workers still free
+                    limit = max(1, (counter.limit - counter.counter -
+                                    allotted) // (workers - len(in_flight)))
+                    allotments[job_number] = limit
+                    allotted += limit
+                subproblem, state = pending.popleft()
+                job = (job_number, module_name, params, subproblem, state,
+                       limit)
+                in_flight[job_number] = pool.apply_async(
+                    search_subproblem, [job], callback=results.put
+                )
+                job_number += 1
+
+            if len(in_flight) == 0:
+                if len(pending) == 0 and len(unfinished) == 0:
+                    setup.logger.debug('No coloring with %s colors',
+                                       params['colors'])
+                    yield {}
+                    return
+                setup.logger.debug('Preempted with coloring: %s', best)
+                yield best
+                pending.extend(unfinished)
+                unfinished = []
+                continue
+
+            (finished, subproblem, coloring, iterations, stats,
+             state) = next_result(in_flight, results)
+            del in_flight[finished]
+            allotted -= allotments.pop(finished, 0)
+            counter.increment(iterations)
+            add_stats(setup.stats, stats)
+            if len(coloring) == len(graph):
+                setup.logger.debug('Finished, final coloring: %s', coloring)
+                yield coloring
+                return
+            if state is not None:
+                unfinished.append((subproblem, state))
+                if len(coloring) > len(best):
+                    best = coloring
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def next_result(in_flight, results):
+    """
+    Waits for a worker to finish a subproblem, raising any error a
+    worker raised instead.
+
+    :param in_flight: the result of each subproblem being searched, by
+        the number of its job
+    :type in_flight: dict{int: multiprocessing.pool.AsyncResult}
+    :param results: the queue finished subproblems are put on
+    :type results: Queue.Queue
+    :rtype: tuple(int, list[tuple(int, int)], dict, int, dict, dict)
+    :return: the result of the subproblem
+    """
+    while True:
+        try:
+            # with a timeout, so that errors are noticed
+            return results.get(timeout=0.1)
+        except Queue.Empty:
+            for async_result in in_flight.values():
+                if async_result.ready() and not async_result.successful():
+                    async_result.get()
@@ -0,0 +1,54 @@
+"""
+Schedules for restarting the backtracking algorithms, which cut off the
+long searches that an unlucky early decision can lead to.
+"""
+import itertools
+
+
+def luby(index):
+    """
+    Finds a term of the Luby sequence 1, 1, 2, 1, 1, 2, 4, 1, 1, 2, ...,
+    in which every run of terms is followed by itself then its doubled
+    last term.
+
+    :param index: the index of the term, starting from 0
+    :type index: int
+    :rtype: int
+    :return: the term
+    """
+    size, exponent = 1, 0
+    while size < index + 1:
+        size = 2 * size + 1
+        exponent += 1
+    while size - 1 != index:
+        size = (size - 1) / 2
+        exponent -= 1
+        index %= size
+    return 2 ** exponent
+
+
+def restart_schedule(kind, unit, factor):
+    """
+    Generates how many decisions can fail before each restart, counting
+    failures rather than decisions so that a run isn't cut off before it
+    has had a chance to color every vertex.
+
+    :param kind: the kind of schedule, 'luby' for the Luby sequence times
+        the unit, 'geometric' for the unit times growing powers of the
+        factor, or None for no restarts
+    :type kind: str
+    :param unit: the number of failures before the first restart
+    :type unit: int
+    :param factor: how much longer each run is than the one before it,
+        for a geometric schedule
+    :type factor: float
+    :rtype: generator(int)
+    :return: the number of failures allowed in each run, or None
+    """
+    if kind is None:
+        return None
+    if kind == 'luby':
+        return (unit * luby(index) for index in itertools.count())
+    if kind == 'geometric':
+        return (int(unit * factor ** index) for index in itertools.count())
+    raise Exception("Unknown restart schedule: {}".format(kind))
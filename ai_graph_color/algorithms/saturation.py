@@ -0,0 +1,141 @@
+"""
+Incremental DSATUR ordering for the backtracking algorithms.
+"""
+import heapq
+import random
+
+
+class SaturationQueue:
+    """
+    Keeps a coloring along with the saturation of every vertex (the
+    number of distinct colors among its colored neighbors), updating it
+    as vertices are colored and uncolored, so that the uncolored vertex
+    with the highest saturation can be found without scanning the graph.
+
+    Uncolored vertices are kept in a bucket per saturation, each a heap
+    ordered by degree, highest first, and then by a tie-break, which is
+    the lowest negated index unless ties are randomized. Entries aren't
+    removed when a vertex's saturation changes or it is colored, but
+    skipped once they reach the top of their heap.
+    """
+    def __init__(self, graph, num_colors):
+        """
+        :param graph: the graph being colored
+        :type graph: Graph
+        :param num_colors: the number of colors to color with
+        :type num_colors: int
+        """
+        self.graph = graph
+        self.coloring = {}
+        self.color_counts = [[0] * num_colors for _ in xrange(len(graph))]
+        self.saturation = [0] * len(graph)
+        self.buckets = [[] for _ in xrange(num_colors + 1)]
+        self.num_entries = 0
+        self.tiebreaks = [-vertex for vertex in xrange(len(graph))]
+        self.rebuild()
+
+    def assign(self, vertex, color):
+        """
+        Colors a vertex, recoloring it if it is already colored.
+
+        :param vertex: the vertex to color
+        :type vertex: int
+        :param color: the color to give it
+        :type color: int
+        :return: Nothing, but the coloring and saturations are updated
+        """
+        if vertex in self.coloring:
+            self.unassign(vertex)
+        self.coloring[vertex] = color
+
+        for neighbor in self.graph[vertex]:
+            counts = self.color_counts[neighbor]
+            counts[color] += 1
+            if counts[color] == 1:
+                self.saturation[neighbor] += 1
+                self.push(neighbor)
+
+    def unassign(self, vertex):
+        """
+        Uncolors a vertex.
+
+        :param vertex: the vertex to uncolor
+        :type vertex: int
+        :return: Nothing, but the coloring and saturations are updated
+        """
+        color = self.coloring.pop(vertex)
+        for neighbor in self.graph[vertex]:
+            counts = self.color_counts[neighbor]
+            counts[color] -= 1
+            if counts[color] == 0:
+                self.saturation[neighbor] -= 1
+                self.push(neighbor)
+        self.push(vertex)
+
+    def next_vertex(self):
+        """
+        Finds the uncolored vertex with the most distinct colors among its
+        neighbors, breaking ties by the highest degree and then the
+        tie-break, which favors the highest index unless randomized.
+
+        :rtype: int
+        :return: the vertex, or None if every vertex is colored
+        """
+        for saturation in xrange(len(self.buckets) - 1, -1, -1):
+            bucket = self.buckets[saturation]
+            while len(bucket) > 0:
+                vertex = bucket[0][2]
+                if (vertex not in self.coloring and
+                        self.saturation[vertex] == saturation):
+                    return vertex
+                heapq.heappop(bucket)
+                self.num_entries -= 1
+        return None
+
+    def push(self, vertex):
+        """
+        Adds an entry for an uncolored vertex to the bucket of its current
+        saturation, rebuilding the buckets if too many of their entries
+        are out of date.
+
+        :param vertex: the vertex
+        :type vertex: int
+        :return: Nothing, but the buckets are updated
+        """
+        if vertex in self.coloring:
+            return
+        if self.num_entries > 2 * len(self.graph) + 64:
+            self.rebuild()
+            return
+        heapq.heappush(self.buckets[self.saturation[vertex]], (
+            -self.graph.degrees[vertex], self.tiebreaks[vertex], vertex
+        ))
+        self.num_entries += 1
+
+    def rebuild(self):
+        """
+        Refills the buckets with one entry per uncolored vertex.
+
+        :return: Nothing, but the buckets are replaced
+        """
+        self.buckets = [[] for _ in self.buckets]
+        self.num_entries = 0
+        for vertex in xrange(len(self.graph)):
+            if vertex not in self.coloring:
+                self.buckets[self.saturation[vertex]].append((
+                    -self.graph.degrees[vertex], self.tiebreaks[vertex],
+                    vertex
+                ))
+                self.num_entries += 1
+        for bucket in self.buckets:
+            heapq.heapify(bucket)
+
+    def randomize_ties(self):
+        """
+        Breaks ties between vertices of the same saturation and degree
+        in a new random order.
+
+        :return: Nothing, but the tie-breaks and buckets are replaced
+        """
+        self.tiebreaks = [random.random() for _ in xrange(len(self.graph))]
+        self.rebuild()
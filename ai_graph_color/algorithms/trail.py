@@ -0,0 +1,76 @@
+"""
+The undo log of the backtracking algorithms, which records every change
+made to the coloring and the color domains so that backtracking only
+has to reverse what changed since the decision being undone.
+"""
+
+
+class Trail:
+    """
+    Makes changes to the coloring and domains of a search, recording how
+    to reverse each one. A mark is the length of the trail at some point,
+    and undoing to it reverses every change made since, latest first.
+
+    Each entry is a vertex along with its domain before the change, or
+    None if the change was coloring the vertex.
+    """
+    def __init__(self, domains, queue):
+        """
+        :param domains: the domain of colors available to each vertex,
+            which is changed in place
+        :type domains: list[int]
+        :param queue: the saturation queue holding the coloring
+        :type queue: SaturationQueue
+        """
+        self.domains = domains
+        self.queue = queue
+        self.changes = []
+
+    def mark(self):
+        """
+        :rtype: int
+        :return: a mark of the current state, to undo back to later
+        """
+        return len(self.changes)
+
+    def assign(self, vertex, color):
+        """
+        Colors an uncolored vertex.
+
+        :param vertex: the vertex to color
+        :type vertex: int
+        :param color: the color to give it
+        :type color: int
+        :return: Nothing, but the coloring is updated
+        """
+        self.changes.append((vertex, None))
+        self.queue.assign(vertex, color)
+
+    def set_domain(self, vertex, domain):
+        """
+        Replaces the domain of a vertex.
+
+        :param vertex: the vertex
+        :type vertex: int
+        :param domain: its new domain
+        :type domain: int
+        :return: Nothing, but the domains are updated
+        """
+        self.changes.append((vertex, self.domains[vertex]))
+        self.domains[vertex] = domain
+
+    def undo(self, mark):
+        """
+        Reverses every change made since a mark, latest first.
+
+        :param mark: the mark to undo back to
+        :type mark: int
+        :return: Nothing, but the coloring and domains are restored
+        """
+        changes, domains, queue = self.changes, self.domains, self.queue
+        while len(changes) > mark:
+            vertex, domain = changes.pop()
+            if domain is None:
+                queue.unassign(vertex)
+            else:
+                domains[vertex] = domain
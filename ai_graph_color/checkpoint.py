@@ -0,0 +1,118 @@
+"""
+Checkpoints of an algorithm's run, so that a long run can be continued
+from where it was if its process dies or is preempted.
+
+A checkpoint is a dict of plain values, pickled and compressed. Every
+list of ints in it, such as a coloring or the domains of a search, is
+stored as an array of the smallest type that holds its values, so that
+a checkpoint of a large graph stays small.
+"""
+from array import array
+import cPickle
+import os
+import tempfile
+import zlib
+
+# array typecodes from the smallest, with the range of values each holds
+int_types = [
+    ('b', -2 ** 7, 2 ** 7), ('h', -2 ** 15, 2 ** 15),
+    ('i', -2 ** 31, 2 ** 31), ('l', -2 ** 63, 2 ** 63)
+]
+
+
+def int_type(values):
+    """
+    :param values: the values to store
+    :type values: list[int]
+    :rtype: str
+    :return: the typecode of the smallest array that holds the values, or
+        None if none does
+    """
+    if len(values) == 0:
+        return int_types[0][0]
+    low, high = min(values), max(values)
+    for typecode, type_low, type_high in int_types:
+        if type_low <= low and high < type_high:
+            return typecode
+    return None
+
+
+def compact(value):
+    """
+    Replaces every list of ints in a value with an array.
+
+    :param value: a value made of dicts, lists, tuples and plain values
+    :type value: object
+    :rtype: object
+    :return: the value, with its lists of ints replaced
+    """
+    if isinstance(value, dict):
+        return dict((key, compact(item)) for key, item in value.items())
+    if isinstance(value, tuple):
+        return tuple(compact(item) for item in value)
+    if isinstance(value, list):
+        if all(type(item) in (int, long) for item in value):
+            typecode = int_type(value)
+            if typecode is not None:
+                return array(typecode, value)
+        return [compact(item) for item in value]
+    return value
+
+
+def expand(value):
+    """
+    Reverses compact, replacing every array in a value with a list.
+
+    :param value: a value that has been compacted
+    :type value: object
+    :rtype: object
+    :return: the value, with its arrays replaced
+    """
+    if isinstance(value, dict):
+        return dict((key, expand(item)) for key, item in value.items())
+    if isinstance(value, tuple):
+        return tuple(expand(item) for item in value)
+    if isinstance(value, list):
+        return [expand(item) for item in value]
+    if isinstance(value, array):
+        return value.tolist()
+    return value
+
+
+def save_checkpoint(file_path, checkpoint):
+    """
+    Writes a checkpoint to a temporary file in the same directory as the
+    given path, then renames it into place, so that a run which dies
+    while writing leaves the previous checkpoint whole.
+
+    :param file_path: the path of the checkpoint
+    :type file_path: str
+    :param checkpoint: the checkpoint
+    :type checkpoint: dict
+    :return: Nothing, but the checkpoint is written
+    """
+    data = zlib.compress(cPickle.dumps(
+        compact(checkpoint), cPickle.HIGHEST_PROTOCOL
+    ))
+    handle, temp_file = tempfile.mkstemp(dir=os.path.dirname(file_path))
+    try:
+        with os.fdopen(handle, 'wb') as temp:
+            temp.write(data)
+            temp.flush()
+            os.fsync(temp.fileno())
+        os.chmod(temp_file, 0o644)
+        os.rename(temp_file, file_path)
+    except Exception:
+        os.remove(temp_file)
+        raise
+
+
+def load_checkpoint(file_path):
+    """
+    :param file_path: the path of the checkpoint
+    :type file_path: str
+    :rtype: dict
+    :return: the checkpoint
+    """
+    with open(file_path, 'rb') as checkpoint_file:
+        return expand(cPickle.loads(zlib.decompress(checkpoint_file.read())))
@@ -0,0 +1,53 @@
+"""
+Convert the JSON graphs in problems/ to the binary CSR format, so that
+they can be mapped into memory instead of parsed.
+"""
+import glob
+import os
+import sys
+
+import problem_generator
+
+
+def convert_problem(file_name):
+    """
+    Writes a copy of a JSON problem file in the binary CSR format, next
+    to the original.
+
+    :param file_name: the name of the JSON problem file
+    :type file_name: str
+    :rtype: str
+    :return: the name of the CSR problem file written
+    """
+    csr_file_name = os.path.splitext(file_name)[0] + '.csr'
+    problem_generator.write_graph_to_file(
+        csr_file_name, problem_generator.read_graph_from_file(file_name)
+    )
+    return csr_file_name
+
+
+def convert_problems(remove_json=False):
+    """
+    Converts every JSON problem file in problems/.
+
+    :param remove_json: whether to remove each JSON file once converted
+    :type remove_json: bool
+    :rtype: list[str]
+    :return: the names of the CSR problem files written
+    """
+    csr_file_names = []
+    for problem_path in sorted(glob.glob(
+            problem_generator.generate_file_path('*.json'))):
+        csr_file_names.append(convert_problem(os.path.basename(problem_path)))
+        if remove_json:
+            os.remove(problem_path)
+    return csr_file_names
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    if args not in ([], ['--remove-json']):
+        print('Usage: [--remove-json]')
+    else:
+        for file_name in convert_problems(len(args) > 0):
+            print file_name
@@ -0,0 +1,138 @@
+"""
+A compact binary format for graphs, storing them in compressed sparse
+row form: the neighbors of every vertex one after another, along with
+the offset at which each vertex's neighbors start.
+
+Files start with a header holding a magic string, the format version,
+the number of vertices and the number of neighbor entries, followed by
+the offsets as little-endian 64 bit integers and the neighbors as
+little-endian 32 bit integers. Reading maps the file into memory, so
+loading a graph doesn't parse or copy it.
+"""
+import struct
+
+import numpy
+
+magic = 'CSRG'
+version = 1
+header = struct.Struct('<4sIQQ')
+offset_type = numpy.dtype('<i8')
+neighbor_type = numpy.dtype('<i4')
+
+
+class CSRGraph(object):
+    """
+    A read-only adjacency list backed by an offsets array and a neighbors
+    array. It can be used in place of a list[list[int]], where indexing
+    gives the neighbors of a vertex as an array.
+    """
+    def __init__(self, offsets, neighbors):
+        """
+        :param offsets: where each vertex's neighbors start in neighbors,
+            followed by the total number of neighbors
+        :type offsets: numpy.ndarray
+        :param neighbors: the neighbors of every vertex, one vertex after
+            another
+        :type neighbors: numpy.ndarray
+        """
+        self.offsets = offsets
+        self.neighbors = neighbors
+
+    @classmethod
+    def from_lists(cls, graph):
+        """
+        Make a graph from an adjacency list.
+
+        :param graph: the adjacency list
+        :type graph: list[list[int]]
+        :rtype: CSRGraph
+        :return: the same graph in compressed sparse row form
+        """
+        offsets = numpy.zeros(len(graph) + 1, offset_type)
+        numpy.cumsum([len(adj_list) for adj_list in graph], out=offsets[1:])
+
+        neighbors = numpy.empty(offsets[-1], neighbor_type)
+        for index, adj_list in enumerate(graph):
+            neighbors[offsets[index]:offsets[index + 1]] = adj_list
+        return cls(offsets, neighbors)
+
+    def degree(self, index):
+        """
+        :param index: the index of a vertex
+        :type index: int
+        :rtype: int
+        :return: the number of neighbors of the vertex
+        """
+        return int(self.offsets[index + 1] - self.offsets[index])
+
+    def to_lists(self):
+        """
+        :rtype: list[list[int]]
+        :return: the graph as an adjacency list
+        """
+        return [
+            self.neighbors[start:end].tolist() for start, end in
+            zip(self.offsets[:-1].tolist(), self.offsets[1:].tolist())
+        ]
+
+    def __getitem__(self, index):
+        return self.neighbors[self.offsets[index]:self.offsets[index + 1]]
+
+    def __iter__(self):
+        for index in xrange(len(self)):
+            yield self[index]
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+
+def write_csr_graph(out_file, graph):
+    """
+    Writes a graph to a file in compressed sparse row form.
+
+    :param out_file: the open file to write to
+    :type out_file: file
+    :param graph: the adjacency list to write
+    :type graph: list[list[int]] or CSRGraph
+    :return: Nothing, but the graph is written
+    """
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_lists(graph)
+
+    out_file.write(header.pack(
+        magic, version, len(graph), len(graph.neighbors)
+    ))
+    out_file.write(numpy.asarray(graph.offsets, offset_type).tostring())
+    out_file.write(numpy.asarray(graph.neighbors, neighbor_type).tostring())
+
+
+def read_csr_graph(in_file):
+    """
+    Maps a graph written by write_csr_graph into memory.
+
+    :param in_file: the path of the file to read
+    :type in_file: str
+    :rtype: CSRGraph
+    :return: the graph, backed by the file
+    """
+    with open(in_file, 'rb') as graph_file:
+        file_magic, file_version, num_vert, num_neighbors = header.unpack(
+            graph_file.read(header.size)
+        )
+    if file_magic != magic or file_version != version:
+        raise Exception("Not a version {} CSR graph: {}".format(
+            version, in_file
+        ))
+
+    offsets = numpy.memmap(
+        in_file, offset_type, 'r', header.size, num_vert + 1
+    )
+    if num_neighbors == 0:
+        # an empty array can't be mapped
+        neighbors = numpy.zeros(0, neighbor_type)
+    else:
+        neighbors = numpy.memmap(
+            in_file, neighbor_type, 'r',
+            header.size + offsets.nbytes, num_neighbors
+        )
+    return CSRGraph(offsets, neighbors)
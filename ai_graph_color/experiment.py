@@ -1,5 +1,6 @@
 import setup
 from algorithm import LimitedAlgorithm
+from graph import as_graph
 
 
 def iterative(algorithms, problem, iteration_func, local_limit,
@@ -22,8 +23,8 @@ def iterative(algorithms, problem, iteration_func, local_limit,
     :param algorithms: a list of algorithms paired with their
         parameters
     :type algorithms: list[tuple(module, map)]
-    :param problem: the problem to pass to the algorithm
-    :type problem: object
+    :param problem: the graph to pass to the algorithms
+    :type problem: list[list[int]] or Graph
     :param iteration_func: the iteration function for RIS
     :type iteration_func: function(int) -> int
     :param local_limit: the number of iterations that may pass
@@ -32,6 +33,8 @@ def iterative(algorithms, problem, iteration_func, local_limit,
     :rtype map<string, object>
     :return the results of the run of RIS
     """
+    # shared by every algorithm, so only built once
+    problem = as_graph(problem)
     algorithm_runners = [
         LimitedAlgorithm(
             algorithm, problem, setup.Evaluation(), params
@@ -0,0 +1,95 @@
+"""
+Generate a batch of random planar graphs into problems/, spread across
+a pool of worker processes.
+
+Every graph is generated with its own random number generator seeded
+from its job, so the graphs written only depend on their vertex count,
+seed and mode, and not on how many workers are used.
+"""
+import multiprocessing
+import random
+import sys
+
+import problem_generator
+
+
+def problem_file_name(num_vert, seed, mode):
+    """
+    Returns the name of the problem file for a generated graph
+
+    :param num_vert: the number of vertices in the graph
+    :type num_vert: int
+    :param seed: the seed the graph was generated with
+    :type seed: int
+    :param mode: how the graph was built
+    :type mode: str
+    :rtype: str
+    :return: the file name
+    """
+    return '{}_{}_{}.json'.format(mode, num_vert, seed)
+
+
+def generate_problem(job):
+    """
+    Generates a graph and writes it to its problem file.
+
+    :param job: the number of vertices, seed and mode of the graph
+    :type job: tuple(int, int, str)
+    :rtype: str
+    :return: the name of the problem file written
+    """
+    num_vert, seed, mode = job
+    graph = problem_generator.generate_graph(
+        num_vert, mode, seed, random.Random()
+    )
+
+    file_name = problem_file_name(num_vert, seed, mode)
+    problem_generator.write_graph_to_file(file_name, graph)
+    return file_name
+
+
+def generate_problems(vertex_counts, seeds, workers=1, mode='all_pairs'):
+    """
+    Generates a graph for every combination of vertex count and seed.
+
+    :param vertex_counts: the numbers of vertices to generate graphs with
+    :type vertex_counts: list[int]
+    :param seeds: the seeds to generate graphs with
+    :type seeds: list[int]
+    :param workers: the number of processes to generate graphs in
+    :type workers: int
+    :param mode: how to build the graphs
+    :type mode: str
+    :rtype: list[str]
+    :return: the names of the problem files written, in job order
+    """
+    jobs = [
+        (num_vert, seed, mode)
+        for num_vert in vertex_counts for seed in seeds
+    ]
+    if workers <= 1:
+        return map(generate_problem, jobs)
+
+    pool = multiprocessing.Pool(workers)
+    try:
+        # one job at a time, so that large graphs don't hold up a worker's
+        # whole chunk of jobs
+        return pool.map(generate_problem, jobs, chunksize=1)
+    finally:
+        pool.close()
+        pool.join()
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    if len(args) not in (4, 5):
+        print('Usage: {Vertex Counts (comma separated)} {First Seed} '
+              '{Last Seed} {Workers} [{Mode}]')
+    else:
+        vertex_counts, first_seed, last_seed, workers = args[:4]
+        for file_name in generate_problems(
+                map(int, vertex_counts.split(',')),
+                range(int(first_seed), int(last_seed) + 1),
+                int(workers),
+                *args[4:]):
+            print file_name
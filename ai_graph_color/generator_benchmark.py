@@ -0,0 +1,272 @@
+"""
+Measures how the time and memory taken by each stage of generating a
+random planar graph grow with the number of vertices, and compares the
+measurements against a baseline to catch regressions.
+
+Each size is measured in a fresh process, and the memory of a stage is
+the growth of that process's peak resident set size by the end of the
+stage, since Python 2 has no tracemalloc to trace allocations with.
+
+The all_pairs mode makes and indexes every line between two points,
+so its stages are expected to scale at least quadratically, while the
+lazy mode's connect stage stays close to linear.
+"""
+import json
+import math
+import multiprocessing
+import resource
+import sys
+import time
+
+import numpy
+
+import line
+import problem_generator
+import spatial_index
+import triangulation
+
+default_sizes = [100, 200, 500, 1000, 2000, 5000, 10000, 20000]
+
+# how much slower or bigger than the baseline a measurement can be
+default_tolerance = 0.25
+
+# measurements below these are too small to compare reliably
+min_seconds = 0.05
+min_peak_kb = 1024
+
+
+def build_stages(mode):
+    """
+    Lists the stages of building a graph in a particular mode, each taking
+    the output of the stage before it.
+
+    :param mode: how to build the graph, one of the keys of
+        problem_generator.build_modes
+    :type mode: str
+    :rtype: list[tuple(str, function)]
+    :return: the name and function of each stage after scattering points
+    """
+    if mode == 'all_pairs':
+        return [
+            ('create_lines', line.LineStore),
+            ('index_lines', spatial_index.LineGrid),
+            ('connect', problem_generator.connect_lines)
+        ]
+    if mode == 'lazy':
+        return [
+            ('index_points', spatial_index.PointGrid),
+            ('connect', lambda point_grid: problem_generator.connect_lazily(
+                point_grid, spatial_index.SegmentGrid(point_grid.points)
+            ))
+        ]
+    if mode == 'triangulation':
+        return [
+            ('triangulate', triangulation.Triangulation),
+            ('collect_edges', triangulation.Triangulation.graph)
+        ]
+    raise Exception("Unknown graph generation mode: {}".format(mode))
+
+
+def peak_kb():
+    """
+    :rtype: int
+    :return: the peak resident set size of the process so far, in KB
+    """
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def measure_stages(num_vert, mode='all_pairs', seed=0):
+    """
+    Times each stage of building a graph on a particular number of
+    scattered points, and how much it raised the peak memory use.
+
+    :param num_vert: the number of vertices in the graph
+    :type num_vert: int
+    :param mode: how to build the graph
+    :type mode: str
+    :param seed: the seed used to scatter the points
+    :type seed: int
+    :rtype: dict
+    :return: the number of vertices and edges, and the seconds taken and
+        peak memory growth in KB at the end of each stage
+    """
+    stages = [('scatter_points', lambda _: problem_generator.scatter_points(
+        num_vert, seed
+    ))] + build_stages(mode)
+
+    start_kb = peak_kb()
+    output = None
+    measurements = {}
+    for name, stage in stages:
+        start = time.time()
+        output = stage(output)
+        measurements[name] = {
+            'seconds': time.time() - start,
+            'peak_kb': peak_kb() - start_kb
+        }
+
+    return {
+        'num_vert': num_vert,
+        'num_edges': sum(len(connections) for connections in output) / 2,
+        'stages': measurements
+    }
+
+
+def measure_stages_job(job):
+    """
+    Measures the stages for a size, unpacking the arguments so that
+    it can be run in a process pool.
+    """
+    return measure_stages(*job)
+
+
+def run_ladder(sizes, mode='all_pairs', time_budget=None):
+    """
+    Measures the stages of graph generation for every size in a ladder,
+    stopping early once a size takes longer than the time budget, and
+    fits how each measurement scales.
+
+    :param sizes: the numbers of vertices to measure, in increasing order
+    :type sizes: list[int]
+    :param mode: how to build the graphs
+    :type mode: str
+    :param time_budget: the number of seconds after which larger sizes
+        are skipped
+    :type time_budget: float
+    :rtype: dict
+    :return: the mode, the measurements of each size and the scaling
+        exponents of each stage
+    """
+    runs = []
+    # a new process per size, so that each one starts from a low peak
+    pool = multiprocessing.Pool(1, maxtasksperchild=1)
+    try:
+        for num_vert in sizes:
+            run = pool.apply(measure_stages_job, [(num_vert, mode)])
+            runs.append(run)
+
+            elapsed = sum(
+                stage['seconds'] for stage in run['stages'].values()
+            )
+            print '{:>8} vertices {:>8} edges {:>10.3f}s {:>10}KB'.format(
+                num_vert, run['num_edges'], elapsed,
+                max(stage['peak_kb'] for stage in run['stages'].values())
+            )
+            if time_budget is not None and elapsed > time_budget:
+                break
+    finally:
+        pool.close()
+        pool.join()
+
+    return {
+        'mode': mode,
+        'runs': runs,
+        'exponents': scaling_exponents(runs)
+    }
+
+
+def scaling_exponents(runs):
+    """
+    Fits the exponent k of measurement ~ num_vert ** k for the time and
+    memory of each stage, by least squares on a log-log scale.
+
+    :param runs: the measurements of each size
+    :type runs: list[dict]
+    :rtype: dict
+    :return: the exponents of each stage's seconds and peak_kb, or None
+        where there are too few usable measurements to fit one
+    """
+    exponents = {}
+    for name in (runs[0]['stages'] if runs else []):
+        exponents[name] = {}
+        for measure, floor in [('seconds', min_seconds),
+                               ('peak_kb', min_peak_kb)]:
+            samples = [
+                (math.log(run['num_vert']),
+                 math.log(run['stages'][name][measure]))
+                for run in runs if run['stages'][name][measure] >= floor
+            ]
+            if len(samples) < 2 or len(set(x for x, _ in samples)) < 2:
+                exponents[name][measure] = None
+            else:
+                exponents[name][measure] = float(
+                    numpy.polyfit(*zip(*samples), deg=1)[0]
+                )
+    return exponents
+
+
+def compare(results, baseline, tolerance=default_tolerance):
+    """
+    Finds the measurements of a benchmark that are worse than those of
+    a baseline by more than a tolerance. Measurements too small to
+    compare reliably, and sizes or stages only in one of them, are
+    skipped.
+
+    :param results: the benchmark results, as returned by run_ladder
+    :type results: dict
+    :param baseline: the baseline results to compare against
+    :type baseline: dict
+    :param tolerance: the fraction a measurement can grow by
+    :type tolerance: float
+    :rtype: list[str]
+    :return: a description of each regression
+    """
+    regressions = []
+    floors = {'seconds': min_seconds, 'peak_kb': min_peak_kb}
+    baseline_runs = dict((run['num_vert'], run) for run in baseline['runs'])
+
+    for run in results['runs']:
+        baseline_run = baseline_runs.get(run['num_vert'])
+        if baseline_run is None:
+            continue
+        for name, stage in sorted(run['stages'].items()):
+            baseline_stage = baseline_run['stages'].get(name)
+            if baseline_stage is None:
+                continue
+            for measure, floor in sorted(floors.items()):
+                value, baseline_value = stage[measure], baseline_stage[measure]
+                if (value >= floor and
+                        value > baseline_value * (1 + tolerance)):
+                    regressions.append(
+                        '{} vertices, {} {}: {} from {}'.format(
+                            run['num_vert'], name, measure,
+                            value, baseline_value
+                        )
+                    )
+
+    for name, exponents in sorted(results['exponents'].items()):
+        for measure, exponent in sorted(exponents.items()):
+            baseline_exponent = baseline['exponents'].get(name, {}).get(
+                measure
+            )
+            if (exponent is not None and baseline_exponent is not None and
+                    exponent > baseline_exponent + tolerance):
+                regressions.append('{} {} exponent: {} from {}'.format(
+                    name, measure, exponent, baseline_exponent
+                ))
+    return regressions
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    if len(args) == 3 and args[0] == 'compare':
+        with open(args[1]) as results_file:
+            results = json.load(results_file)
+        with open(args[2]) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare(results, baseline)
+        for regression in regressions:
+            print regression
+        sys.exit(1 if regressions else 0)
+    elif len(args) < 3:
+        print('Usage: {Mode} {Time Budget} {Output JSON} '
+              '[{Number of Vertices}...]\n'
+              '       compare {Results JSON} {Baseline JSON}')
+    else:
+        results = run_ladder(
+            map(int, args[3:]) or default_sizes,
+            args[0],
+            float(args[1])
+        )
+        with open(args[2], 'w') as output_file:
+            json.dump(results, output_file, indent=4, sort_keys=True)
@@ -0,0 +1,75 @@
+"""
+The graph type shared by the coloring algorithms, which precomputes the
+views of a graph they need once instead of on every call.
+"""
+from csr_graph import CSRGraph
+
+
+class Graph(CSRGraph):
+    """
+    An immutable graph, stored in compressed sparse row form along with
+    each vertex's neighbors as a tuple, its degree, and the list of
+    edges. It can be used in place of a list[list[int]] adjacency list.
+    """
+    def __init__(self, graph):
+        """
+        :param graph: the adjacency list of the graph
+        :type graph: list[list[int]] or CSRGraph
+        """
+        if not isinstance(graph, CSRGraph):
+            graph = CSRGraph.from_lists(graph)
+        CSRGraph.__init__(self, graph.offsets, graph.neighbors)
+        self.offsets.flags.writeable = False
+        self.neighbors.flags.writeable = False
+
+        self.adjacency = tuple(
+            tuple(connections) for connections in CSRGraph.to_lists(self)
+        )
+        self.degrees = tuple(
+            len(connections) for connections in self.adjacency
+        )
+        self.edges = tuple(
+            (from_index, to_index)
+            for from_index, connections in enumerate(self.adjacency)
+            for to_index in connections if from_index < to_index
+        )
+
+    def degree(self, index):
+        return self.degrees[index]
+
+    def to_lists(self):
+        return [list(connections) for connections in self.adjacency]
+
+    def __getitem__(self, index):
+        return self.adjacency[index]
+
+    def __iter__(self):
+        return iter(self.adjacency)
+
+    def __len__(self):
+        return len(self.adjacency)
+
+    def __eq__(self, other):
+        return (len(self) == len(other) and
+                all(list(connections) == list(other_connections)
+                    for connections, other_connections in zip(self, other)))
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return repr(self.to_lists())
+
+
+def as_graph(graph):
+    """
+    Makes a Graph of an adjacency list, unless it already is one.
+
+    :param graph: the adjacency list of the graph
+    :type graph: list[list[int]] or CSRGraph or Graph
+    :rtype: Graph
+    :return: the graph
+    """
+    if isinstance(graph, Graph):
+        return graph
+    return Graph(graph)
@@ -0,0 +1,186 @@
+"""
+An on-disk cache of generated graphs, so that repeated runs can load a
+graph instead of generating it again.
+
+Graphs are stored in the binary CSR format under a name hashed from
+the parameters they were generated with and the source of the generator,
+so changing the generator never loads a graph it wouldn't build.
+"""
+import glob
+import hashlib
+import inspect
+import os
+
+from csr_graph import CSRGraph, read_csr_graph
+import indexed_set
+import line
+import problem_generator
+import spatial_index
+import triangulation
+
+# the modules whose code decides which graph is generated
+generator_modules = [
+    problem_generator, line, spatial_index, indexed_set, triangulation
+]
+
+default_directory = 'graph_cache'
+default_max_bytes = 512 * 1024 * 1024
+
+_generator_version = None
+
+
+def generator_version():
+    """
+    Computes a hash of the source of the graph generator, computing it
+    only once.
+
+    :rtype: str
+    :return: the hex digest of the generator's source
+    """
+    global _generator_version
+    if _generator_version is None:
+        digest = hashlib.sha1()
+        for module in generator_modules:
+            with open(inspect.getsourcefile(module), 'rb') as source:
+                digest.update(source.read())
+        _generator_version = digest.hexdigest()
+    return _generator_version
+
+
+class GraphCache:
+    """
+    A directory of generated graphs, keeping the size of the directory
+    under a limit by removing the least recently used graphs.
+
+    Graphs are written atomically and removing a graph another process
+    is reading doesn't affect it, so several processes can share a cache.
+    """
+    def __init__(self, directory=default_directory,
+                 max_bytes=default_max_bytes):
+        """
+        :param directory: the directory to keep the graphs in
+        :type directory: str
+        :param max_bytes: the most bytes of graphs to keep
+        :type max_bytes: int
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def generate_graph(self, num_vert, mode='all_pairs', seed=0):
+        """
+        Loads a generated graph from the cache, generating and caching it
+        if it isn't there. A graph generated without a seed would be
+        different every time, so it is generated without being cached.
+
+        :param num_vert: the number of vertices in the graph
+        :type num_vert: int
+        :param mode: how to build the graph, one of the keys of
+            problem_generator.build_modes
+        :type mode: str
+        :param seed: the seed to generate the graph with, or None to
+            generate a random graph
+        :type seed: int
+        :rtype: CSRGraph
+        :return: the generated graph
+        """
+        graph = None
+        if seed is not None:
+            graph = self.get(num_vert, mode, seed)
+        if graph is None:
+            graph = problem_generator.generate_graph(num_vert, mode, seed)
+            if seed is not None:
+                self.put(num_vert, mode, seed, graph)
+            graph = CSRGraph.from_lists(graph)
+        return graph
+
+    def get(self, num_vert, mode, seed):
+        """
+        Loads a graph from the cache, marking it as recently used.
+
+        :param num_vert: the number of vertices in the graph
+        :type num_vert: int
+        :param mode: how the graph was built
+        :type mode: str
+        :param seed: the seed the graph was generated with
+        :type seed: int
+        :rtype: CSRGraph
+        :return: the graph, or None if it isn't in the cache
+        """
+        file_path = self.file_path(num_vert, mode, seed)
+        try:
+            os.utime(file_path, None)
+            return read_csr_graph(file_path)
+        except (IOError, OSError):
+            # not cached, or evicted by another process
+            return None
+
+    def put(self, num_vert, mode, seed, graph):
+        """
+        Stores a graph in the cache, then evicts the least recently used
+        graphs until the cache is back under its size limit.
+
+        :param num_vert: the number of vertices in the graph
+        :type num_vert: int
+        :param mode: how the graph was built
+        :type mode: str
+        :param seed: the seed the graph was generated with
+        :type seed: int
+        :param graph: the graph to store
+        :type graph: list[list[int]] or CSRGraph
+        :return: Nothing, but the graph is written
+        """
+        if not os.path.exists(self.directory):
+            try:
+                os.makedirs(self.directory)
+            except OSError:
+                # made by another process in the meantime
+                pass
+
+        problem_generator.replace_graph_file(
+            self.file_path(num_vert, mode, seed), graph
+        )
+        self.evict()
+
+    def evict(self):
+        """
+        Removes the least recently used graphs until the cache holds at
+        most max_bytes of graphs.
+
+        :return: Nothing, but graphs may be removed
+        """
+        entries = []
+        for file_path in glob.glob(os.path.join(self.directory, '*.csr')):
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, file_path))
+
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, file_path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(file_path)
+            except OSError:
+                # already evicted by another process
+                pass
+            total_bytes -= size
+
+    def file_path(self, num_vert, mode, seed):
+        """
+        :param num_vert: the number of vertices in the graph
+        :type num_vert: int
+        :param mode: how the graph was built
+        :type mode: str
+        :param seed: the seed the graph was generated with
+        :type seed: int
+        :rtype: str
+        :return: the path the graph is cached at
+        """
+        if seed is None:
+            raise Exception("Graphs generated without a seed can't be cached")
+        key = hashlib.sha1('{}:{}:{}:{}'.format(
+            num_vert, mode, seed, generator_version()
+        )).hexdigest()
+        return os.path.join(self.directory, key + '.csr')
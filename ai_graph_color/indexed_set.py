@@ -0,0 +1,65 @@
+import random
+
+
+class IndexedSet:
+    """
+    A set that can also pick one of its items at random in constant time,
+    by keeping its items in a list along with the position of each one.
+    """
+    def __init__(self, items=()):
+        """
+        :param items: the items to start with
+        :type items: iterable
+        """
+        self.items = []
+        self.positions = {}
+        for item in items:
+            self.add(item)
+
+    def add(self, item):
+        """
+        Add an item to the set, if it isn't in it already.
+
+        :param item: the item to add
+        :type item: object
+        :return: Nothing
+        """
+        if item not in self.positions:
+            self.positions[item] = len(self.items)
+            self.items.append(item)
+
+    def discard(self, item):
+        """
+        Remove an item from the set if it is in it, by moving the last
+        item into its place.
+
+        :param item: the item to remove
+        :type item: object
+        :return: Nothing
+        """
+        position = self.positions.pop(item, None)
+        if position is not None:
+            last_item = self.items.pop()
+            if position < len(self.items):
+                self.items[position] = last_item
+                self.positions[last_item] = position
+
+    def choice(self, rng=random):
+        """
+        Pick a random item from the set.
+
+        :param rng: the random number generator to pick with
+        :type rng: random.Random
+        :rtype: object
+        :return: one of the items, each as likely as the others
+        """
+        return rng.choice(self.items)
+
+    def __contains__(self, item):
+        return item in self.positions
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
@@ -1,4 +1,9 @@
-class Line:
+import numpy
+
+
+class Line(object):
+    __slots__ = ('left_point', 'right_point', 'distance')
+
     def __init__(self, point_a, point_b):
         """
         Make a new line from two points.
@@ -11,30 +16,6 @@ class Line:
         self.left_point = min(point_a, point_b)
         self.right_point = max(point_a, point_b)
         self.distance = point_distance(point_a, point_b)
-        self.deallocation_routines = []
-
-    def add_reference(self, deallocation_routine, *params):
-        """
-        Add a deallocation routine for when resources associated with this line
-
-        :param deallocation_routine: the function to call to free a specific
-            resource
-        :type deallocation_routine: function
-        :param params: parameters to the deallocation_routine
-        :type params: tuple
-
-        :return: Nothing
-        """
-        self.deallocation_routines.append((deallocation_routine, params))
-
-    def free(self):
-        """
-        Call the deallocation routines specified for when this line is freed.
-
-        :return: Nothing
-        """
-        for routine, params in self.deallocation_routines:
-            routine(*params)
 
     def intersects(self, other_line):
         """
@@ -135,3 +116,250 @@ def point_distance(point_a, point_b):
     """
     return ((point_a[0] - point_b[0]) ** 2 +
             (point_a[1] - point_b[1]) ** 2) ** 0.5
+
+
+def intersects_many(line, candidates):
+    """
+    Determines which of a batch of segments a line intersects, giving the
+    same answer for each segment as Line.intersects. Segments touching
+    the line or collinear with it do not intersect it.
+
+    :param line: the line
+    :type line: Line
+    :param candidates: the left x, left y, right x and right y coordinates
+        of the segments to check
+    :type candidates: tuple(numpy.ndarray)
+    :rtype: numpy.ndarray(bool)
+    :return: whether the line intersects each of the segments
+    """
+    left_x, left_y, right_x, right_y = candidates
+    (line_left_x, line_left_y), (line_right_x, line_right_y) = (
+        line.left_point, line.right_point
+    )
+
+    # the same cross products as side_of_line, computed for every segment
+    line_x = line_right_x - line_left_x
+    line_y = line_right_y - line_left_y
+    candidates_straddle = (
+        numpy.sign(line_x * (left_y - line_left_y) -
+                   line_y * (left_x - line_left_x)) *
+        numpy.sign(line_x * (right_y - line_left_y) -
+                   line_y * (right_x - line_left_x)) == -1
+    )
+
+    candidate_x = right_x - left_x
+    candidate_y = right_y - left_y
+    line_straddles = (
+        numpy.sign(candidate_x * (line_left_y - left_y) -
+                   candidate_y * (line_left_x - left_x)) *
+        numpy.sign(candidate_x * (line_right_y - left_y) -
+                   candidate_y * (line_right_x - left_x)) == -1
+    )
+
+    return candidates_straddle & line_straddles
+
+
+class SegmentStore(object):
+    """
+    Stores the endpoints of line segments in parallel float64 arrays, so
+    that batches of them can be checked with intersects_many.
+
+    Segments are referred to by their index in the arrays, and can be
+    removed by clearing their bit in an array of live segments, after
+    which they are no longer reported as intersecting anything.
+    """
+    def __init__(self, capacity=64):
+        """
+        :param capacity: the number of segments to allocate room for
+        :type capacity: int
+        """
+        self.coordinates = numpy.empty((4, max(1, capacity)))
+        self.live = numpy.zeros(max(1, capacity), dtype=bool)
+        self.size = 0
+        self.num_live = 0
+        self.live_indexes = None
+        self.live_endpoints = None
+
+    def add(self, line):
+        """
+        Store the endpoints of a line, growing the arrays if needed.
+
+        :param line: the line to store
+        :type line: Line
+        :rtype: int
+        :return: the index of the stored segment
+        """
+        index = self.size
+        if index == self.coordinates.shape[1]:
+            grown = numpy.empty((4, 2 * index))
+            grown[:, :index] = self.coordinates
+            self.coordinates = grown
+            self.live = numpy.concatenate(
+                (self.live, numpy.zeros(index, dtype=bool))
+            )
+
+        self.coordinates[:, index] = line.left_point + line.right_point
+        self.live[index] = True
+        self.size += 1
+        self.num_live += 1
+        self.live_indexes = None
+        return index
+
+    def remove(self, indexes):
+        """
+        Remove stored segments.
+
+        :param indexes: the indexes of the segments to remove
+        :type indexes: numpy.ndarray(int) or list[int]
+        :rtype: numpy.ndarray(int)
+        :return: the indexes of the segments that hadn't been removed yet
+        """
+        indexes = numpy.asarray(indexes, dtype=int)
+        indexes = numpy.unique(indexes[self.live[indexes]])
+        self.live[indexes] = False
+        self.num_live -= len(indexes)
+        return indexes
+
+    def endpoints(self, indexes):
+        """
+        Gathers the endpoints of some of the stored segments.
+
+        :param indexes: the indexes of the segments to gather
+        :type indexes: list[int]
+        :rtype: tuple(numpy.ndarray)
+        :return: the left x, left y, right x and right y coordinates of the
+            segments, as taken by intersects_many
+        """
+        return tuple(self.coordinates[:, indexes])
+
+    def intersecting(self, line):
+        """
+        Finds every stored segment a line intersects, in one batch.
+
+        The endpoints of the segments still stored are gathered into
+        contiguous arrays, which are only gathered again once half of
+        those segments have been removed.
+
+        :param line: the line to check
+        :type line: Line
+        :rtype: numpy.ndarray(int)
+        :return: the indexes of the stored segments the line intersects
+        """
+        if (self.live_indexes is None or
+                2 * self.num_live < len(self.live_indexes)):
+            self.live_indexes = numpy.flatnonzero(self.live[:self.size])
+            self.live_endpoints = self.endpoints(self.live_indexes)
+
+        return self.live_indexes[
+            intersects_many(line, self.live_endpoints) &
+            self.live[self.live_indexes]
+        ]
+
+    def __len__(self):
+        return self.num_live
+
+
+class LineStore(SegmentStore):
+    """
+    Stores every line between pairs of a set of points in parallel arrays,
+    along with each point's lines ordered by increasing length.
+
+    Freeing lines only clears their live bits and counts down how many
+    lines each of their points has left. A point's ordered lines are
+    walked past freed ones when its closest line is asked for.
+    """
+    def __init__(self, points):
+        """
+        :param points: the points to connect
+        :type points: list[tuple(float, float)]
+        """
+        num_points = len(points)
+        from_points, to_points = numpy.triu_indices(num_points, 1)
+        num_lines = len(from_points)
+        SegmentStore.__init__(self, num_lines)
+
+        self.points = points
+        self.from_points = from_points
+        self.to_points = to_points
+
+        coordinates = numpy.array(points, dtype=float).reshape(-1, 2)
+        from_x, from_y = coordinates[from_points].T
+        to_x, to_y = coordinates[to_points].T
+        from_right = (from_x > to_x) | ((from_x == to_x) & (from_y > to_y))
+        self.coordinates[:, :num_lines] = (
+            numpy.where(from_right, to_x, from_x),
+            numpy.where(from_right, to_y, from_y),
+            numpy.where(from_right, from_x, to_x),
+            numpy.where(from_right, from_y, to_y)
+        )
+        self.live[:num_lines] = True
+        self.size = self.num_live = num_lines
+        self.distances = numpy.sqrt((from_x - to_x) ** 2 +
+                                    (from_y - to_y) ** 2)
+
+        # each point's lines, ordered by point and then by distance
+        line_points = numpy.concatenate((from_points, to_points))
+        point_lines = numpy.tile(numpy.arange(num_lines), 2)
+        order = numpy.lexsort((self.distances[point_lines], line_points))
+        self.ordered_lines = point_lines[order]
+
+        self.remaining = numpy.bincount(line_points, minlength=num_points)
+        self.cursors = [0] + numpy.cumsum(self.remaining)[:-1].tolist()
+
+    def line(self, index):
+        """
+        Makes a line object for a stored line.
+
+        :param index: the index of the line
+        :type index: int
+        :rtype: Line
+        :return: the line
+        """
+        return Line(self.points[self.from_points[index]],
+                    self.points[self.to_points[index]])
+
+    def other_point(self, index, point):
+        """
+        Finds the point at the other end of a stored line.
+
+        :param index: the index of the line
+        :type index: int
+        :param point: the index of the point at one end of the line
+        :type point: int
+        :rtype: int
+        :return: the index of the point at the other end
+        """
+        if self.from_points[index] == point:
+            return int(self.to_points[index])
+        return int(self.from_points[index])
+
+    def closest(self, point):
+        """
+        Finds the shortest line left from a point. The point must have
+        lines left.
+
+        :param point: the index of the point
+        :type point: int
+        :rtype: int
+        :return: the index of the line
+        """
+        cursor = self.cursors[point]
+        while not self.live[self.ordered_lines[cursor]]:
+            cursor += 1
+        self.cursors[point] = cursor
+        return int(self.ordered_lines[cursor])
+
+    def free(self, indexes):
+        """
+        Free stored lines.
+
+        :param indexes: the indexes of the lines to free
+        :type indexes: numpy.ndarray(int) or list[int]
+        :rtype: numpy.ndarray(int)
+        :return: the indexes of the points left without any lines
+        """
+        indexes = self.remove(indexes)
+        line_points = numpy.concatenate((self.from_points[indexes],
+                                         self.to_points[indexes]))
+        numpy.subtract.at(self.remaining, line_points, 1)
+        return numpy.unique(line_points[self.remaining[line_points] == 0])
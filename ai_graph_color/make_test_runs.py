@@ -1,4 +1,7 @@
-import problem_generator
+import random
+import sys
+
+import graph_cache
 import runner
 from algorithms import backtracking
 from algorithms import backtracking_mac
@@ -14,7 +17,11 @@ algorithms = [
     min_conflicts
 ]
 
-problem = problem_generator.generate_graph(25)
+# a new graph each run unless a seed is given, printing the seed so that
+# the graph can be loaded from the cache again
+seed = int(sys.argv[1]) if len(sys.argv) > 1 else random.randrange(2 ** 32)
+print 'Graph seed: {}'.format(seed)
+problem = graph_cache.GraphCache('graph_cache').generate_graph(25, seed=seed)
 
 for algorithm in algorithms:
     runner.test_run(
@@ -0,0 +1,120 @@
+"""
+Measures how many iterations min-conflicts takes to get its coloring as
+good as it will get when it picks nodes to move uniformly, and when it
+only picks nodes with conflicts, on the same graphs with the same seeds.
+
+Min-conflicts only ever moves a node to a color with fewer conflicts,
+so a run either finds a coloring or stops improving in a local minimum,
+and the iterations it takes to get there are what the picking affects.
+"""
+import json
+import random
+import sys
+
+import problem_generator
+import setup
+from algorithm import LimitedAlgorithm
+from algorithms import min_conflicts
+from graph import Graph
+
+selections = ['uniform', 'conflicted']
+
+
+def iterations_to_best(graph, params, limit, step):
+    """
+    Runs min-conflicts until it finds a coloring or reaches an iteration
+    limit, checking its conflicts every so many iterations.
+
+    :param graph: the graph to color
+    :type graph: Graph
+    :param params: the params to pass to min-conflicts
+    :type params: dict
+    :param limit: the most iterations to run for
+    :type limit: int
+    :param step: the number of iterations between checks
+    :type step: int
+    :rtype: dict
+    :return: the fewest conflicts seen, the iterations taken to first
+        reach them, and whether the coloring was finished
+    """
+    evaluation = setup.Evaluation()
+    runner = LimitedAlgorithm(min_conflicts, graph, evaluation, params)
+
+    best, best_iterations = None, 0
+    finished = False
+    iterations = 0
+    while not finished and iterations < limit:
+        iterations = min(iterations + step, limit)
+        runner.set_limit(iterations)
+        conflicts = runner.next_output()
+        if best is None or conflicts < best:
+            best, best_iterations = conflicts, evaluation.counter.counter
+        finished = evaluation.counter.counter < iterations
+
+    return {
+        'conflicts': best,
+        'iterations': best_iterations,
+        'solved': best == 0
+    }
+
+
+def compare_selections(num_vertices, num_colors, seeds, limit, step=100):
+    """
+    Runs min-conflicts with each way of picking nodes on a triangulation
+    generated from each seed, seeding the random number generator the
+    same way for both.
+
+    :param num_vertices: the number of vertices of each graph
+    :type num_vertices: int
+    :param num_colors: the number of colors to color with
+    :type num_colors: int
+    :param seeds: the seeds to generate graphs and run with
+    :type seeds: list[int]
+    :param limit: the most iterations of each run
+    :type limit: int
+    :param step: the number of iterations between checks of each run
+    :type step: int
+    :rtype: dict
+    :return: the results of the runs with each selection, in the order
+        of the seeds
+    """
+    results = dict((selection, []) for selection in selections)
+    for seed in seeds:
+        graph = Graph(problem_generator.generate_graph(
+            num_vertices, 'triangulation', seed
+        ))
+        for selection in selections:
+            random.seed(seed)
+            results[selection].append(iterations_to_best(
+                graph, {'colors': num_colors, 'selection': selection},
+                limit, step
+            ))
+    return results
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    if len(args) < 2:
+        print('Usage: {Number of Vertices} {Colors} [{Seeds}] '
+              '[{Iteration Limit}] [{Output JSON}]')
+    else:
+        results = compare_selections(
+            int(args[0]), int(args[1]),
+            range(int(args[2]) if len(args) > 2 else 5),
+            int(args[3]) if len(args) > 3 else 1000000
+        )
+
+        print '{:<12} {:>14} {:>14} {:>8}'.format(
+            'selection', 'iterations', 'conflicts', 'solved'
+        )
+        for selection in selections:
+            runs = results[selection]
+            print '{:<12} {:>14.0f} {:>14.1f} {:>8}'.format(
+                selection,
+                sum(run['iterations'] for run in runs) / float(len(runs)),
+                sum(run['conflicts'] for run in runs) / float(len(runs)),
+                sum(run['solved'] for run in runs)
+            )
+        if len(args) > 4:
+            with open(args[4], 'w') as output_file:
+                json.dump(results, output_file, indent=4, sort_keys=True)
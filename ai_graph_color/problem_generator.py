@@ -1,13 +1,18 @@
 """
 This file will generate a random planar graph
 """
-from itertools import combinations
-from line import Line
-from llist import dllist
-
+from csr_graph import CSRGraph, read_csr_graph, write_csr_graph
+from indexed_set import IndexedSet
+from line import Line, LineStore, point_distance
+from spatial_index import LineGrid, PointGrid, SegmentGrid
+from triangulation import delaunay_graph
+
+import math
+import numpy
 import os
 import random
 import sys
+import tempfile
 import json
 import logging
 
@@ -17,13 +22,15 @@ log = logging.getLogger(__name__)
 def write_graph_to_file(out_file, graph):
     """
     Writes the given graph to the specified file.
-    If the file already exists it deletes it.
+    Files ending in .csr are written in the binary CSR format, and any
+    other files as JSON.
+    If the file already exists it is replaced in one step.
     If the path doesn't exist it creates it.
 
     :param out_file: Location of the outfile
     :type out_file: str
     :param graph: The adjacency list to write
-    :type graph: list[list[int]]
+    :type graph: list[list[int]] or CSRGraph
     :rtype: None
     :return: Nothing, but a file is written
     """
@@ -33,10 +40,38 @@ def write_graph_to_file(out_file, graph):
             os.makedirs(os.path.dirname(out_file))
         except OSError as exc:
             log.error(exc)
-    elif os.path.exists(out_file):
-        os.remove(out_file)
-    with open(out_file, 'w') as out_file:
-        json.dump(graph, out_file, encoding='utf8')
+
+    replace_graph_file(out_file, graph)
+
+
+def replace_graph_file(file_path, graph):
+    """
+    Writes a graph to a temporary file in the same directory as the given
+    path, then renames it into place, so that readers (or other writers)
+    never see a partially written graph.
+
+    :param file_path: The path of the file to write, in the format given
+        by its extension
+    :type file_path: str
+    :param graph: The adjacency list to write
+    :type graph: list[list[int]] or CSRGraph
+    :rtype: None
+    :return: Nothing, but a file is written
+    """
+    handle, temp_file = tempfile.mkstemp(dir=os.path.dirname(file_path))
+    try:
+        with os.fdopen(handle, 'wb') as temp:
+            if is_csr_file(file_path):
+                write_csr_graph(temp, graph)
+            else:
+                if isinstance(graph, CSRGraph):
+                    graph = graph.to_lists()
+                json.dump(graph, temp, encoding='utf8')
+        os.chmod(temp_file, 0o644)
+        os.rename(temp_file, file_path)
+    except Exception:
+        os.remove(temp_file)
+        raise
 
 
 def generate_file_path(file_name):
@@ -51,35 +86,66 @@ def generate_file_path(file_name):
     return os.path.join('problems', file_name)
 
 
+def is_csr_file(file_name):
+    """
+    Checks whether a file holds a graph in the binary CSR format
+
+    :param file_name: The name of the file
+    :type file_name: str
+    :rtype: bool
+    :return: Whether the file name has the .csr extension
+    """
+    return os.path.splitext(file_name)[1] == '.csr'
+
+
 def read_graph_from_file(in_file):
     """
-    Reads in a graph and returns it
+    Reads in a graph and returns it.
+    Files ending in .csr are mapped into memory rather than parsed.
 
     :param in_file: name of input file
     :type in_file: str
-    :rtype: list[list[int]]
+    :rtype: list[list[int]] or CSRGraph
     :return: adjacency list representing graph from file
     """
     in_file = generate_file_path(in_file)
+    if is_csr_file(in_file):
+        return read_csr_graph(in_file)
     with open(in_file) as in_file:
         graph = json.load(in_file, encoding='utf8')
     return graph
 
 
-def generate_graph(num_vert):
+def generate_graph(num_vert, mode='all_pairs', seed=None, rng=random,
+                   thinning=0.0):
     """
     Generates a random planar graph with specified number of vertices
 
     :param num_vert: The number of vertices to have in the graph
     :type num_vert: int
+    :param mode: How to build the graph, one of the keys of build_modes
+    :type mode: str
+    :param seed: The seed for the random number generator
+    :type seed: int
+    :param rng: The random number generator to generate with
+    :type rng: random.Random
+    :param thinning: The fraction of the built graph's edges to remove
+        at random
+    :type thinning: float
     :rtype: list[list[int]]
     :return: A random planar graph as an adjacency list
     """
-    random_points = scatter_points(num_vert)
-    return build_graph(random_points)
+    if mode not in build_modes:
+        raise Exception("Unknown graph generation mode: {}".format(mode))
+
+    random_points = scatter_points(num_vert, seed, rng)
+    graph = build_modes[mode](random_points, rng)
+    if thinning > 0:
+        thin_edges(graph, thinning, rng)
+    return graph
 
 
-def build_graph(points):
+def build_graph(points, rng=random):
     """
     Generates a planar graph from a set of points by following a particular
     set of rules:
@@ -94,89 +160,387 @@ def build_graph(points):
           2. the line connecting X and Y does not cross any other existing
              lines
 
+    Every line between two points is made up front, so building takes
+    memory growing with the square of the number of points. The lines
+    are bucketed into a grid of cells, and each edge made only checks
+    the lines left in the cells it passes through for crossings, in one
+    batch. build_graph_lazy, which follows the same rules, only makes
+    the lines it needs.
+
     :param points: the points from which to generate the graph
     :type points: list[tuple(int,int)]
+    :param rng: the random number generator to pick points with
+    :type rng: random.Random
     :rtype: graph (adjacency list)
     :return: a planar graph constructed from the given vertices
     """
-    lines = create_lines(points)
-    point_distances = create_distance_list(lines, len(points))
+    return connect_lines(LineGrid(LineStore(points)), rng)
 
-    graph = [[] for _ in range(len(points))]
 
-    while len(lines) > 0:
+def connect_lines(line_grid, rng=random):
+    """
+    Connects the points of a set of lines by the rules of build_graph,
+    using up the lines.
+
+    :param line_grid: every line between the points, bucketed into cells
+    :type line_grid: LineGrid
+    :param rng: the random number generator to pick points with
+    :type rng: random.Random
+    :rtype: graph (adjacency list)
+    :return: a planar graph constructed from the lines' points
+    """
+    lines = line_grid.lines
+    available_points = IndexedSet(
+        index for index in xrange(len(lines.points))
+        if lines.remaining[index] > 0
+    )
+
+    graph = [[] for _ in range(len(lines.points))]
+
+    while len(available_points) > 0:
         from_point, to_point, random_line = pick_random_closest(
-            point_distances
+            lines, available_points, rng
         )
 
         connect(graph, from_point, to_point)
-        remove_conflicting_lines(lines, random_line)
+        remove_conflicting_lines(line_grid, available_points, random_line)
+    return graph
+
+
+def build_graph_lazy(points, rng=random):
+    """
+    Generates a planar graph from a set of points following the same rules
+    as build_graph, without creating every possible line up front.
+
+    Instead, the points closest to each point are found as they are
+    needed, and connections are checked against the edges made so far,
+    so memory only grows with the number of points and the nearby points
+    each one is still considering.
+
+    :param points: the points from which to generate the graph
+    :type points: list[tuple(int,int)]
+    :param rng: the random number generator to pick points with
+    :type rng: random.Random
+    :rtype: graph (adjacency list)
+    :return: a planar graph constructed from the given vertices
+    """
+    return connect_lazily(PointGrid(points), SegmentGrid(points), rng)
+
+
+def connect_lazily(point_grid, edges, rng=random, graph=None,
+                   indexes=None):
+    """
+    Connects the points of a point grid by the rules of build_graph_lazy.
+
+    :param point_grid: the points, bucketed into a grid
+    :type point_grid: PointGrid
+    :param edges: a grid holding the edges connected so far
+    :type edges: SegmentGrid
+    :param rng: the random number generator to pick points with
+    :type rng: random.Random
+    :param graph: the graph connected so far, which is connected further
+        in place, defaults to a graph without edges
+    :type graph: list[list[int]]
+    :param indexes: the indexes of the points to pick connections for,
+        defaults to all of the points
+    :type indexes: iterable(int)
+    :rtype: graph (adjacency list)
+    :return: a planar graph constructed from the grid's points
+    """
+    points = point_grid.points
+    if graph is None:
+        graph = [[] for _ in range(len(points))]
+    if indexes is None:
+        indexes = xrange(len(points))
+
+    available_points = IndexedSet(indexes)
+    closest_points = dict(
+        (index, point_grid.closest(index)) for index in available_points
+    )
+
+    while len(available_points) > 0:
+        random_point = available_points.choice(rng)
+        to_point = pick_closest_lazily(
+            graph, points, edges, closest_points[random_point], random_point
+        )
 
-        random_line.free()
+        if to_point is None:
+            available_points.discard(random_point)
+            del closest_points[random_point]
+        else:
+            connect(graph, random_point, to_point)
+            edges.add(Line(points[random_point], points[to_point]))
     return graph
 
 
-def create_lines(points):
+def build_triangulation(points, rng=random):
+    """
+    Generates a planar graph from a set of points by connecting them in
+    their Delaunay triangulation, which is much faster than the rules of
+    build_graph for large numbers of points.
+
+    :param points: the points from which to generate the graph
+    :type points: list[tuple(int,int)]
+    :param rng: unused, since the triangulation of a set of points
+        doesn't depend on chance
+    :type rng: random.Random
+    :rtype: graph (adjacency list)
+    :return: a planar graph constructed from the given vertices
+    """
+    return delaunay_graph(points)
+
+
+def thin_edges(graph, ratio, rng=random):
     """
-    Generate a map of all the possible lines between points, indexed by an
-    immutable set of the indexes of the two points connected by the line
+    Removes a random fraction of the edges of a graph, skipping any edge
+    whose removal would leave a vertex without connections.
 
-    :param points: the points to create lines from
+    :param graph: the graph to thin
+    :type graph: list[list[int]]
+    :param ratio: the fraction of the edges to remove
+    :type ratio: float
+    :param rng: the random number generator to pick edges with
+    :type rng: random.Random
+    :return: Nothing, but edges are removed from the graph
+    """
+    edges = [
+        (from_index, to_index)
+        for from_index, connections in enumerate(graph)
+        for to_index in connections if from_index < to_index
+    ]
+    rng.shuffle(edges)
+
+    num_to_remove = int(round(ratio * len(edges)))
+    for from_index, to_index in edges:
+        if num_to_remove == 0:
+            break
+        if len(graph[from_index]) > 1 and len(graph[to_index]) > 1:
+            graph[from_index].remove(to_index)
+            graph[to_index].remove(from_index)
+            num_to_remove -= 1
+
+
+def grow_graph(graph, points, new_points, rng=random):
+    """
+    Adds points to a graph generated from a set of points, connecting
+    each new point by the rules of build_graph against the edges already
+    in the graph. Only the new points pick connections, so the work done
+    grows with the number of new points rather than the size of the
+    whole graph.
+
+    Since the existing points can't connect to each other without
+    crossing an edge, the grown graph is as connected as one built from
+    every point at once, as long as no new point lies exactly on an
+    existing edge. Lines running along an edge through one of its
+    endpoints don't cross it, so such a point may miss connections that
+    pass through its neighbors.
+
+    :param graph: the graph generated from the existing points
+    :type graph: list[list[int]]
+    :param points: the existing points
     :type points: list[tuple(float, float)]
-    :return: the map of lines
-    :rtype: map<frozenset(int), Line>
+    :param new_points: the points to add
+    :type new_points: list[tuple(float, float)]
+    :param rng: the random number generator to pick points with
+    :type rng: random.Random
+    :rtype: list[list[int]]
+    :return: a new graph whose first vertices are those of the given
+        graph, followed by a vertex for each new point
     """
-    lines = {}
-    for point_a, point_b in combinations(enumerate(points), 2):
-        connecting_line = Line(point_a[1], point_b[1])
-        key = frozenset([point_a[0], point_b[0]])
-        lines[key] = connecting_line
+    all_points = list(points) + list(new_points)
+    grown_graph = [map(int, connections) for connections in graph]
+    grown_graph.extend([] for _ in new_points)
+
+    edges = SegmentGrid(all_points)
+    for from_index, connections in enumerate(grown_graph):
+        for to_index in connections:
+            if from_index < to_index:
+                edges.add(Line(all_points[from_index], all_points[to_index]))
 
-        connecting_line.add_reference(dict.pop, lines, key)
-    return lines
+    return connect_lazily(
+        PointGrid(all_points), edges, rng, grown_graph,
+        xrange(len(points), len(all_points))
+    )
 
 
-def create_distance_list(lines, num_points):
+def generate_nested_graphs(sizes, seed=None, rng=random):
     """
-    Generate a list of doubly-linked lists ordering the given lines by
-    increasing distance from the point at the current index.
+    Generates a family of random planar graphs, each one grown from the
+    one before it by adding random points.
 
-    :param lines: the map of lines
-    :type lines: map<frozenset(int), Line>
-    :param num_points: the number of points being connected
-    :type num_points: int
-    :return: the distance list
-    :rtype: list[dllist(tuple(int, Line))]
+    :param sizes: the number of vertices of each graph, in increasing
+        order
+    :type sizes: list[int]
+    :param seed: the seed for the random number generator
+    :type seed: int
+    :param rng: the random number generator to generate with
+    :type rng: random.Random
+    :rtype: generator(tuple(list[tuple(float, float)], list[list[int]]))
+    :return: the points and the graph of each size
+    """
+    rng.seed(seed)
+    points, graph = [], []
+    for num_vert in sizes:
+        new_points = [
+            (rng.random(), rng.random())
+            for _ in xrange(num_vert - len(points))
+        ]
+        graph = grow_graph(graph, points, new_points, rng)
+        points = points + new_points
+        yield points, graph
+
+
+def pick_closest_lazily(graph, points, edges, closest_points, index):
     """
-    point_distances = [[] for _ in xrange(num_points)]
-    for point_pair, connecting_line in lines.iteritems():
-        if len(point_pair) != 2:
-            raise Exception(
-                ("Expected set indexes into set-line-map to have exactly 2 "
-                 "point indexes")
-            )
+    Finds the closest point a point can still connect to, skipping past
+    the points it is already connected to or whose connection would cross
+    an edge. Skipped points are never considered again, since edges are
+    only ever added.
+
+    Once a point is enclosed by the faces around it, any point further
+    away than their corners would have to cross one of their edges, so
+    the search stops there.
+
+    :param graph: the graph connected so far
+    :type graph: list[list[int]]
+    :param points: the points of the graph
+    :type points: list[tuple(float, float)]
+    :param edges: the edges connected so far
+    :type edges: SegmentGrid
+    :param closest_points: the remaining points ordered by increasing
+        distance from the point
+    :type closest_points: generator(tuple(float, int))
+    :param index: the index of the point
+    :type index: int
+    :rtype: int
+    :return: the index of the closest connectable point, or None if it
+        can't be connected to any more points
+    """
+    reach = None
+    for distance, other_index in closest_points:
+        if other_index in graph[index]:
+            continue
+
+        connecting_line = Line(points[index], points[other_index])
+        if not edges.crosses(connecting_line,
+                             connecting_line.right_point == points[index]):
+            return other_index
 
-        point_a, point_b = tuple(point_pair)
+        if reach is None:
+            reach = enclosing_distance(graph, points, index)
+        if distance > reach:
+            return None
+    return None
 
-        point_distances[point_a].append((point_b, connecting_line))
-        point_distances[point_b].append((point_a, connecting_line))
 
-    for index, distance_list in enumerate(point_distances):
-        point_distances[index] = dllist(
-            sorted(distance_list, key=lambda x: x[1].distance)
+def enclosing_distance(graph, points, index):
+    """
+    Computes a distance beyond which no point can connect to a given point
+    without crossing an edge.
+
+    Each gap between consecutive neighbors of the point opens onto a face
+    of the graph connected so far. If every one of those faces is bounded,
+    the point is enclosed by them, and any point further away than all of
+    their corners lies outside of them.
+
+    :param graph: the graph connected so far
+    :type graph: list[list[int]]
+    :param points: the points of the graph
+    :type points: list[tuple(float, float)]
+    :param index: the index of the point
+    :type index: int
+    :rtype: float
+    :return: the enclosing distance, or infinity if the point isn't
+        enclosed
+    """
+    if len(graph[index]) == 0:
+        return float('inf')
+
+    farthest = 0
+    for neighbor in graph[index]:
+        corners = face_corners(graph, points, index, neighbor)
+        if corners is None:
+            return float('inf')
+        farthest = max(farthest, max(
+            point_distance(points[index], points[corner])
+            for corner in corners
+        ))
+    return farthest
+
+
+def face_corners(graph, points, from_index, to_index):
+    """
+    Walks around the face of the graph to the left of the edge going from
+    one point to another, turning as sharply right as possible at each
+    corner, until coming back to that edge.
+
+    Edges of points lying on a line can overlap without crossing, so the
+    walk may loop without coming back to the edge. Since it can't take
+    more steps than there are directed edges without going over one of
+    them twice, it stops once it does, and the face is taken to be
+    unbounded.
+
+    :param graph: the graph connected so far
+    :type graph: list[list[int]]
+    :param points: the points of the graph
+    :type points: list[tuple(float, float)]
+    :param from_index: the index of the point the edge starts at
+    :type from_index: int
+    :param to_index: the index of the point the edge ends at
+    :type to_index: int
+    :rtype: list[int]
+    :return: the indexes of the corners of the face, or None if the face
+        is the unbounded one surrounding the graph or the walk loops
+    """
+    corners = [from_index]
+    area = 0
+    previous, current = from_index, to_index
+    walked = set()
+    while (previous, current) != (from_index, to_index) or len(corners) == 1:
+        if (previous, current) in walked:
+            return None
+        walked.add((previous, current))
+        corners.append(current)
+        area += (points[previous][0] * points[current][1] -
+                 points[current][0] * points[previous][1])
+        previous, current = current, next_clockwise(
+            graph, points, current, previous
         )
+    return corners if area > 0 else None
 
-        cur_node = point_distances[index].first
-        while cur_node is not None:
-            connected_index = cur_node.value[0]
-            lines[frozenset([index, connected_index])].add_reference(
-                dllist.remove, point_distances[index], cur_node
-            )
-            cur_node = cur_node.next
-    return point_distances
 
+def next_clockwise(graph, points, index, neighbor):
+    """
+    Finds the neighbor of a point that comes next clockwise around it
+    after a given neighbor, wrapping back to that neighbor if it's the
+    only one. Neighbors in the same direction are ordered by increasing
+    distance.
+
+    :param graph: the graph connected so far
+    :type graph: list[list[int]]
+    :param points: the points of the graph
+    :type points: list[tuple(float, float)]
+    :param index: the index of the point
+    :type index: int
+    :param neighbor: the index of the given neighbor
+    :type neighbor: int
+    :rtype: int
+    :return: the index of the next neighbor clockwise
+    """
+    x, y = points[index]
+    start_angle = math.atan2(points[neighbor][1] - y, points[neighbor][0] - x)
+    return min(
+        graph[index],
+        key=lambda other: (
+            (start_angle - math.atan2(points[other][1] - y,
+                                      points[other][0] - x)
+             ) % (2 * math.pi) or 2 * math.pi,
+            point_distance(points[index], points[other])
+        )
+    )
 
-def scatter_points(num_points, seed=None):
+
+def scatter_points(num_points, seed=None, rng=random):
     """
     Generates a specified number of random 2d points in the rectangle from
     (0, 0) to (1, 1).
@@ -187,37 +551,38 @@ def scatter_points(num_points, seed=None):
     :type num_points: int
     :param seed: the seed for the pseudo-random number generator
     :type seed: int
+    :param rng: the pseudo-random number generator to seed and use
+    :type rng: random.Random
     :rtype: list[tuple(int,int)]
     :return: list of generated points
     """
-    random.seed(seed)
+    rng.seed(seed)
 
     return [
-        (random.random(), random.random()) for _ in range(num_points)
+        (rng.random(), rng.random()) for _ in range(num_points)
     ]
 
 
-def pick_random_closest(point_distances):
+def pick_random_closest(lines, available_points, rng=random):
     """
     Picks a random unconnected point and returns the closest connection
     from that point that doesn't interesect any other connections.
 
-    :param point_distances: the distance list for the set of points
-    :type point_distances: list[dllist(tuple(int, Line))]
-    :rtype tuple(integer, integer, Line)
-    :return the closest connection to a random point
+    :param lines: the lines left between the points
+    :type lines: LineStore
+    :param available_points: the points with connections left
+    :type available_points: IndexedSet
+    :param rng: the random number generator to pick the point with
+    :type rng: random.Random
+    :rtype tuple(integer, integer, integer)
+    :return the closest connection to a random point, and the index of
+        its line
     """
-    available_points = [
-        index for index, connections in enumerate(point_distances)
-        if len(connections) > 0
-    ]
-
-    random_point = random.choice(available_points)
-    connections = point_distances[random_point]
+    random_point = available_points.choice(rng)
+    closest_line = lines.closest(random_point)
 
-    connection = connections.first.value
-
-    return random_point, connection[0], connection[1]
+    return (random_point, lines.other_point(closest_line, random_point),
+            closest_line)
 
 
 def connect(graph, from_index, to_index):
@@ -236,30 +601,37 @@ def connect(graph, from_index, to_index):
     graph[to_index].append(from_index)
 
 
-def remove_conflicting_lines(lines, selected_line):
+def remove_conflicting_lines(line_grid, available_points, selected_line):
     """
-    Frees any lines that conflict with a selected line from the
-    data structures that reference them.
-
-    :param lines: the remaining lines
-    :type lines: map<frozenset(int), Line>
-    :param selected_line: the line to check conflicts against
-    :type selected_line: Line
-    :return: Nothing, but removes any conflicting lines from lines
+    Frees a selected line along with any lines that conflict with it, and
+    removes the points left without lines from the available points.
+
+    :param line_grid: the remaining lines, bucketed into cells
+    :type line_grid: LineGrid
+    :param available_points: the points with connections left
+    :type available_points: IndexedSet
+    :param selected_line: the index of the line to check conflicts against
+    :type selected_line: int
+    :return: Nothing, but removes the lines from lines
     """
-    conflicting_lines = []
-    for line in lines.itervalues():
-        if line.intersects(selected_line):
-            conflicting_lines.append(line)
+    lines = line_grid.lines
+    conflicting_lines = line_grid.intersecting(lines.line(selected_line))
+    freed_points = lines.free(numpy.append(conflicting_lines, selected_line))
+    for point in freed_points.tolist():
+        available_points.discard(point)
+
 
-    for conflicting_line in conflicting_lines:
-        conflicting_line.free()
+build_modes = {
+    'all_pairs': build_graph,
+    'lazy': build_graph_lazy,
+    'triangulation': build_triangulation
+}
 
 if __name__ == '__main__':
     args = sys.argv[1:]
-    if len(args) != 2:
-        print('Usage: {Outfile} {Number of Vertices}')
+    if len(args) not in (2, 3):
+        print('Usage: {Outfile} {Number of Vertices} [{Mode}]')
     else:
-        outfile, num_vert = args
+        outfile, num_vert = args[:2]
         num_vert = int(num_vert)
-        write_graph_to_file(outfile, generate_graph(num_vert))
+        write_graph_to_file(outfile, generate_graph(num_vert, *args[2:]))
@@ -2,7 +2,8 @@ import setup
 from algorithm import LimitedAlgorithm
 
 
-def evaluate(algorithm, problem, params=None, iteration_limit=None):
+def evaluate(algorithm, problem, params=None, iteration_limit=None,
+             checkpoint_path=None, checkpoint_interval=None):
     """
     Execute an algorithm module with an evaluation setup.
     """
@@ -11,25 +12,35 @@ def evaluate(algorithm, problem, params=None, iteration_limit=None):
         problem,
         setup.Evaluation(),
         params,
-        iteration_limit
+        iteration_limit,
+        checkpoint_path,
+        checkpoint_interval
     )
 
 
 def test_run(algorithm, problem, test_run_path, params=None,
-             iteration_limit=None):
+             iteration_limit=None, checkpoint_path=None,
+             checkpoint_interval=None):
     """
     Execute an algorithm module with an test run setup.
     """
-    return execute(
-        algorithm,
-        problem,
-        setup.TestRun(test_run_path),
-        params,
-        iteration_limit
-    )
+    test_run_setup = setup.TestRun(test_run_path)
+    try:
+        return execute(
+            algorithm,
+            problem,
+            test_run_setup,
+            params,
+            iteration_limit,
+            checkpoint_path,
+            checkpoint_interval
+        )
+    finally:
+        test_run_setup.close()
 
 
-def execute(algorithm, problem, setup, params, iteration_limit):
+def execute(algorithm, problem, setup, params, iteration_limit,
+            checkpoint_path=None, checkpoint_interval=None):
     """
     Run a given algorithm on a particular problem and setup with
     a particular set of params, up until a particular iteration
@@ -46,10 +57,17 @@ def execute(algorithm, problem, setup, params, iteration_limit):
     :type params: map<string, object>
     :iteration_limit: the maximum number of iterations for the run
     :type iteration_limit: int
+    :param checkpoint_path: the path to save checkpoints of the run to,
+        and to resume it from if there is one there already, or None
+    :type checkpoint_path: str
+    :param checkpoint_interval: the number of iterations between
+        checkpoints
+    :type checkpoint_interval: int
     :rtype: tuple(object, int)
     :return: the algorithm's result and the iteration it ended on
     """
-    runner = LimitedAlgorithm(algorithm, problem, setup, params)
+    runner = LimitedAlgorithm(algorithm, problem, setup, params,
+                              checkpoint_path, checkpoint_interval)
     runner.set_limit(iteration_limit)
 
     return runner.next_output(), setup.counter.counter
@@ -1,19 +1,45 @@
 import logging
 from counter import Counter
+import trace_sink
 
 
 class TestRun:
     """
     A setup that allows logging to a file and counting.
+
+    A path ending in .jsonl.gz gets a compressed trace of events, written
+    by a background thread, and any other path a text log.
     """
     def __init__(self, output_path):
         self.logger = logging.getLogger(output_path)
         self.logger.setLevel(logging.DEBUG)
-        file_handler = logging.FileHandler(output_path)
-        file_handler.setLevel(logging.DEBUG)
-        self.logger.addHandler(file_handler)
+        # a logger is shared by every setup with the same path
+        self.close()
+        if trace_sink.is_trace_path(output_path):
+            handler = trace_sink.TraceHandler(
+                trace_sink.TraceWriter(output_path)
+            )
+        else:
+            handler = logging.FileHandler(output_path)
+        handler.setLevel(logging.DEBUG)
+        self.logger.addHandler(handler)
 
         self.counter = Counter()
+        # statistics the algorithm reports about its run
+        self.stats = {}
+        # set by an algorithm that can be checkpointed, to get its state
+        self.snapshot = None
+        # whether debug messages are logged, checked by algorithms before
+        # building them so that tracing costs nothing when it is off
+        self.tracing = self.logger.isEnabledFor(logging.DEBUG)
+
+    def close(self):
+        """
+        Finishes writing the log and closes it.
+        """
+        for handler in list(self.logger.handlers):
+            handler.close()
+            self.logger.removeHandler(handler)
 
 
 class Evaluation:
@@ -25,3 +51,15 @@ class Evaluation:
         self.logger.setLevel(logging.CRITICAL)
 
         self.counter = Counter()
+        # statistics the algorithm reports about its run
+        self.stats = {}
+        # set by an algorithm that can be checkpointed, to get its state
+        self.snapshot = None
+        # whether debug messages are logged, checked by algorithms before
+        # building them so that tracing costs nothing when it is off
+        self.tracing = self.logger.isEnabledFor(logging.DEBUG)
+
+    def close(self):
+        """
+        Does nothing, as nothing is logged.
+        """
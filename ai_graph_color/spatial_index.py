@@ -0,0 +1,427 @@
+"""
+Spatial indexes used to speed up planar graph generation
+"""
+import heapq
+import math
+
+import numpy
+
+from line import SegmentStore, intersects_many, point_distance
+
+# the fewest segments worth checking with intersects_many at once
+min_batch_size = 16
+
+# how many times fewer cells along each side a grid of lines has than a
+# grid of as many points, since each line is stored in every cell it
+# passes through
+line_cells_divisor = 3
+
+
+class Grid:
+    """
+    A uniform grid of square-indexed cells covering the bounding box of a
+    set of points.
+    """
+    def __init__(self, points, cells_per_side=None):
+        """
+        :param points: the points used to size the grid
+        :type points: list[tuple(float, float)]
+        :param cells_per_side: the number of cells along each axis of the
+            grid, defaults to the square root of the number of points
+        :type cells_per_side: int
+        """
+        if cells_per_side is None:
+            cells_per_side = int(len(points) ** 0.5)
+        self.cells_per_side = max(1, cells_per_side)
+
+        if len(points) > 0:
+            self.min_x = min(point[0] for point in points)
+            self.min_y = min(point[1] for point in points)
+            width = max(point[0] for point in points) - self.min_x
+            height = max(point[1] for point in points) - self.min_y
+        else:
+            self.min_x = self.min_y = 0.0
+            width = height = 0.0
+
+        self.cell_width = float(width or 1.0) / self.cells_per_side
+        self.cell_height = float(height or 1.0) / self.cells_per_side
+        self.cells = [[] for _ in xrange(self.cells_per_side ** 2)]
+
+    def column(self, x):
+        """
+        Computes the grid column containing an x coordinate, clamping
+        coordinates outside of the grid to its border.
+
+        :param x: the x coordinate
+        :type x: float
+        :rtype: int
+        :return: the column index
+        """
+        column = int(math.floor((x - self.min_x) / self.cell_width))
+        return min(max(column, 0), self.cells_per_side - 1)
+
+    def row(self, y):
+        """
+        Computes the grid row containing a y coordinate, clamping
+        coordinates outside of the grid to its border.
+
+        :param y: the y coordinate
+        :type y: float
+        :rtype: int
+        :return: the row index
+        """
+        row = int(math.floor((y - self.min_y) / self.cell_height))
+        return min(max(row, 0), self.cells_per_side - 1)
+
+    def cells_along(self, segment, from_right=False):
+        """
+        Generates the indexes of every cell a segment passes through, one
+        column of the grid at a time.
+
+        The segment is split into the vertical strips of the grid's
+        columns, and every row spanned by the segment within a strip is
+        included. The strips are widened by a tiny margin so that
+        crossings lying on cell borders are not missed.
+
+        :param segment: the segment to walk along
+        :type segment: Line
+        :param from_right: whether to walk from the right endpoint of the
+            segment rather than the left
+        :type from_right: bool
+        :rtype: generator(int)
+        :return: the indexes of the cells the segment passes through
+        """
+        (left_x, left_y), (right_x, right_y) = (
+            segment.left_point, segment.right_point
+        )
+        margin_x = self.cell_width * 1e-9
+        margin_y = self.cell_height * 1e-9
+        first_column = self.column(left_x)
+        last_column = self.column(right_x)
+
+        columns = xrange(first_column, last_column + 1)
+        if from_right:
+            columns = reversed(columns)
+
+        for column in columns:
+            if left_x == right_x:
+                low_y, high_y = left_y, right_y
+            else:
+                slope = float(right_y - left_y) / (right_x - left_x)
+                low_x = left_x
+                if column > first_column:
+                    low_x = max(left_x, self.min_x +
+                                column * self.cell_width - margin_x)
+                high_x = right_x
+                if column < last_column:
+                    high_x = min(right_x, self.min_x +
+                                 (column + 1) * self.cell_width + margin_x)
+                low_y = left_y + (low_x - left_x) * slope
+                high_y = left_y + (high_x - left_x) * slope
+
+            for row in xrange(self.row(min(low_y, high_y) - margin_y),
+                              self.row(max(low_y, high_y) + margin_y) + 1):
+                yield column * self.cells_per_side + row
+
+
+class PointGrid(Grid):
+    """
+    Buckets the indexes of points into a uniform grid of cells, so that
+    the points closest to one of them can be found without measuring the
+    distance to every other point.
+    """
+    def __init__(self, points, cells_per_side=None):
+        """
+        :param points: the points to bucket
+        :type points: list[tuple(float, float)]
+        :param cells_per_side: the number of cells along each axis of the
+            grid, defaults to the square root of the number of points
+        :type cells_per_side: int
+        """
+        Grid.__init__(self, points, cells_per_side)
+        self.points = points
+        for index, (x, y) in enumerate(points):
+            self.cells[self.column(x) * self.cells_per_side +
+                       self.row(y)].append(index)
+
+    def closest(self, index):
+        """
+        Generates the other points in order of increasing distance from a
+        point.
+
+        Cells are searched in rings of growing size around the point's
+        cell, and a ring is only searched once the points already found
+        run out of ones that are known to be closer than anything left
+        unsearched, so only the points near the front of the order are
+        held in memory.
+
+        :param index: the index of the point
+        :type index: int
+        :rtype: generator(tuple(float, int))
+        :return: the distance to and index of each other point
+        """
+        point = self.points[index]
+        column, row = self.column(point[0]), self.row(point[1])
+        last_radius = max(column, row, self.cells_per_side - 1 - column,
+                          self.cells_per_side - 1 - row)
+        cell_size = min(self.cell_width, self.cell_height)
+
+        found = []
+        for radius in xrange(last_radius + 1):
+            for cell in self.ring(column, row, radius):
+                for other in self.cells[cell]:
+                    if other != index:
+                        heapq.heappush(found, (
+                            point_distance(point, self.points[other]), other
+                        ))
+
+            # anything outside of this ring is at least this far away
+            searched_distance = radius * cell_size
+            while len(found) > 0 and found[0][0] <= searched_distance:
+                yield heapq.heappop(found)
+
+        while len(found) > 0:
+            yield heapq.heappop(found)
+
+    def ring(self, column, row, radius):
+        """
+        Generates the indexes of the cells on the border of the square of
+        cells a given radius away from a cell.
+
+        :param column: the column of the center cell
+        :type column: int
+        :param row: the row of the center cell
+        :type row: int
+        :param radius: the number of cells from the center cell
+        :type radius: int
+        :rtype: generator(int)
+        :return: the indexes of the cells in the ring within the grid
+        """
+        first_row = max(row - radius, 0)
+        last_row = min(row + radius, self.cells_per_side - 1)
+        for ring_column in xrange(max(column - radius, 0),
+                                  min(column + radius,
+                                      self.cells_per_side - 1) + 1):
+            if radius == 0 or abs(ring_column - column) == radius:
+                ring_rows = xrange(first_row, last_row + 1)
+            else:
+                ring_rows = [ring_row for ring_row in
+                             (row - radius, row + radius)
+                             if 0 <= ring_row < self.cells_per_side]
+            for ring_row in ring_rows:
+                yield ring_column * self.cells_per_side + ring_row
+
+
+class SegmentGrid(Grid):
+    """
+    Buckets line segments into a uniform grid of cells covering a set
+    of points, so that checking whether a new segment crosses any of
+    the stored segments only needs to look at the cells it passes
+    through.
+    """
+    def __init__(self, points, cells_per_side=None):
+        """
+        :param points: the points the stored segments will connect,
+            used to size the grid
+        :type points: list[tuple(float, float)]
+        :param cells_per_side: the number of cells along each axis of the
+            grid, defaults to the square root of the number of points
+        :type cells_per_side: int
+        """
+        Grid.__init__(self, points, cells_per_side)
+        self.segments = SegmentStore()
+        self.lines = []
+
+    def add(self, segment):
+        """
+        Store a segment in every cell its bounding box covers.
+
+        :param segment: the segment to store
+        :type segment: Line
+        :return: Nothing
+        """
+        (left_x, left_y), (right_x, right_y) = (
+            segment.left_point, segment.right_point
+        )
+        index = self.segments.add(segment)
+        self.lines.append(segment)
+
+        first_row = self.row(min(left_y, right_y))
+        last_row = self.row(max(left_y, right_y))
+        for column in xrange(self.column(left_x),
+                             self.column(right_x) + 1):
+            for row in xrange(first_row, last_row + 1):
+                self.cells[column * self.cells_per_side + row].append(index)
+
+    def crosses(self, segment, from_right=False):
+        """
+        Determines whether a segment crosses any of the stored segments.
+
+        The cells along the segment are visited starting from one of its
+        endpoints, and the stored segments found in them are checked in
+        batches covering twice as many cells each time, so that a crossing
+        near the starting endpoint is found without visiting every cell.
+
+        :param segment: the segment to check
+        :type segment: Line
+        :param from_right: whether to start from the right endpoint of the
+            segment rather than the left
+        :type from_right: bool
+        :rtype: boolean
+        :return: whether the segment crosses a stored segment
+        """
+        nearby = []
+        batch_size = 1
+        for cells_visited, cell in enumerate(
+                self.cells_along(segment, from_right), 1):
+            nearby.extend(self.cells[cell])
+            if cells_visited == batch_size:
+                if self.any_intersect(segment, nearby):
+                    return True
+                nearby = []
+                batch_size *= 2
+        return self.any_intersect(segment, nearby)
+
+    def any_intersect(self, segment, indexes):
+        """
+        Determines whether a segment intersects any of the given stored
+        segments, checking all of them in one batch unless there are too
+        few for a batch to be worth gathering.
+
+        :param segment: the segment to check
+        :type segment: Line
+        :param indexes: the indexes of the stored segments to check
+        :type indexes: list[int]
+        :rtype: boolean
+        :return: whether the segment intersects one of the stored segments
+        """
+        if len(indexes) < min_batch_size:
+            return any(self.lines[index].intersects(segment)
+                       for index in indexes)
+        return intersects_many(
+            segment, self.segments.endpoints(indexes)
+        ).any()
+
+
+class LineGrid(Grid):
+    """
+    Buckets the lines of a LineStore into a uniform grid of cells, so
+    that finding the lines a new edge crosses only checks the lines
+    passing through the cells the edge does.
+
+    Each cell holds an array of the indexes of its lines, which drops the
+    lines freed from the store whenever the cell is visited.
+    """
+    def __init__(self, lines, cells_per_side=None):
+        """
+        :param lines: the lines to bucket
+        :type lines: LineStore
+        :param cells_per_side: the number of cells along each axis of the
+            grid, defaults to the square root of the number of points
+            divided by line_cells_divisor
+        :type cells_per_side: int
+        """
+        if cells_per_side is None:
+            cells_per_side = int(
+                len(lines.points) ** 0.5 / line_cells_divisor
+            )
+        Grid.__init__(self, lines.points, cells_per_side)
+        self.lines = lines
+
+        # the same cells as cells_along, found a column at a time for
+        # every line spanning the column
+        left_x, left_y, right_x, right_y = lines.coordinates[:, :lines.size]
+        margin_x = self.cell_width * 1e-9
+        margin_y = self.cell_height * 1e-9
+        first_columns = self.columns(left_x)
+        last_columns = self.columns(right_x)
+        vertical = left_x == right_x
+        slopes = (right_y - left_y) / numpy.where(
+            vertical, 1.0, right_x - left_x
+        )
+
+        for column in xrange(self.cells_per_side):
+            spanning = numpy.flatnonzero(
+                (first_columns <= column) & (column <= last_columns)
+            ).astype(numpy.int32)
+            spanning_left_x = left_x[spanning]
+            spanning_left_y = left_y[spanning]
+            low_x = numpy.maximum(
+                spanning_left_x,
+                self.min_x + column * self.cell_width - margin_x
+            )
+            high_x = numpy.minimum(
+                right_x[spanning],
+                self.min_x + (column + 1) * self.cell_width + margin_x
+            )
+            low_y = spanning_left_y + (
+                low_x - spanning_left_x
+            ) * slopes[spanning]
+            high_y = numpy.where(
+                vertical[spanning], right_y[spanning],
+                spanning_left_y + (high_x - spanning_left_x) * slopes[spanning]
+            )
+
+            first_rows = self.rows(numpy.minimum(low_y, high_y) - margin_y)
+            last_rows = self.rows(numpy.maximum(low_y, high_y) + margin_y)
+            for row in xrange(self.cells_per_side):
+                self.cells[column * self.cells_per_side + row] = spanning[
+                    (first_rows <= row) & (row <= last_rows)
+                ]
+
+    def columns(self, xs):
+        """
+        Computes the grid columns containing an array of x coordinates,
+        clamping coordinates outside of the grid to its border.
+
+        :param xs: the x coordinates
+        :type xs: numpy.ndarray
+        :rtype: numpy.ndarray(int)
+        :return: the column indexes
+        """
+        return numpy.clip(
+            numpy.floor((xs - self.min_x) / self.cell_width),
+            0, self.cells_per_side - 1
+        ).astype(int)
+
+    def rows(self, ys):
+        """
+        Computes the grid rows containing an array of y coordinates,
+        clamping coordinates outside of the grid to its border.
+
+        :param ys: the y coordinates
+        :type ys: numpy.ndarray
+        :rtype: numpy.ndarray(int)
+        :return: the row indexes
+        """
+        return numpy.clip(
+            numpy.floor((ys - self.min_y) / self.cell_height),
+            0, self.cells_per_side - 1
+        ).astype(int)
+
+    def intersecting(self, segment):
+        """
+        Finds every line left in the store that a segment intersects,
+        checking the lines in the cells along the segment in one batch.
+
+        :param segment: the segment to check
+        :type segment: Line
+        :rtype: numpy.ndarray(int)
+        :return: the indexes of the lines the segment intersects, in
+            increasing order
+        """
+        live = self.lines.live
+        nearby = []
+        for cell in self.cells_along(segment):
+            cell_lines = self.cells[cell]
+            cell_lines = cell_lines[live[cell_lines]]
+            self.cells[cell] = cell_lines
+            nearby.append(cell_lines)
+
+        if len(nearby) == 1:
+            candidates = nearby[0]
+        else:
+            candidates = numpy.unique(numpy.concatenate(nearby))
+        return candidates[
+            intersects_many(segment, self.lines.endpoints(candidates))
+        ]
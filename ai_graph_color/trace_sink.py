@@ -0,0 +1,229 @@
+"""
+A compact trace of an algorithm's run, written as gzipped JSON lines by a
+background thread so that tracing doesn't hold the algorithm up on I/O,
+and read back as events for analysis.
+
+Each event is a JSON object with the kind of event, which is the 'event'
+passed to the logger in extra, or 'message' if there was none, along
+with the time, the message format and its arguments. A trace is split
+into chunks, each its own gzip file, once a chunk holds enough data.
+"""
+import gzip
+import json
+import logging
+import os
+import Queue
+import sys
+import threading
+
+trace_extension = '.jsonl.gz'
+
+# how many bytes of JSON to write to a chunk before starting the next one
+default_chunk_bytes = 64 * 1024 * 1024
+
+# how many events to hand the writer at once, so that the cost of
+# passing them between threads is shared between them
+batch_events = 1000
+
+# how many batches can wait for the writer before logging blocks
+max_queued_batches = 100
+
+# how hard gzip works to compress each chunk, from 1 to 9
+compress_level = 1
+
+
+def is_trace_path(path):
+    """
+    :param path: the path of a trace
+    :type path: str
+    :rtype: bool
+    :return: whether the path is of a compressed trace, rather than text
+    """
+    return path.endswith(trace_extension)
+
+
+def chunk_path(path, index):
+    """
+    :param path: the path of a trace
+    :type path: str
+    :param index: the index of a chunk of the trace
+    :type index: int
+    :rtype: str
+    :return: the path of the chunk
+    """
+    return '{}.{:04d}{}'.format(
+        path[:-len(trace_extension)], index, trace_extension
+    )
+
+
+def encode_value(value):
+    """
+    Encodes an argument of a message that JSON can't, for json.dumps.
+
+    :param value: the argument
+    :type value: object
+    :rtype: object
+    :return: the elements of a set, sorted, otherwise its repr
+    """
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    return repr(value)
+
+
+# made once, since json.dumps makes a new encoder for every call given
+# its own separators
+encoder = json.JSONEncoder(separators=(',', ':'), default=encode_value)
+
+
+class TraceHandler(logging.Handler):
+    """
+    Encodes each record as a JSON line when it is logged, which also
+    captures the arguments as they are at that moment, and queues the
+    lines in batches for a TraceWriter to compress and write.
+    """
+    def __init__(self, writer):
+        """
+        :param writer: the writer to queue the lines for
+        :type writer: TraceWriter
+        """
+        logging.Handler.__init__(self)
+        self.writer = writer
+        self.lines = []
+
+    def emit(self, record):
+        try:
+            args = record.args
+            if not isinstance(args, (tuple, dict)):
+                args = (args,)
+            self.lines.append(encoder.encode({
+                'event': getattr(record, 'event', 'message'),
+                'time': record.created,
+                'message': str(record.msg),
+                'args': args
+            }))
+            if len(self.lines) >= batch_events:
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        if len(self.lines) > 0:
+            self.writer.queue.put(self.lines)
+            self.lines = []
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+        logging.Handler.close(self)
+
+
+class TraceWriter(threading.Thread):
+    """
+    A thread that takes the batches of lines queued for a trace and
+    writes them to its chunks, starting the next chunk once the current
+    one has been given enough bytes.
+    """
+    def __init__(self, path, chunk_bytes=default_chunk_bytes):
+        """
+        :param path: the path of the trace
+        :type path: str
+        :param chunk_bytes: how many bytes of JSON to write to each chunk
+        :type chunk_bytes: int
+        """
+        threading.Thread.__init__(self)
+        self.daemon = True
+        self.path = path
+        self.chunk_bytes = chunk_bytes
+        self.queue = Queue.Queue(max_queued_batches)
+        self.closed = False
+
+        # clear out the chunks of any trace written to the path before
+        index = 0
+        while os.path.exists(chunk_path(path, index)):
+            os.remove(chunk_path(path, index))
+            index += 1
+
+        self.chunk_index = 0
+        self.chunk_size = 0
+        self.chunk_file = gzip.open(chunk_path(path, 0), 'wb',
+                                    compress_level)
+        self.start()
+
+    def run(self):
+        lines = self.queue.get()
+        while lines is not None:
+            self.write(lines)
+            lines = self.queue.get()
+        self.chunk_file.close()
+
+    def write(self, lines):
+        """
+        Writes lines to the current chunk, starting the next chunk first
+        if the current one is full.
+
+        :param lines: the JSON encoded events
+        :type lines: list[str]
+        :return: Nothing, but the lines are written
+        """
+        if self.chunk_size >= self.chunk_bytes:
+            self.chunk_file.close()
+            self.chunk_index += 1
+            self.chunk_size = 0
+            self.chunk_file = gzip.open(
+                chunk_path(self.path, self.chunk_index), 'wb', compress_level
+            )
+        data = '\n'.join(lines) + '\n'
+        self.chunk_file.write(data)
+        self.chunk_size += len(data)
+
+    def close(self):
+        """
+        Writes every line still queued, then closes the trace.
+
+        :return: Nothing, but the thread has finished
+        """
+        if not self.closed:
+            self.closed = True
+            self.queue.put(None)
+            self.join()
+
+
+def read_trace(path):
+    """
+    Reads the events of a trace back, from every chunk in order.
+
+    :param path: the path of the trace
+    :type path: str
+    :rtype: generator(dict)
+    :return: each event, with its event, time, message and args
+    """
+    index = 0
+    while os.path.exists(chunk_path(path, index)):
+        with gzip.open(chunk_path(path, index), 'rb') as chunk_file:
+            for line in chunk_file:
+                yield json.loads(line)
+        index += 1
+
+
+def format_event(event):
+    """
+    :param event: an event read from a trace
+    :type event: dict
+    :rtype: str
+    :return: the message of the event, as it would have been logged
+    """
+    args = event['args']
+    if len(args) == 0:
+        return event['message']
+    if isinstance(args, dict):
+        return event['message'] % args
+    return event['message'] % tuple(args)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print 'Usage: {Trace Path} [{Event}]'
+    else:
+        for event in read_trace(sys.argv[1]):
+            if len(sys.argv) < 3 or event['event'] == sys.argv[2]:
+                print '{} {}'.format(event['event'], format_event(event))
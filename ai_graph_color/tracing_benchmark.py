@@ -0,0 +1,141 @@
+"""
+Measures how many iterations per second each algorithm runs at with an
+Evaluation setup, which logs nothing, and with TestRun setups, which
+trace every step to a text log or a compressed trace, to show what
+tracing costs and that it costs nothing when it is off.
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import problem_generator
+import setup
+import trace_sink
+from algorithm import LimitedAlgorithm
+from algorithms import backtracking
+from algorithms import backtracking_forward_checking
+from algorithms import backtracking_mac
+from algorithms import genetic_algorithm
+from algorithms import min_conflicts
+
+default_algorithms = [
+    backtracking,
+    backtracking_mac,
+    backtracking_forward_checking,
+    genetic_algorithm,
+    min_conflicts
+]
+
+
+def measure_throughput(algorithm, problem, run_setup, params, iterations):
+    """
+    Runs an algorithm until it reaches an iteration limit or finishes.
+
+    :param algorithm: the algorithm module to run
+    :type algorithm: module
+    :param problem: the graph to color
+    :type problem: Graph
+    :param run_setup: the setup to run it with
+    :type run_setup: one of {Evaluation, TestRun}
+    :param params: the params to pass to the algorithm
+    :type params: dict
+    :param iterations: the iteration limit
+    :type iterations: int
+    :rtype: dict
+    :return: the iterations run, the seconds taken and the iterations
+        per second
+    """
+    runner = LimitedAlgorithm(algorithm, problem, run_setup, params)
+    runner.set_limit(iterations)
+
+    start = time.time()
+    runner.next_output()
+    seconds = time.time() - start
+
+    return {
+        'iterations': run_setup.counter.counter,
+        'seconds': seconds,
+        'per_second': run_setup.counter.counter / max(seconds, 1e-9)
+    }
+
+
+def compare_setups(algorithms, problem, params, iterations, trace_dir):
+    """
+    Measures the throughput of each algorithm with an Evaluation, and
+    with TestRuns writing a text log and a compressed trace to a
+    directory.
+
+    :param algorithms: the algorithm modules to measure
+    :type algorithms: list[module]
+    :param problem: the graph to color
+    :type problem: Graph
+    :param params: the params to pass to every algorithm
+    :type params: dict
+    :param iterations: the iteration limit of each run
+    :type iterations: int
+    :param trace_dir: the directory to write the traces to
+    :type trace_dir: str
+    :rtype: dict
+    :return: the measurements with each setup by algorithm name, and how
+        many times slower each TestRun was
+    """
+    results = {}
+    for algorithm in algorithms:
+        name = algorithm.__name__.split('.')[-1]
+        evaluation = measure_throughput(
+            algorithm, problem, setup.Evaluation(), params, iterations
+        )
+
+        results[name] = {'evaluation': evaluation}
+        for setup_name, extension in [
+                ('test_run', '.txt'),
+                ('trace_sink', trace_sink.trace_extension)]:
+            test_run_setup = setup.TestRun(
+                os.path.join(trace_dir, name + extension)
+            )
+            try:
+                test_run = measure_throughput(
+                    algorithm, problem, test_run_setup, params, iterations
+                )
+            finally:
+                test_run_setup.close()
+            test_run['slowdown'] = (evaluation['per_second'] /
+                                    max(test_run['per_second'], 1e-9))
+            results[name][setup_name] = test_run
+    return results
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    if len(args) < 2:
+        print('Usage: {Number of Vertices} {Iterations} [{Colors}] '
+              '[{Output JSON}]')
+    else:
+        problem = problem_generator.generate_graph(
+            int(args[0]), 'triangulation'
+        )
+        trace_dir = tempfile.mkdtemp()
+        try:
+            results = compare_setups(
+                default_algorithms, problem,
+                {'colors': int(args[2]) if len(args) > 2 else 4},
+                int(args[1]), trace_dir
+            )
+        finally:
+            shutil.rmtree(trace_dir)
+
+        print '{:<32} {:>14} {:>14} {:>14}'.format(
+            'algorithm', 'evaluation', 'text log', 'trace sink'
+        )
+        for name, result in sorted(results.items()):
+            print '{:<32} {:>12.0f}/s {:>12.0f}/s {:>12.0f}/s'.format(
+                name, result['evaluation']['per_second'],
+                result['test_run']['per_second'],
+                result['trace_sink']['per_second']
+            )
+        if len(args) > 3:
+            with open(args[3], 'w') as output_file:
+                json.dump(results, output_file, indent=4, sort_keys=True)
@@ -0,0 +1,589 @@
+"""
+Delaunay triangulation of a set of points, used to generate large
+planar graphs quickly.
+"""
+from fractions import Fraction
+
+import numpy
+
+# the directions of the vertices of the triangle enclosing the points,
+# which are treated as infinitely far away in them so that none of them
+# can be inside the circumcircle of any points
+super_directions = [(-1.0, -1.0), (1.0, -1.0), (0.0, 1.0)]
+
+
+class Triangulation:
+    """
+    An incremental Delaunay triangulation, built by inserting points one
+    at a time into a triangle enclosing all of them and flipping edges
+    until every triangle's circumcircle is empty again.
+
+    Triangles are kept counter-clockwise in flat lists, with the vertices
+    of triangle t at vertices[3 * t:3 * t + 3] and the triangle across
+    the edge opposite each of those vertices at the same positions in
+    neighbors, or -1 where there is none.
+    """
+    def __init__(self, points):
+        """
+        :param points: the points to triangulate
+        :type points: list[tuple(float, float)]
+        """
+        self.num_points = len(points)
+        self.xs = [float(x) for x, _ in points]
+        self.ys = [float(y) for _, y in points]
+
+        if len(points) > 0:
+            min_x, max_x = min(self.xs), max(self.xs)
+            min_y, max_y = min(self.ys), max(self.ys)
+        else:
+            min_x = max_x = min_y = max_y = 0.0
+        center_x, center_y = (min_x + max_x) / 2, (min_y + max_y) / 2
+
+        # the vertices of the enclosing triangle come after the points,
+        # starting from the center of the points
+        self.xs.extend([center_x] * 3)
+        self.ys.extend([center_y] * 3)
+        self.vertices = [self.num_points, self.num_points + 1,
+                         self.num_points + 2]
+        self.neighbors = [-1, -1, -1]
+
+        self.last_triangle = 0
+        for index in insertion_order(points):
+            self.insert(index)
+
+    def insert(self, index):
+        """
+        Insert a point into the triangulation, splitting the triangle or
+        edge it lies on, then restore the Delaunay property around it.
+        Points that coincide with a point already inserted are skipped.
+
+        :param index: the index of the point
+        :type index: int
+        :return: Nothing, but the triangles are updated
+        """
+        triangle = self.locate(index)
+        sides = [
+            self.orientation(self.vertices[3 * triangle + (k + 1) % 3],
+                             self.vertices[3 * triangle + (k + 2) % 3],
+                             index)
+            for k in xrange(3)
+        ]
+
+        if sides.count(0) > 1:
+            return
+        if 0 in sides:
+            self.split_edge(triangle, sides.index(0), index)
+        else:
+            self.split_triangle(triangle, index)
+
+    def locate(self, index):
+        """
+        Finds the triangle containing a point, walking across the edges
+        the point is beyond, starting from the last triangle made.
+
+        :param index: the index of the point
+        :type index: int
+        :rtype: int
+        :return: the index of a triangle containing the point, possibly
+            on its border
+        """
+        vertices, neighbors = self.vertices, self.neighbors
+        triangle = self.last_triangle
+        start = 0
+        while True:
+            # rotate which edge is tried first, so the walk can't cycle
+            start = (start + 1) % 3
+            for offset in xrange(3):
+                k = (start + offset) % 3
+                if self.orientation(vertices[3 * triangle + (k + 1) % 3],
+                                    vertices[3 * triangle + (k + 2) % 3],
+                                    index) < 0:
+                    triangle = neighbors[3 * triangle + k]
+                    break
+            else:
+                return triangle
+
+    def split_triangle(self, triangle, index):
+        """
+        Split a triangle into three around a point inside of it.
+
+        :param triangle: the index of the triangle
+        :type triangle: int
+        :param index: the index of the point
+        :type index: int
+        :return: Nothing, but the triangles are updated
+        """
+        a, b, c = self.vertices[3 * triangle:3 * triangle + 3]
+        across_a, across_b, across_c = (
+            self.neighbors[3 * triangle:3 * triangle + 3]
+        )
+        second = len(self.vertices) / 3
+        third = second + 1
+        self.vertices.extend([0] * 6)
+        self.neighbors.extend([0] * 6)
+
+        self.set_triangle(triangle, (a, b, index), (second, third, across_c))
+        self.set_triangle(second, (b, c, index), (third, triangle, across_a))
+        self.set_triangle(third, (c, a, index), (triangle, second, across_b))
+        self.replace_neighbor(across_a, triangle, second)
+        self.replace_neighbor(across_b, triangle, third)
+
+        self.legalize([(triangle, 2), (second, 2), (third, 2)])
+
+    def split_edge(self, triangle, opposite, index):
+        """
+        Split the two triangles on either side of an edge into four
+        around a point on that edge.
+
+        :param triangle: the index of one of the triangles
+        :type triangle: int
+        :param opposite: the position in the triangle of the vertex
+            opposite the edge
+        :type opposite: int
+        :param index: the index of the point
+        :type index: int
+        :return: Nothing, but the triangles are updated
+        """
+        vertices, neighbors = self.vertices, self.neighbors
+        c = vertices[3 * triangle + opposite]
+        a = vertices[3 * triangle + (opposite + 1) % 3]
+        b = vertices[3 * triangle + (opposite + 2) % 3]
+        across_a = neighbors[3 * triangle + (opposite + 1) % 3]
+        across_b = neighbors[3 * triangle + (opposite + 2) % 3]
+
+        other = neighbors[3 * triangle + opposite]
+        other_opposite = neighbors[3 * other:3 * other + 3].index(triangle)
+        d = vertices[3 * other + other_opposite]
+        other_across_b = neighbors[3 * other + (other_opposite + 1) % 3]
+        other_across_a = neighbors[3 * other + (other_opposite + 2) % 3]
+
+        second = len(vertices) / 3
+        other_second = second + 1
+        vertices.extend([0] * 6)
+        neighbors.extend([0] * 6)
+
+        self.set_triangle(triangle, (c, a, index),
+                          (other_second, second, across_b))
+        self.set_triangle(second, (b, c, index),
+                          (triangle, other, across_a))
+        self.set_triangle(other, (d, b, index),
+                          (second, other_second, other_across_a))
+        self.set_triangle(other_second, (a, d, index),
+                          (other, triangle, other_across_b))
+        self.replace_neighbor(across_a, triangle, second)
+        self.replace_neighbor(other_across_b, other, other_second)
+
+        self.legalize([(triangle, 2), (second, 2), (other, 2),
+                       (other_second, 2)])
+
+    def legalize(self, stack):
+        """
+        Flip the edges opposite newly inserted points whose triangles
+        are no longer Delaunay, along with the edges each flip exposes.
+
+        :param stack: the triangles to check, and the position in each of
+            the inserted point
+        :type stack: list[tuple(int, int)]
+        :return: Nothing, but the triangles are updated
+        """
+        vertices, neighbors = self.vertices, self.neighbors
+        while len(stack) > 0:
+            triangle, position = stack.pop()
+            other = neighbors[3 * triangle + position]
+            if other < 0:
+                continue
+
+            p = vertices[3 * triangle + position]
+            q = vertices[3 * triangle + (position + 1) % 3]
+            r = vertices[3 * triangle + (position + 2) % 3]
+            other_position = neighbors[3 * other:3 * other + 3].index(
+                triangle
+            )
+            d = vertices[3 * other + other_position]
+
+            # only flip across edges of a convex quadrilateral, so that
+            # rounding errors can't make edges cross
+            if (not self.in_circle(p, q, r, d) or
+                    self.orientation(p, q, d) <= 0 or
+                    self.orientation(p, d, r) <= 0):
+                continue
+
+            across_q = neighbors[3 * triangle + (position + 1) % 3]
+            across_r = neighbors[3 * triangle + (position + 2) % 3]
+            other_across_r = neighbors[3 * other + (other_position + 1) % 3]
+            other_across_q = neighbors[3 * other + (other_position + 2) % 3]
+
+            self.set_triangle(triangle, (p, q, d),
+                              (other_across_r, other, across_r))
+            self.set_triangle(other, (p, d, r),
+                              (other_across_q, across_q, triangle))
+            self.replace_neighbor(other_across_r, other, triangle)
+            self.replace_neighbor(across_q, triangle, other)
+
+            stack.append((triangle, 0))
+            stack.append((other, 0))
+
+    def set_triangle(self, triangle, corners, across):
+        """
+        Set the vertices of a triangle and the triangles across from each.
+
+        :param triangle: the index of the triangle
+        :type triangle: int
+        :param corners: the indexes of its vertices, counter-clockwise
+        :type corners: tuple(int, int, int)
+        :param across: the triangles across the edge opposite each vertex
+        :type across: tuple(int, int, int)
+        :return: Nothing, but the triangle is updated
+        """
+        self.vertices[3 * triangle:3 * triangle + 3] = corners
+        self.neighbors[3 * triangle:3 * triangle + 3] = across
+        self.last_triangle = triangle
+
+    def replace_neighbor(self, triangle, old, new):
+        """
+        Point a triangle at a new triangle in place of an old one.
+
+        :param triangle: the index of the triangle, or -1 for none
+        :type triangle: int
+        :param old: the index of the neighbor being replaced
+        :type old: int
+        :param new: the index of the neighbor replacing it
+        :type new: int
+        :return: Nothing, but the triangle is updated
+        """
+        if triangle >= 0:
+            position = self.neighbors[3 * triangle:3 * triangle + 3].index(
+                old
+            )
+            self.neighbors[3 * triangle + position] = new
+
+    def orientation(self, a, b, c):
+        """
+        Computes twice the signed area of a triangle of points, which is
+        positive when they are counter-clockwise. When a vertex of the
+        enclosing triangle is involved, the result only has the sign of
+        the area.
+
+        :param a: the index of the first point
+        :type a: int
+        :param b: the index of the second point
+        :type b: int
+        :param c: the index of the third point
+        :type c: int
+        :rtype: float
+        :return: the signed area, times two
+        """
+        num_points = self.num_points
+        if a >= num_points or b >= num_points or c >= num_points:
+            return self.symbolic_orientation(a, b, c)
+        xs, ys = self.xs, self.ys
+        return ((xs[b] - xs[a]) * (ys[c] - ys[a]) -
+                (ys[b] - ys[a]) * (xs[c] - xs[a]))
+
+    def in_circle(self, a, b, c, d):
+        """
+        Determines whether a point lies strictly inside the circle through
+        the corners of a counter-clockwise triangle.
+
+        :param a: the index of the first corner
+        :type a: int
+        :param b: the index of the second corner
+        :type b: int
+        :param c: the index of the third corner
+        :type c: int
+        :param d: the index of the point
+        :type d: int
+        :rtype: bool
+        :return: whether the point is inside the circle
+        """
+        num_points = self.num_points
+        if (a >= num_points or b >= num_points or c >= num_points or
+                d >= num_points):
+            return self.symbolic_in_circle(a, b, c, d) > 0
+        xs, ys = self.xs, self.ys
+        adx, ady = xs[a] - xs[d], ys[a] - ys[d]
+        bdx, bdy = xs[b] - xs[d], ys[b] - ys[d]
+        cdx, cdy = xs[c] - xs[d], ys[c] - ys[d]
+        return ((adx * adx + ady * ady) * (bdx * cdy - bdy * cdx) +
+                (bdx * bdx + bdy * bdy) * (cdx * ady - cdy * adx) +
+                (cdx * cdx + cdy * cdy) * (adx * bdy - ady * bdx)) > 0
+
+    def expand(self, index):
+        """
+        Gets the coordinates of a point as polynomials in the distance to
+        the vertices of the enclosing triangle, with exact coefficients
+        so that terms which cancel out can't leave rounding errors behind
+        to be mistaken for the leading term.
+
+        :param index: the index of the point
+        :type index: int
+        :rtype: tuple(list[Fraction], list[Fraction])
+        :return: the coefficients of each coordinate, lowest power first
+        """
+        if index < self.num_points:
+            direction_x = direction_y = 0
+        else:
+            direction_x, direction_y = super_directions[
+                index - self.num_points
+            ]
+        return ([Fraction(self.xs[index]), Fraction(direction_x)],
+                [Fraction(self.ys[index]), Fraction(direction_y)])
+
+    def symbolic_orientation(self, a, b, c):
+        """
+        Computes the orientation of a triangle of points as the distance
+        to the vertices of the enclosing triangle goes to infinity.
+
+        :param a: the index of the first point
+        :type a: int
+        :param b: the index of the second point
+        :type b: int
+        :param c: the index of the third point
+        :type c: int
+        :rtype: float or Fraction
+        :return: a number with the sign of the signed area
+        """
+        num_points = self.num_points
+        a, b, c = far_last(a, b, c, num_points)
+        if a < num_points <= b:
+            # the area grows with the square of the distance between the
+            # two far vertices
+            direction_x, direction_y = super_directions[b - num_points]
+            other_x, other_y = super_directions[c - num_points]
+            return direction_x * other_y - direction_y * other_x
+        if b < num_points <= c:
+            # the area grows with the distance to the far vertex, unless
+            # the other two points are lined up with it
+            direction_x, direction_y = super_directions[c - num_points]
+            xs, ys = self.xs, self.ys
+            leading = ((xs[b] - xs[a]) * direction_y -
+                       (ys[b] - ys[a]) * direction_x)
+            if leading != 0:
+                return leading
+
+        (ax, ay), (bx, by), (cx, cy) = [
+            self.expand(index) for index in (a, b, c)
+        ]
+        return leading_coefficient(polynomial_difference(
+            polynomial_product(polynomial_difference(bx, ax),
+                               polynomial_difference(cy, ay)),
+            polynomial_product(polynomial_difference(by, ay),
+                               polynomial_difference(cx, ax))
+        ))
+
+    def symbolic_in_circle(self, a, b, c, d):
+        """
+        Computes the in circle determinant of a counter-clockwise triangle
+        and a point as the distance to the vertices of the enclosing
+        triangle goes to infinity.
+
+        :param a: the index of the first corner
+        :type a: int
+        :param b: the index of the second corner
+        :type b: int
+        :param c: the index of the third corner
+        :type c: int
+        :param d: the index of the point
+        :type d: int
+        :rtype: float or Fraction
+        :return: a number which is positive when the point is inside the
+            circle
+        """
+        num_points = self.num_points
+        a, b, c = far_last(a, b, c, num_points)
+        if c < num_points <= d:
+            # a far vertex is outside of the circle through any points
+            return -1.0
+        if b < num_points <= c < d or b < num_points <= d < c:
+            # the circle and the distance to the far point grow together
+            direction_x, direction_y = super_directions[d - num_points]
+            other_x = super_directions[c - num_points][0] - direction_x
+            other_y = super_directions[c - num_points][1] - direction_y
+            edge_x = self.xs[b] - self.xs[a]
+            edge_y = self.ys[b] - self.ys[a]
+            leading = (
+                (direction_x ** 2 + direction_y ** 2) *
+                (edge_x * other_y - edge_y * other_x) +
+                (other_x ** 2 + other_y ** 2) *
+                (edge_x * direction_y - edge_y * direction_x) -
+                2 * (edge_x * direction_x + edge_y * direction_y) *
+                (direction_x * other_y - direction_y * other_x)
+            )
+            if leading != 0:
+                return leading
+        elif b < num_points <= c:
+            # the circle becomes the half plane on the far vertex's side
+            # of the other two corners
+            leading = self.orientation(a, b, d)
+            if leading != 0:
+                return leading
+
+        dx, dy = self.expand(d)
+        rows = []
+        for corner in (a, b, c):
+            x, y = self.expand(corner)
+            x, y = polynomial_difference(x, dx), polynomial_difference(y, dy)
+            rows.append((x, y, polynomial_sum(polynomial_product(x, x),
+                                              polynomial_product(y, y))))
+        (adx, ady, ad), (bdx, bdy, bd), (cdx, cdy, cd) = rows
+
+        def cross(x1, y1, x2, y2):
+            return polynomial_difference(polynomial_product(x1, y2),
+                                         polynomial_product(y1, x2))
+
+        return leading_coefficient(polynomial_sum(
+            polynomial_product(ad, cross(bdx, bdy, cdx, cdy)),
+            polynomial_sum(
+                polynomial_product(bd, cross(cdx, cdy, adx, ady)),
+                polynomial_product(cd, cross(adx, ady, bdx, bdy))
+            )
+        ))
+
+    def edges(self):
+        """
+        Generates the edges of the triangulation between the points,
+        leaving out those to the vertices of the enclosing triangle.
+
+        :rtype: generator(tuple(int, int))
+        :return: the indexes of the two points of each edge
+        """
+        vertices, num_points = self.vertices, self.num_points
+        for position in xrange(len(vertices)):
+            from_index = vertices[position]
+            to_index = vertices[position - position % 3 + (position + 1) % 3]
+            if from_index < to_index < num_points:
+                yield from_index, to_index
+
+    def graph(self):
+        """
+        :rtype: list[list[int]]
+        :return: the triangulation of the points as an adjacency list
+        """
+        graph = [[] for _ in xrange(self.num_points)]
+        for from_index, to_index in self.edges():
+            graph[from_index].append(to_index)
+            graph[to_index].append(from_index)
+        return graph
+
+
+def far_last(a, b, c, num_points):
+    """
+    Rotates the corners of a triangle, which keeps its orientation, so
+    that any vertices of the enclosing triangle among them come last.
+
+    :param a: the index of the first corner
+    :type a: int
+    :param b: the index of the second corner
+    :type b: int
+    :param c: the index of the third corner
+    :type c: int
+    :param num_points: the number of points triangulated
+    :type num_points: int
+    :rtype: tuple(int, int, int)
+    :return: the rotated corners
+    """
+    while a >= num_points > c or b >= num_points > c or a >= num_points > b:
+        a, b, c = b, c, a
+    return a, b, c
+
+
+def polynomial_sum(p, q):
+    """
+    :param p: the coefficients of a polynomial, lowest power first
+    :type p: list[Fraction]
+    :param q: the coefficients of a polynomial, lowest power first
+    :type q: list[Fraction]
+    :rtype: list[Fraction]
+    :return: the coefficients of their sum
+    """
+    if len(p) < len(q):
+        p, q = q, p
+    return [coefficient + (q[power] if power < len(q) else 0)
+            for power, coefficient in enumerate(p)]
+
+
+def polynomial_difference(p, q):
+    """
+    :param p: the coefficients of a polynomial, lowest power first
+    :type p: list[Fraction]
+    :param q: the coefficients of a polynomial, lowest power first
+    :type q: list[Fraction]
+    :rtype: list[Fraction]
+    :return: the coefficients of p minus q
+    """
+    return polynomial_sum(p, [-coefficient for coefficient in q])
+
+
+def polynomial_product(p, q):
+    """
+    :param p: the coefficients of a polynomial, lowest power first
+    :type p: list[Fraction]
+    :param q: the coefficients of a polynomial, lowest power first
+    :type q: list[Fraction]
+    :rtype: list[Fraction]
+    :return: the coefficients of their product
+    """
+    product = [0] * (len(p) + len(q) - 1)
+    for p_power, p_coefficient in enumerate(p):
+        for q_power, q_coefficient in enumerate(q):
+            product[p_power + q_power] += p_coefficient * q_coefficient
+    return product
+
+
+def leading_coefficient(p):
+    """
+    :param p: the coefficients of a polynomial, lowest power first
+    :type p: list[Fraction]
+    :rtype: Fraction
+    :return: the coefficient of the highest power that isn't zero, which
+        gives the sign of the polynomial at large enough values, or zero
+    """
+    for coefficient in reversed(p):
+        if coefficient != 0:
+            return coefficient
+    return Fraction(0)
+
+
+def insertion_order(points):
+    """
+    Orders points so that each one is close to the one before it, by
+    snaking through the rows of a grid of cells, which keeps the walk
+    to each inserted point short.
+
+    :param points: the points to order
+    :type points: list[tuple(float, float)]
+    :rtype: list[int]
+    :return: the indexes of the points in order
+    """
+    if len(points) == 0:
+        return []
+
+    coordinates = numpy.array(points, float)
+    cells_per_side = max(1, int((len(points) / 4.0) ** 0.5))
+    low = coordinates.min(axis=0)
+    size = (coordinates.max(axis=0) - low)
+    size[size == 0] = 1.0
+    cells = numpy.minimum(
+        ((coordinates - low) / size * cells_per_side).astype(int),
+        cells_per_side - 1
+    )
+
+    columns, rows = cells[:, 0], cells[:, 1]
+    snaked_columns = numpy.where(
+        rows % 2 == 0, columns, cells_per_side - 1 - columns
+    )
+    return numpy.argsort(
+        rows * cells_per_side + snaked_columns, kind='mergesort'
+    ).tolist()
+
+
+def delaunay_graph(points):
+    """
+    Builds the graph of the Delaunay triangulation of a set of points.
+
+    :param points: the points to triangulate
+    :type points: list[tuple(float, float)]
+    :rtype: list[list[int]]
+    :return: the triangulation as an adjacency list
+    """
+    return Triangulation(points).graph()
@@ -0,0 +1,54 @@
+import unittest
+
+from ai_graph_color.algorithms.arc_consistency import ArcConsistency
+from ai_graph_color.algorithms.saturation import SaturationQueue
+from ai_graph_color.algorithms.trail import Trail
+from ai_graph_color.counter import Counter
+from ai_graph_color.graph import Graph
+
+
+def make_engine(graph, domains):
+    graph = Graph(graph)
+    counter = Counter()
+    trail = Trail(domains, SaturationQueue(graph, 3))
+    return ArcConsistency(graph, counter), trail, counter
+
+
+class TestArcConsistency(unittest.TestCase):
+    def test_singletons_propagate(self):
+        """
+        Tests that coloring a vertex removes its color from a path of
+        neighbors left with one color each, counting every propagation
+        """
+        engine, trail, counter = make_engine(
+            [[1], [0, 2], [1, 3], [2]], [7, 3, 6, 7]
+        )
+        self.assertTrue(engine.assign(trail, engine.graph, 0, 0))
+        self.assertEqual([1, 2, 4, 3], trail.domains)
+        self.assertEqual(3, counter.counter)
+        self.assertEqual(bytearray(4), engine.in_queue)
+
+    def test_wipeout(self):
+        """
+        Tests that propagation stops at the first empty domain and leaves
+        nothing queued, and that undoing restores every domain
+        """
+        engine, trail, counter = make_engine(
+            [[1, 2], [0, 2], [0, 1]], [3, 3, 3]
+        )
+        self.assertFalse(engine.refute(trail, engine.graph, 1, 1))
+        self.assertEqual(0, len(engine.queue))
+        self.assertEqual(bytearray(3), engine.in_queue)
+
+        trail.undo(0)
+        self.assertEqual([3, 3, 3], trail.domains)
+
+    def test_refute_without_singleton(self):
+        """
+        Tests that ruling out a color leaving several colors propagates
+        nothing
+        """
+        engine, trail, counter = make_engine([[1], [0]], [7, 7])
+        self.assertTrue(engine.refute(trail, engine.graph, 0, 2))
+        self.assertEqual([3, 7], trail.domains)
+        self.assertEqual(0, counter.counter)
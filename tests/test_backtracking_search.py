@@ -0,0 +1,164 @@
+import unittest
+
+from ai_graph_color import problem_generator, runner
+from ai_graph_color.setup import Evaluation
+from ai_graph_color.algorithm import LimitedAlgorithm
+from ai_graph_color.algorithms import (
+    backtracking, backtracking_forward_checking, backtracking_mac
+)
+
+algorithms = [backtracking, backtracking_forward_checking, backtracking_mac]
+
+# a wheel, which needs four colors since its rim has an odd length
+wheel = [[1, 2, 3, 4, 5], [0, 2, 5], [0, 1, 3], [0, 2, 4], [0, 3, 5],
+         [0, 1, 4]]
+
+
+def is_coloring(graph, coloring):
+    return (len(coloring) == len(graph) and
+            all(coloring[vertex] != coloring[neighbor]
+                for vertex, connections in enumerate(graph)
+                for neighbor in connections))
+
+
+class TestBacktrackingSearch(unittest.TestCase):
+    def test_finds_coloring(self):
+        """
+        Tests that each algorithm colors a graph that can be colored
+        """
+        for algorithm in algorithms:
+            coloring, _ = runner.evaluate(algorithm, wheel, {'colors': 4})
+            self.assertTrue(is_coloring(wheel, coloring))
+
+    def test_no_coloring(self):
+        """
+        Tests that each algorithm gives up on a graph that can't be
+        colored after undoing every decision
+        """
+        for algorithm in algorithms:
+            coloring, _ = runner.evaluate(algorithm, wheel, {'colors': 3})
+            self.assertEqual({}, coloring)
+
+    def test_backjumping(self):
+        """
+        Tests that backjumping finds the same answers as chronological
+        backtracking while making fewer decisions
+        """
+        params = {'colors': 4, 'backjumping': True}
+        coloring, _ = runner.evaluate(backtracking, wheel, params)
+        self.assertTrue(is_coloring(wheel, coloring))
+        params['colors'] = 3
+        self.assertEqual({}, runner.evaluate(backtracking, wheel, params)[0])
+
+        graph = problem_generator.generate_graph(120, 'lazy', 1)
+        coloring, jumping = runner.evaluate(
+            backtracking, graph, {'colors': 4, 'backjumping': True}
+        )
+        self.assertTrue(is_coloring(graph, coloring))
+        _, chronological = runner.evaluate(
+            backtracking, graph, {'colors': 4}
+        )
+        self.assertLess(jumping, chronological)
+
+    def test_backjumping_stats(self):
+        """
+        Tests that the decisions skipped by backjumping are reported
+        through the setup, including while the search is preempted
+        """
+        graph = problem_generator.generate_graph(120, 'lazy', 1)
+        limited = LimitedAlgorithm(
+            backtracking, graph, Evaluation(),
+            {'colors': 4, 'backjumping': True}
+        )
+        limited.set_limit(400)
+        limited.next_output()
+        preempted = limited.setup.stats['backjumping']['skipped']
+        self.assertGreater(preempted, 0)
+
+        limited.set_limit(None)
+        self.assertTrue(is_coloring(graph, limited.next_output()))
+        self.assertGreaterEqual(
+            limited.setup.stats['backjumping']['skipped'], preempted
+        )
+
+        limited = LimitedAlgorithm(
+            backtracking, graph, Evaluation(), {'colors': 4}
+        )
+        limited.next_output()
+        self.assertNotIn('backjumping', limited.setup.stats)
+
+    def test_nogoods(self):
+        """
+        Tests that learning nogoods while backjumping prunes the search
+        and reports its statistics through the setup, and that nogoods
+        can't be learned without backjumping
+        """
+        graph = problem_generator.generate_graph(200, 'triangulation', 1)
+        limited = LimitedAlgorithm(
+            backtracking, graph, Evaluation(),
+            {'colors': 4, 'backjumping': True, 'nogoods': 100}
+        )
+        self.assertTrue(is_coloring(graph, limited.next_output()))
+
+        stats = limited.setup.stats['nogoods']
+        self.assertGreater(stats['learned'], 0)
+        self.assertGreater(stats['hits'], 0)
+        self.assertEqual(
+            limited.setup.counter.counter, stats['hits'] + stats['misses']
+        )
+
+        limited = LimitedAlgorithm(
+            backtracking, graph, Evaluation(), {'colors': 4, 'nogoods': 100}
+        )
+        with self.assertRaises(Exception):
+            limited.next_output()
+
+    def test_restarts(self):
+        """
+        Tests that each algorithm still finds the same answers when
+        restarting after every failure or two
+        """
+        for algorithm in algorithms:
+            for restarts in ['luby', 'geometric']:
+                params = {'colors': 4, 'restarts': restarts,
+                          'restart_unit': 1}
+                coloring, _ = runner.evaluate(algorithm, wheel, params)
+                self.assertTrue(is_coloring(wheel, coloring))
+                params['colors'] = 3
+                self.assertEqual(
+                    {}, runner.evaluate(algorithm, wheel, params)[0]
+                )
+
+    def test_preempted(self):
+        """
+        Tests that each algorithm can be resumed after being preempted
+        """
+        for algorithm in algorithms:
+            limited = LimitedAlgorithm(
+                algorithm, wheel, Evaluation(), {'colors': 4}
+            )
+            limited.set_limit(2)
+            limited.next_output()
+            self.assertEqual(2, limited.setup.counter.counter)
+
+            limited.set_limit(None)
+            self.assertTrue(is_coloring(wheel, limited.next_output()))
+
+    def test_limit_kept(self):
+        """
+        Tests that each algorithm stops exactly at every limit it is given
+        while preempted, however much work its decisions propagate, and
+        finishes below its limit
+        """
+        graph = problem_generator.generate_graph(60, 'lazy', 1)
+        for algorithm in algorithms:
+            limited = LimitedAlgorithm(
+                algorithm, graph, Evaluation(), {'colors': 4}
+            )
+            for limit in xrange(1, 100000):
+                limited.set_limit(limit)
+                coloring = limited.next_output()
+                if limited.setup.counter.counter < limit:
+                    break
+                self.assertEqual(limit, limited.setup.counter.counter)
+            self.assertTrue(is_coloring(graph, coloring))
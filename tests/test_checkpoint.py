@@ -0,0 +1,172 @@
+from array import array
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from ai_graph_color import checkpoint, problem_generator
+from ai_graph_color.algorithm import LimitedAlgorithm
+from ai_graph_color.algorithms import (
+    backtracking, backtracking_mac, genetic_algorithm, min_conflicts
+)
+from ai_graph_color.graph import Graph
+from ai_graph_color.setup import Evaluation
+
+
+class TestCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.checkpoint_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.checkpoint_dir, 'run.checkpoint')
+        self.graph = Graph(
+            problem_generator.generate_graph(40, 'triangulation', 3)
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.checkpoint_dir)
+
+    def run_until_done(self, module, params, interval, seed):
+        """
+        Runs an algorithm a few iterations at a time, starting each time
+        from the last checkpoint as if the run before had died.
+        """
+        random.seed(seed)
+        while True:
+            setup = Evaluation()
+            limited = LimitedAlgorithm(
+                module, self.graph, setup, params, self.path, interval
+            )
+            limited.set_limit(setup.counter.counter + 3 * interval + 1)
+            output = limited.next_output()
+            if setup.counter.counter < limited.limit:
+                return output, setup.counter.counter
+
+    def test_compact(self):
+        """
+        Tests that lists of ints are stored in the smallest arrays that
+        hold them, and restored as lists
+        """
+        self.assertEqual('b', checkpoint.int_type([0, 3, -128]))
+        self.assertEqual('h', checkpoint.int_type([0, 128]))
+        self.assertEqual('l', checkpoint.int_type([2 ** 32]))
+        self.assertIsNone(checkpoint.int_type([2 ** 70]))
+
+        value = {'coloring': [0, 2, 1], 'nested': [[5, 1000], [True]],
+                 'empty': [], 'floats': [0.5]}
+        compacted = checkpoint.compact(value)
+        self.assertEqual(array('b', [0, 2, 1]), compacted['coloring'])
+        self.assertEqual(array('h', [5, 1000]), compacted['nested'][0])
+        self.assertEqual([True], compacted['nested'][1])
+        self.assertEqual(value, checkpoint.expand(compacted))
+
+    def test_save_checkpoint(self):
+        """
+        Tests that a checkpoint is read back as it was saved, replacing
+        the one before without leaving any temporary files
+        """
+        checkpoint.save_checkpoint(self.path, {'coloring': [1] * 1000})
+        checkpoint.save_checkpoint(self.path, {'coloring': [2, 3]})
+        self.assertEqual({'coloring': [2, 3]},
+                         checkpoint.load_checkpoint(self.path))
+        self.assertEqual(['run.checkpoint'], os.listdir(self.checkpoint_dir))
+
+    def test_resume_backtracking(self):
+        """
+        Tests that a search continued from checkpoints finds the same
+        coloring in the same number of iterations as one run straight
+        through, or fewer with MAC
+        """
+        for module, params in [
+                (backtracking, {'colors': 4, 'backjumping': True,
+                                'nogoods': 20, 'restarts': 'luby',
+                                'restart_unit': 2}),
+                (backtracking_mac, {'colors': 4})]:
+            random.seed(5)
+            setup = Evaluation()
+            expected = LimitedAlgorithm(
+                module, self.graph, setup, params
+            ).next_output()
+
+            output, iterations = self.run_until_done(module, params, 5, 5)
+            self.assertEqual(expected, output)
+            if module is backtracking_mac:
+                # propagation past each checkpoint's limit isn't charged
+                self.assertLessEqual(iterations, setup.counter.counter)
+            else:
+                self.assertEqual(setup.counter.counter, iterations)
+            os.remove(self.path)
+
+    def test_resume_min_conflicts(self):
+        """
+        Tests that min-conflicts continues from the coloring it had
+        """
+        random.seed(1)
+        limited = LimitedAlgorithm(
+            min_conflicts, self.graph, Evaluation(), {'colors': 3},
+            self.path, 100
+        )
+        limited.set_limit(350)
+        limited.next_output()
+        state = checkpoint.load_checkpoint(self.path)
+        self.assertEqual(300, state['counter'])
+
+        resumed = Evaluation()
+        limited = LimitedAlgorithm(
+            min_conflicts, self.graph, resumed, {'colors': 3}, self.path
+        )
+        limited.set_limit(301)
+        limited.next_output()
+        self.assertEqual(301, resumed.counter.counter)
+        self.assertEqual(state['state'], resumed.snapshot())
+
+    def test_resume_genetic_algorithm(self):
+        """
+        Tests that the genetic algorithm continues from the population it
+        had
+        """
+        params = {'colors': 5, 'population_size': 20, 'tournament_size': 4}
+        random.seed(1)
+        limited = LimitedAlgorithm(
+            genetic_algorithm, self.graph, Evaluation(), params, self.path,
+            100
+        )
+        limited.set_limit(350)
+        limited.next_output()
+        state = checkpoint.load_checkpoint(self.path)
+        self.assertEqual(20, len(state['state']['solutions']))
+
+        resumed = Evaluation()
+        limited = LimitedAlgorithm(
+            genetic_algorithm, self.graph, resumed, params, self.path
+        )
+        self.assertEqual(state['state'], limited.params['resume'])
+        limited.set_limit(state['counter'] + 1)
+        self.assertIsNotNone(limited.next_output())
+        self.assertGreater(resumed.counter.counter, state['counter'])
+
+    def test_wrong_checkpoint(self):
+        """
+        Tests that a checkpoint can't be resumed by another algorithm or
+        with another number of colors, and that a parallel search can't
+        be checkpointed
+        """
+        limited = LimitedAlgorithm(
+            backtracking, self.graph, Evaluation(), {'colors': 4}, self.path
+        )
+        limited.next_output()
+        limited.save_checkpoint()
+
+        with self.assertRaises(Exception):
+            LimitedAlgorithm(backtracking, self.graph, Evaluation(),
+                             {'colors': 3}, self.path)
+        with self.assertRaises(Exception):
+            LimitedAlgorithm(min_conflicts, self.graph, Evaluation(),
+                             {'colors': 4}, self.path)
+
+        os.remove(self.path)
+        limited = LimitedAlgorithm(
+            backtracking, self.graph, Evaluation(),
+            {'colors': 4, 'workers': 2}, self.path, 10
+        )
+        with self.assertRaises(Exception):
+            limited.next_output()
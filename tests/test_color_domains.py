@@ -0,0 +1,39 @@
+import unittest
+
+from ai_graph_color.algorithms import color_domains
+
+
+class TestColorDomains(unittest.TestCase):
+    def test_helpers(self):
+        """
+        Tests the domain helpers against the sets they stand for
+        """
+        domain = color_domains.full_domain(5)
+        self.assertEqual([0, 1, 2, 3, 4], list(color_domains.colors(domain)))
+
+        domain = color_domains.without(domain, 0)
+        domain = color_domains.without(domain, 3)
+        domain = color_domains.without(domain, 3)
+        self.assertEqual([1, 2, 4], list(color_domains.colors(domain)))
+        self.assertEqual(3, color_domains.popcount(domain))
+        self.assertEqual(1, color_domains.lowest_color(domain))
+        self.assertTrue(color_domains.contains(domain, 4))
+        self.assertFalse(color_domains.contains(domain, 3))
+
+        other = color_domains.color_bit(2) | color_domains.color_bit(3)
+        self.assertEqual(
+            [2], list(color_domains.colors(
+                color_domains.intersection(domain, other)
+            ))
+        )
+
+    def test_empty_domain(self):
+        """
+        Tests the helpers on a domain without colors
+        """
+        self.assertEqual(0, color_domains.full_domain(0))
+        self.assertEqual(0, color_domains.popcount(0))
+        self.assertEqual([], list(color_domains.colors(0)))
+        self.assertEqual(
+            0, color_domains.without(color_domains.color_bit(1), 1)
+        )
@@ -0,0 +1,26 @@
+import os
+import unittest
+
+from ai_graph_color import convert_problems, problem_generator
+
+
+class TestConvertProblems(unittest.TestCase):
+    def test_convert_problem(self):
+        """
+        Tests that a converted problem holds the same graph
+        """
+        graph = problem_generator.generate_graph(30, seed=1)
+        problem_generator.write_graph_to_file('test_convert.json', graph)
+        try:
+            self.assertEqual(
+                'test_convert.csr',
+                convert_problems.convert_problem('test_convert.json')
+            )
+            self.assertEqual(graph, problem_generator.read_graph_from_file(
+                'test_convert.csr'
+            ).to_lists())
+        finally:
+            for file_name in ['test_convert.json', 'test_convert.csr']:
+                file_path = problem_generator.generate_file_path(file_name)
+                if os.path.exists(file_path):
+                    os.remove(file_path)
@@ -0,0 +1,52 @@
+import os
+import tempfile
+import unittest
+
+from ai_graph_color import problem_generator
+from ai_graph_color.csr_graph import (
+    CSRGraph, read_csr_graph, write_csr_graph
+)
+
+
+class TestCSRGraph(unittest.TestCase):
+    def test_from_lists(self):
+        """
+        Tests that a graph in CSR form has the same neighbors as the
+        adjacency list it was made from
+        """
+        graph = [[1, 2], [0], [0], []]
+        csr_graph = CSRGraph.from_lists(graph)
+
+        self.assertEqual(4, len(csr_graph))
+        self.assertEqual([0, 2, 3, 4, 4], csr_graph.offsets.tolist())
+        self.assertEqual(graph, [list(adj_list) for adj_list in csr_graph])
+        self.assertEqual(graph, csr_graph.to_lists())
+        self.assertEqual([2, 1, 1, 0], map(csr_graph.degree, xrange(4)))
+
+    def test_write_and_read(self):
+        """
+        Tests that graphs read back from a file are the graphs written,
+        including graphs without vertices or edges
+        """
+        handle, file_path = tempfile.mkstemp()
+        os.close(handle)
+        try:
+            for graph in [[], [[]], [[1], [0]],
+                          problem_generator.generate_graph(50, seed=2)]:
+                with open(file_path, 'wb') as out_file:
+                    write_csr_graph(out_file, graph)
+                self.assertEqual(graph, read_csr_graph(file_path).to_lists())
+        finally:
+            os.remove(file_path)
+
+    def test_read_not_csr(self):
+        """
+        Tests that reading a file in another format fails
+        """
+        handle, file_path = tempfile.mkstemp()
+        with os.fdopen(handle, 'w') as out_file:
+            out_file.write('[[1], [0]]' + ' ' * 30)
+        try:
+            self.assertRaises(Exception, read_csr_graph, file_path)
+        finally:
+            os.remove(file_path)
@@ -0,0 +1,33 @@
+import os
+import unittest
+
+from ai_graph_color import generate_problems, problem_generator
+
+
+class TestGenerateProblems(unittest.TestCase):
+    def test_generate_problems_workers(self):
+        """
+        Tests that the problem files written are the same however many
+        workers generate them
+        """
+        contents = []
+        for workers in [1, 3]:
+            file_names = generate_problems.generate_problems(
+                [10, 30], [1, 2], workers, 'lazy'
+            )
+            self.assertEqual(
+                ['lazy_10_1.json', 'lazy_10_2.json',
+                 'lazy_30_1.json', 'lazy_30_2.json'],
+                file_names
+            )
+
+            file_contents = []
+            for file_name in file_names:
+                file_path = problem_generator.generate_file_path(file_name)
+                with open(file_path) as problem_file:
+                    file_contents.append(problem_file.read())
+                os.remove(file_path)
+            contents.append(file_contents)
+
+        self.assertEqual(contents[0], contents[1])
+        self.assertNotEqual(contents[0][0], contents[0][1])
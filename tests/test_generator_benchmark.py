@@ -0,0 +1,70 @@
+import unittest
+
+from ai_graph_color import generator_benchmark, problem_generator
+
+
+def make_run(num_vert, seconds, peak_kb):
+    return {
+        'num_vert': num_vert,
+        'num_edges': 0,
+        'stages': {'connect': {'seconds': seconds, 'peak_kb': peak_kb}}
+    }
+
+
+class TestGeneratorBenchmark(unittest.TestCase):
+    def test_measure_stages(self):
+        """
+        Tests that every stage of each mode is measured, and the stages
+        build the same graph as generate_graph
+        """
+        for mode, stages in [
+                ('all_pairs', ['scatter_points', 'create_lines',
+                               'index_lines', 'connect']),
+                ('lazy', ['scatter_points', 'index_points', 'connect'])]:
+            run = generator_benchmark.measure_stages(50, mode, 2)
+            graph = problem_generator.generate_graph(50, mode, 2)
+
+            self.assertEqual(50, run['num_vert'])
+            self.assertEqual(
+                sum(len(connections) for connections in graph) / 2,
+                run['num_edges']
+            )
+            self.assertEqual(sorted(stages), sorted(run['stages']))
+            for stage in run['stages'].values():
+                self.assertGreaterEqual(stage['seconds'], 0)
+                self.assertGreaterEqual(stage['peak_kb'], 0)
+
+    def test_scaling_exponents(self):
+        """
+        Tests that exponents are fit to the measurements big enough to
+        be reliable
+        """
+        runs = [make_run(num_vert, num_vert ** 2 / 100.0, 10)
+                for num_vert in [10, 20, 40, 80]]
+        exponents = generator_benchmark.scaling_exponents(runs)
+
+        self.assertAlmostEqual(2, exponents['connect']['seconds'])
+        self.assertIsNone(exponents['connect']['peak_kb'])
+        self.assertEqual({}, generator_benchmark.scaling_exponents([]))
+
+    def test_compare(self):
+        """
+        Tests that only measurements worse than the baseline by more than
+        the tolerance are regressions
+        """
+        baseline = {
+            'runs': [make_run(100, 1.0, 2000), make_run(200, 4.0, 4000)],
+            'exponents': {'connect': {'seconds': 2.0, 'peak_kb': 1.0}}
+        }
+        results = {
+            'runs': [make_run(100, 1.2, 3000), make_run(200, 6.0, 4000),
+                     make_run(400, 50.0, 9000)],
+            'exponents': {'connect': {'seconds': 2.5, 'peak_kb': None}}
+        }
+
+        regressions = generator_benchmark.compare(results, baseline)
+        self.assertEqual(3, len(regressions))
+        self.assertTrue(regressions[0].startswith('100 vertices, connect pe'))
+        self.assertTrue(regressions[1].startswith('200 vertices, connect sec'))
+        self.assertTrue(regressions[2].startswith('connect seconds exponent'))
+        self.assertEqual([], generator_benchmark.compare(baseline, baseline))
@@ -0,0 +1,61 @@
+import unittest
+
+from ai_graph_color.algorithms import (
+    backtracking, backtracking_forward_checking, backtracking_mac,
+    genetic_algorithm, min_conflicts
+)
+from ai_graph_color.csr_graph import CSRGraph
+from ai_graph_color.graph import Graph, as_graph
+from ai_graph_color.setup import Evaluation
+
+
+class TestGraph(unittest.TestCase):
+    def test_views(self):
+        """
+        Tests the precomputed views of a graph
+        """
+        adjacency = [[1, 2], [0, 2], [0, 1, 3], [2], []]
+        for source in [adjacency, CSRGraph.from_lists(adjacency)]:
+            graph = Graph(source)
+
+            self.assertEqual(5, len(graph))
+            self.assertEqual((0, 1, 3), graph[2])
+            self.assertEqual(adjacency, [list(adj) for adj in graph])
+            self.assertEqual(adjacency, graph.to_lists())
+            self.assertEqual(adjacency, graph)
+            self.assertNotEqual(adjacency[:4], graph)
+            self.assertEqual((2, 2, 3, 1, 0), graph.degrees)
+            self.assertEqual(3, graph.degree(2))
+            self.assertEqual(((0, 1), (0, 2), (1, 2), (2, 3)), graph.edges)
+            self.assertEqual([0, 2, 4, 7, 8, 8], graph.offsets.tolist())
+
+    def test_immutable(self):
+        """
+        Tests that the graph can't be changed through its arrays
+        """
+        graph = Graph([[1], [0]])
+        with self.assertRaises(ValueError):
+            graph.neighbors[0] = 1
+        with self.assertRaises(TypeError):
+            graph[0][0] = 1
+
+    def test_as_graph(self):
+        """
+        Tests that graphs are only made from adjacency lists once
+        """
+        graph = as_graph([[1], [0]])
+        self.assertIsInstance(graph, Graph)
+        self.assertIs(graph, as_graph(graph))
+
+    def test_algorithms_take_lists(self):
+        """
+        Tests that each algorithm makes a Graph of an adjacency list it is
+        run on directly
+        """
+        for module in [backtracking, backtracking_forward_checking,
+                       backtracking_mac, genetic_algorithm, min_conflicts]:
+            params = dict(module.params, colors=2)
+            if module is genetic_algorithm:
+                params.update(population_size=4, tournament_size=2)
+            output = module.run([[1], [0]], Evaluation(), params).next()
+            self.assertIsNotNone(output)
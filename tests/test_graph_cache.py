@@ -0,0 +1,62 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from ai_graph_color import graph_cache, problem_generator
+
+
+class TestGraphCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_generate_graph(self):
+        """
+        Tests that a cached graph is the graph that would be generated,
+        and is loaded instead of generated once it is cached
+        """
+        cache = graph_cache.GraphCache(self.directory)
+        graph = problem_generator.generate_graph(40, 'lazy', 3)
+
+        self.assertIsNone(cache.get(40, 'lazy', 3))
+        self.assertEqual(graph, cache.generate_graph(40, 'lazy', 3).to_lists())
+        self.assertEqual(graph, cache.get(40, 'lazy', 3).to_lists())
+        self.assertEqual(graph, cache.generate_graph(40, 'lazy', 3).to_lists())
+
+        self.assertIsNone(cache.get(40, 'lazy', 4))
+        self.assertIsNone(cache.get(40, 'all_pairs', 3))
+        self.assertIsNone(cache.get(41, 'lazy', 3))
+
+    def test_unseeded_not_cached(self):
+        """
+        Tests that a graph generated without a seed isn't cached
+        """
+        cache = graph_cache.GraphCache(self.directory)
+        self.assertEqual(20, len(cache.generate_graph(20, 'lazy', None)))
+        self.assertEqual([], os.listdir(self.directory))
+        with self.assertRaises(Exception):
+            cache.get(20, 'lazy', None)
+
+    def test_evict_least_recently_used(self):
+        """
+        Tests that the least recently used graphs are removed once the
+        cache grows past its size limit
+        """
+        cache = graph_cache.GraphCache(self.directory)
+        for seed in xrange(3):
+            cache.generate_graph(20, 'lazy', seed)
+        for seed, mtime in [(0, 100), (1, 300), (2, 200)]:
+            os.utime(cache.file_path(20, 'lazy', seed), (mtime, mtime))
+
+        cache.max_bytes = sum(
+            os.path.getsize(cache.file_path(20, 'lazy', seed))
+            for seed in [1, 2]
+        )
+        cache.evict()
+
+        self.assertIsNone(cache.get(20, 'lazy', 0))
+        self.assertIsNotNone(cache.get(20, 'lazy', 1))
+        self.assertIsNotNone(cache.get(20, 'lazy', 2))
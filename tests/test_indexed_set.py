@@ -0,0 +1,43 @@
+import random
+import unittest
+
+from ai_graph_color.indexed_set import IndexedSet
+
+
+class TestIndexedSet(unittest.TestCase):
+    def test_add_and_discard(self):
+        """
+        Tests that the set keeps the right items as they are added and
+        removed, and keeps its positions in sync
+        """
+        indexed_set = IndexedSet([3, 1, 4, 1, 5])
+        self.assertEqual(4, len(indexed_set))
+        self.assertEqual({1, 3, 4, 5}, set(indexed_set))
+
+        indexed_set.discard(3)
+        indexed_set.discard(9)
+        indexed_set.discard(5)
+        indexed_set.add(2)
+
+        self.assertEqual({1, 2, 4}, set(indexed_set))
+        self.assertIn(2, indexed_set)
+        self.assertNotIn(3, indexed_set)
+        for position, item in enumerate(indexed_set.items):
+            self.assertEqual(position, indexed_set.positions[item])
+
+        for item in [1, 2, 4]:
+            indexed_set.discard(item)
+        self.assertEqual(0, len(indexed_set))
+        self.assertEqual({}, indexed_set.positions)
+
+    def test_choice(self):
+        """
+        Tests that choices only return items in the set, and that
+        every item gets chosen
+        """
+        indexed_set = IndexedSet(xrange(10))
+        indexed_set.discard(4)
+
+        rng = random.Random(0)
+        chosen = set(indexed_set.choice(rng) for _ in xrange(1000))
+        self.assertEqual(set(xrange(10)) - {4}, chosen)
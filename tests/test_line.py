@@ -1,5 +1,11 @@
 import unittest
-from ai_graph_color.line import Line, point_distance
+from itertools import product
+
+import numpy
+
+from ai_graph_color.line import (
+    Line, LineStore, SegmentStore, intersects_many, point_distance
+)
 
 
 class TestLineObject(unittest.TestCase):
@@ -10,7 +16,6 @@ class TestLineObject(unittest.TestCase):
         left_point = (0, 0)
         right_point = (10, 0)
         distance = 10
-        deallocation_routines = []
 
         line = Line(
             right_point, left_point
@@ -19,7 +24,6 @@ class TestLineObject(unittest.TestCase):
         self.assertEqual(left_point, line.left_point)
         self.assertEqual(right_point, line.right_point)
         self.assertEqual(distance, line.distance)
-        self.assertEqual(deallocation_routines, line.deallocation_routines)
 
     def test_init_equal_x_unequal_y(self):
         """
@@ -28,7 +32,6 @@ class TestLineObject(unittest.TestCase):
         left_point = (0, 0)
         right_point = (0, 10)
         distance = 10
-        deallocation_routines = []
 
         line = Line(
             right_point, left_point
@@ -37,7 +40,6 @@ class TestLineObject(unittest.TestCase):
         self.assertEqual(left_point, line.left_point)
         self.assertEqual(right_point, line.right_point)
         self.assertEqual(distance, line.distance)
-        self.assertEqual(deallocation_routines, line.deallocation_routines)
 
     def test_init_equal_points(self):
         """
@@ -45,7 +47,6 @@ class TestLineObject(unittest.TestCase):
         """
         point = (0, 0)
         distance = 0
-        deallocation_routines = []
 
         line = Line(
             point, point
@@ -54,68 +55,148 @@ class TestLineObject(unittest.TestCase):
         self.assertEqual(point, line.left_point)
         self.assertEqual(point, line.right_point)
         self.assertEqual(distance, line.distance)
-        self.assertEqual(deallocation_routines, line.deallocation_routines)
 
-    def test_add_reference_with_params(self):
+
+class TestLine(unittest.TestCase):
+    def test_point_distance(self):
         """
-        Tests add reference_with_params and passes params
+        Tests that the distance is calculated correctly
         """
-        point = (0, 0)
-        deallocation_routines = [(max, (0, 0))]
+        points = [
+            ((0, 0), (0, 0)),
+            ((1, 0), (0, 0)),
+            ((0, 1), (0, 0))
+        ]
 
-        line = Line(
-            point, point
-        )
+        expected_distances = [0, 1, 1]
 
-        line.add_reference(max, 0, 0)
-        self.assertEqual(deallocation_routines, line.deallocation_routines)
+        for i, points_to_check in enumerate(points):
+            self.assertEqual(
+                expected_distances[i],
+                point_distance(*points_to_check)
+            )
 
-    def test_add_reference_without_params(self):
+    def test_intersects_many_matches_intersects(self):
         """
-        Tests add reference_with_params and doesn't pass params
+        Tests that the batched check agrees with the scalar one, including
+        for touching, collinear and overlapping segments
         """
-        point = (0, 0)
-        deallocation_routines = [(max, ())]
+        coordinates = [0, 1, 2]
+        points = list(product(coordinates, coordinates))
+        segments = [
+            Line(point_a, point_b)
+            for point_a, point_b in product(points, points)
+        ]
+        candidates = tuple(numpy.array([
+            segment.left_point + segment.right_point
+            for segment in segments
+        ], dtype=float).T)
 
-        line = Line(
-            point, point
-        )
+        for segment in segments:
+            self.assertEqual(
+                [segment.intersects(other) for other in segments],
+                list(intersects_many(segment, candidates))
+            )
 
-        line.add_reference(max)
-        self.assertEqual(deallocation_routines, line.deallocation_routines)
 
-    def test_free(self):
+class TestSegmentStore(unittest.TestCase):
+    def test_add_and_endpoints(self):
         """
-        Tests that free calls the proper function
+        Tests that added segments can be gathered, past the initial capacity
         """
-        point = (0, 0)
+        store = SegmentStore(1)
+        lines = [Line((i, 0), (0, i + 1)) for i in xrange(5)]
+        for index, line in enumerate(lines):
+            self.assertEqual(index, store.add(line))
+
+        self.assertEqual(5, len(store))
+        left_x, left_y, right_x, right_y = store.endpoints([3, 1])
+        self.assertEqual([0, 0], list(left_x))
+        self.assertEqual([4, 2], list(left_y))
+        self.assertEqual([3, 1], list(right_x))
+        self.assertEqual([0, 0], list(right_y))
+
+    def test_intersecting(self):
+        """
+        Tests that only stored segments which were not removed are found
+        """
+        store = SegmentStore()
+        crossing = [Line((i, 0), (i, 10)) for i in xrange(1, 9)]
+        touching = Line((0, 5), (5, 10))
+        for line in crossing + [touching]:
+            store.add(line)
 
-        line = Line(
-            point, point
-        )
+        selected = Line((0, 5), (10, 5))
+        self.assertEqual(range(8), list(store.intersecting(selected)))
 
-        test = [0]
-        self.assertEqual(1, len(test))
-        line.add_reference(test.pop, 0)
-        line.free()
-        self.assertEqual(0, len(test))
+        self.assertEqual(range(6), list(store.remove(range(6) + [0])))
+        self.assertEqual([], list(store.remove([0, 1])))
+        self.assertEqual(3, len(store))
+        self.assertEqual([6, 7], list(store.intersecting(selected)))
 
 
-class TestLine(unittest.TestCase):
-    def test_point_distance(self):
+class TestLineStore(unittest.TestCase):
+    points = [(0.0, 0.0), (0.0, 3.0), (1.0, 1.0), (1.0, 5.0)]
+
+    def test_lines(self):
         """
-        Tests that the distance is calculated correctly
+        Tests that every pair of points has a line, with the right
+        endpoints and distance
         """
-        points = [
-            ((0, 0), (0, 0)),
-            ((1, 0), (0, 0)),
-            ((0, 1), (0, 0))
-        ]
-
-        expected_distances = [0, 1, 1]
-
-        for i, points_to_check in enumerate(points):
+        store = LineStore(self.points)
+        self.assertEqual(6, len(store))
+
+        pairs = set()
+        for index in xrange(len(store)):
+            from_point = store.from_points[index]
+            to_point = store.other_point(index, from_point)
+            pairs.add(frozenset([from_point, to_point]))
+
+            line = Line(self.points[from_point], self.points[to_point])
+            self.assertAlmostEqual(line.distance, store.distances[index])
+            self.assertEqual(line.left_point, store.line(index).left_point)
             self.assertEqual(
-                expected_distances[i],
-                point_distance(*points_to_check)
+                line.left_point + line.right_point,
+                tuple(store.coordinates[:, index])
             )
+        self.assertEqual(6, len(pairs))
+
+    def test_closest_and_free(self):
+        """
+        Tests certain properties hold for the stored lines:
+        - Each point's closest lines come in order of distance
+        - Freeing a line removes it from both of its points' lines
+        - Points are reported as having no lines left once their last
+          line is freed
+        """
+        store = LineStore(self.points)
+        self.assertEqual([3, 3, 3, 3], list(store.remaining))
+
+        for point in xrange(len(self.points)):
+            distances = []
+            while store.remaining[point] > 0:
+                closest = store.closest(point)
+                distances.append(store.distances[closest])
+                other_point = store.other_point(closest, point)
+                other_remaining = store.remaining[other_point]
+
+                freed_points = store.free([closest])
+
+                self.assertEqual(other_remaining - 1,
+                                 store.remaining[other_point])
+                self.assertEqual(
+                    {p for p in [point, other_point]
+                     if store.remaining[p] == 0},
+                    set(freed_points)
+                )
+            self.assertEqual(sorted(distances), distances)
+        self.assertEqual(0, len(store))
+
+    def test_no_points(self):
+        """
+        Tests storing the lines between too few points to make any
+        """
+        for points in [[], [(0, 0)]]:
+            store = LineStore(points)
+            self.assertEqual(0, len(store))
+            self.assertEqual([0] * len(points), list(store.remaining))
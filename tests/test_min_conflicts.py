@@ -0,0 +1,83 @@
+import random
+import unittest
+
+from ai_graph_color import problem_generator
+from ai_graph_color.algorithm import LimitedAlgorithm
+from ai_graph_color.algorithms import min_conflicts
+from ai_graph_color.graph import Graph
+from ai_graph_color.indexed_set import IndexedSet
+from ai_graph_color.setup import Evaluation
+
+
+class TestMinConflicts(unittest.TestCase):
+    def test_conflict_table(self):
+        """
+        Tests that the table counts each color among each node's neighbors
+        """
+        graph = Graph([[1, 2, 3], [0, 2], [0, 1], [0]])
+        self.assertEqual(
+            [[0, 2, 1], [1, 0, 1], [1, 1, 0], [1, 0, 0]],
+            min_conflicts.conflict_table(graph, [0, 1, 2, 1], 3)
+        )
+
+    def test_recolor(self):
+        """
+        Tests that the table and the conflicted nodes stay the same as if
+        they were built from scratch as nodes are recolored
+        """
+        rng = random.Random(3)
+        graph = Graph(problem_generator.generate_graph(60, 'triangulation'))
+        coloring = [rng.randrange(4) for _ in graph]
+        table = min_conflicts.conflict_table(graph, coloring, 4)
+        conflicted = IndexedSet(
+            index for index in xrange(len(graph))
+            if table[index][coloring[index]] > 0
+        )
+
+        for _ in xrange(500):
+            min_conflicts.recolor(
+                graph, coloring, table, conflicted,
+                rng.randrange(len(graph)), rng.randrange(4)
+            )
+            self.assertEqual(
+                min_conflicts.conflict_table(graph, coloring, 4), table
+            )
+            self.assertEqual(
+                set(index for index in xrange(len(graph))
+                    if any(coloring[index] == coloring[neighbor]
+                           for neighbor in graph[index])),
+                set(conflicted)
+            )
+
+    def test_unknown_selection(self):
+        """
+        Tests that an unknown way of picking nodes is an error
+        """
+        limited = LimitedAlgorithm(
+            min_conflicts, [[1], [0]], Evaluation(),
+            {'colors': 2, 'selection': 'sideways'}
+        )
+        with self.assertRaises(Exception):
+            limited.next_output()
+
+    def test_finds_coloring(self):
+        """
+        Tests that the conflicts yielded match the coloring, and reach
+        none on a graph that is easy to color
+        """
+        random.seed(0)
+        graph = Graph(problem_generator.generate_graph(40, 'lazy', 2))
+        setup = Evaluation()
+        limited = LimitedAlgorithm(min_conflicts, graph, setup, {'colors': 5})
+
+        for limit in xrange(7, 50000, 7):
+            limited.set_limit(limit)
+            conflicts = limited.next_output()
+            self.assertEqual(conflicts, min_conflicts.num_conflicts_graph(
+                graph, setup.snapshot()['coloring']
+            ))
+            if setup.counter.counter < limit:
+                break
+        self.assertEqual(0, conflicts)
+        # one iteration to start, then one for each color at every step
+        self.assertEqual(0, (setup.counter.counter - 1) % 5)
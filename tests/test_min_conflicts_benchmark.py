@@ -0,0 +1,25 @@
+import unittest
+
+from ai_graph_color import min_conflicts_benchmark
+
+
+class TestMinConflictsBenchmark(unittest.TestCase):
+    def test_compare_selections(self):
+        """
+        Tests that each selection is run on every graph, and that picking
+        nodes with conflicts gets as far in fewer iterations
+        """
+        results = min_conflicts_benchmark.compare_selections(
+            200, 5, [0, 1], 50000
+        )
+
+        self.assertEqual(['conflicted', 'uniform'], sorted(results))
+        for runs in results.values():
+            self.assertEqual(2, len(runs))
+            for run in runs:
+                self.assertLessEqual(run['iterations'], 50000)
+                self.assertEqual(run['conflicts'] == 0, run['solved'])
+        self.assertLess(
+            sum(run['iterations'] for run in results['conflicted']),
+            sum(run['iterations'] for run in results['uniform'])
+        )
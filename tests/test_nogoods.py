@@ -0,0 +1,45 @@
+import unittest
+
+from ai_graph_color.algorithms.nogoods import NogoodStore
+
+
+class TestNogoodStore(unittest.TestCase):
+    def test_find(self):
+        """
+        Tests that a nogood is only found once coloring the vertex would
+        complete it
+        """
+        store = NogoodStore(4)
+        store.add(frozenset([(0, 1), (2, 0), (5, 1)]))
+
+        self.assertIsNone(store.find({0: 1}, 5, 1))
+        self.assertIsNone(store.find({0: 1, 2: 1}, 5, 1))
+        self.assertIsNone(store.find({0: 1, 2: 0}, 5, 2))
+        self.assertEqual(
+            frozenset([(0, 1), (2, 0), (5, 1)]),
+            store.find({0: 1, 2: 0}, 5, 1)
+        )
+        self.assertEqual(
+            {'hits': 1, 'misses': 3, 'evictions': 0, 'learned': 1},
+            store.stats
+        )
+
+    def test_least_recently_used_evicted(self):
+        """
+        Tests that the least recently learned or found nogood is evicted
+        once the store is full, and dropped from the index
+        """
+        store = NogoodStore(2)
+        first = frozenset([(0, 0), (1, 1)])
+        second = frozenset([(0, 0), (2, 1)])
+        third = frozenset([(3, 0), (4, 1)])
+        store.add(first)
+        store.add(second)
+        store.find({1: 1}, 0, 0)
+        store.add(third)
+
+        self.assertEqual([first, third], list(store.nogoods))
+        self.assertEqual(1, store.stats['evictions'])
+        self.assertNotIn((2, 1), store.index)
+        self.assertEqual(set([first]), store.index[(0, 0)])
+        self.assertIsNone(store.find({2: 1}, 0, 0))
@@ -0,0 +1,164 @@
+import itertools
+import unittest
+
+from ai_graph_color import problem_generator
+from ai_graph_color.algorithm import LimitedAlgorithm
+from ai_graph_color.algorithms import (
+    backtracking, backtracking_forward_checking, backtracking_mac
+)
+from ai_graph_color.algorithms.parallel_search import (
+    add_stats, search_subproblem, set_worker_graph, split
+)
+from ai_graph_color.counter import Counter
+from ai_graph_color.graph import Graph
+from ai_graph_color.setup import Evaluation
+
+graph = Graph([[1, 2, 3, 4, 5], [0, 2, 5], [0, 1, 3], [0, 2, 4], [0, 3, 5],
+               [0, 1, 4], [7], [6]])
+
+
+def colorings(graph, num_colors):
+    return [
+        colors for colors in itertools.product(xrange(num_colors),
+                                               repeat=len(graph))
+        if all(colors[vertex] != colors[neighbor]
+               for vertex, connections in enumerate(graph)
+               for neighbor in connections)
+    ]
+
+
+def is_coloring(graph, coloring):
+    return (len(coloring) == len(graph) and
+            all(coloring[vertex] != coloring[neighbor]
+                for vertex, connections in enumerate(graph)
+                for neighbor in connections))
+
+
+class TestParallelSearch(unittest.TestCase):
+    def test_split_partitions(self):
+        """
+        Tests that every coloring extends exactly one subproblem
+        """
+        for algorithm in [backtracking, backtracking_forward_checking]:
+            subproblems = split(graph, 4, algorithm.assign, Counter(), 20)
+            self.assertGreaterEqual(len(subproblems), 20)
+            for colors in colorings(graph, 4):
+                self.assertEqual(1, sum(
+                    all(colors[vertex] == color for vertex, color in prefix)
+                    for prefix in subproblems
+                ))
+
+    def test_split_limited(self):
+        """
+        Tests that splitting stops once the counter reaches its limit,
+        still leaving subproblems that every coloring extends exactly one
+        of
+        """
+        for limit in [1, 5, 30]:
+            counter = Counter()
+            counter.limit = limit
+            subproblems = split(graph, 4, backtracking.assign, counter, 20)
+            self.assertEqual(limit, counter.counter)
+            self.assertGreater(len(subproblems), 0)
+            for colors in colorings(graph, 4):
+                self.assertEqual(1, sum(
+                    all(colors[vertex] == color for vertex, color in prefix)
+                    for prefix in subproblems
+                ))
+
+    def test_add_stats(self):
+        """
+        Tests that the statistics each worker reports are added up
+        """
+        stats = {}
+        add_stats(stats, {'backjumping': {'skipped': 2}})
+        add_stats(stats, {'backjumping': {'skipped': 3},
+                          'nogoods': {'hits': 1, 'misses': 4}})
+        self.assertEqual({'backjumping': {'skipped': 5},
+                          'nogoods': {'hits': 1, 'misses': 4}}, stats)
+
+        limited = LimitedAlgorithm(
+            backtracking, graph, Evaluation(),
+            {'colors': 4, 'workers': 2, 'backjumping': True}
+        )
+        self.assertTrue(is_coloring(graph, limited.next_output()))
+        self.assertIn('skipped', limited.setup.stats['backjumping'])
+
+    def test_finds_coloring(self):
+        """
+        Tests that each algorithm colors a graph with several workers,
+        and gives up on one it can't color
+        """
+        for algorithm in [backtracking, backtracking_forward_checking,
+                          backtracking_mac]:
+            for num_colors, colorable in [(4, True), (3, False)]:
+                limited = LimitedAlgorithm(
+                    algorithm, graph, Evaluation(),
+                    {'colors': num_colors, 'workers': 2}
+                )
+                coloring = limited.next_output()
+                self.assertEqual(colorable, is_coloring(graph, coloring))
+                self.assertGreater(limited.setup.counter.counter, 0)
+
+    def test_preempted(self):
+        """
+        Tests that a parallel search can be resumed after being preempted
+        """
+        limited = LimitedAlgorithm(
+            backtracking, graph, Evaluation(), {'colors': 4, 'workers': 2}
+        )
+        limited.set_limit(1)
+        limited.next_output()
+        self.assertEqual(1, limited.setup.counter.counter)
+
+        limited.set_limit(None)
+        self.assertTrue(is_coloring(graph, limited.next_output()))
+
+    def test_limit_shared(self):
+        """
+        Tests that the iterations left are shared between the workers,
+        so that a preempted search doesn't take more than its limit
+        """
+        big_graph = Graph(
+            problem_generator.generate_graph(40, 'triangulation', 1)
+        )
+        limited = LimitedAlgorithm(
+            backtracking, big_graph, Evaluation(), {'colors': 4, 'workers': 2}
+        )
+        for limit in xrange(200, 20000, 100):
+            limited.set_limit(limit)
+            coloring = limited.next_output()
+            if limited.setup.counter.counter < limit:
+                break
+            self.assertEqual(limit, limited.setup.counter.counter)
+        self.assertTrue(is_coloring(big_graph, coloring))
+
+    def test_subproblem_resumed(self):
+        """
+        Tests that a subproblem a worker was preempted in is continued
+        from where it was, rather than searched again
+        """
+        big_graph = Graph(
+            problem_generator.generate_graph(40, 'triangulation', 1)
+        )
+        set_worker_graph(big_graph)
+        params = dict(backtracking.params, colors=4)
+        subproblem = split(big_graph, 4, backtracking.assign, Counter(),
+                           16)[4]
+        _, _, coloring, iterations, _, state = search_subproblem(
+            (0, backtracking.__name__, params, subproblem, None, None)
+        )
+        self.assertIsNone(state)
+
+        _, _, _, first, _, state = search_subproblem(
+            (1, backtracking.__name__, params, subproblem, None,
+             iterations // 2)
+        )
+        self.assertEqual(iterations // 2, first)
+        self.assertIsNotNone(state)
+        _, _, resumed, second, _, state = search_subproblem(
+            (2, backtracking.__name__, params, subproblem, state, None)
+        )
+        self.assertIsNone(state)
+        self.assertEqual(coloring, resumed)
+        self.assertEqual(iterations, first + second)
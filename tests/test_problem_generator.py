@@ -1,4 +1,7 @@
+import os
+import random
 import unittest
+from itertools import combinations
 
 from ai_graph_color import line, problem_generator
 
@@ -33,6 +36,18 @@ class TestProblemGenerator(unittest.TestCase):
                 )
             )
 
+    def test_read_and_write_csr_graph_to_file(self):
+        """
+        Tests that graphs written to .csr files are read back the same
+        """
+        graph = problem_generator.generate_graph(100, seed=4)
+        problem_generator.write_graph_to_file('test_csr.csr', graph)
+        try:
+            csr_graph = problem_generator.read_graph_from_file('test_csr.csr')
+            self.assertEqual(graph, csr_graph.to_lists())
+        finally:
+            os.remove(problem_generator.generate_file_path('test_csr.csr'))
+
     def test_generate_graph(self):
         """
         Tests generate graph
@@ -84,71 +99,200 @@ class TestProblemGenerator(unittest.TestCase):
                 len(problem_generator.scatter_points(num_point))
             )
 
-    def test_create_lines(self):
+    def test_build_graph_planar_and_maximal(self):
         """
-        Tests certain properties hold for the lines-map on sample points:
-        - The points indexed by a line's key are the same as the points
-          listed in the line
-        - The distance calculated in a mapped line matches the distance
-          between the points indexed by that line's key
-        - The line can be freed without exception
+        Tests that no two edges of a built graph cross, and that every
+        pair of unconnected points would cross an existing edge
         """
-        points = [(0.0, 0.0), (0.0, 3.0), (1.0, 1.0), (1.0, 5.0)]
-        lines = problem_generator.create_lines(points)
+        for build_mode in problem_generator.build_modes.itervalues():
+            for seed in xrange(3):
+                points = problem_generator.scatter_points(40, seed)
+                self.assert_planar_and_maximal(
+                    points, build_mode(points)
+                )
 
-        for pair, connecting_line in lines.items():
-            distance = line.point_distance(
-                *map(lambda i: points[i], pair)
+    def test_generate_graph_modes(self):
+        """
+        Tests generate graph in each mode, and with an unknown mode
+        """
+        for mode in problem_generator.build_modes:
+            self.assertEqual(
+                30, len(problem_generator.generate_graph(30, mode))
             )
+        with self.assertRaises(Exception):
+            problem_generator.generate_graph(30, 'unknown')
+
+    def test_build_graph_lazy_degenerate_points(self):
+        """
+        Tests building lazily from too few points to enclose any of them
+        """
+        for points in [[], [(0, 0)], [(0, 0), (1, 1)],
+                       [(0, 0), (1, 0), (2, 0)]]:
+            graph = problem_generator.build_graph_lazy(points)
+            self.assertEqual(len(points), len(graph))
+            self.assert_planar_and_maximal(points, graph)
+
+    def test_build_graph_lazy_integer_points(self):
+        """
+        Tests building lazily from points on a grid and from repeated
+        integer points, whose edges can overlap along a line
+        """
+        rng = random.Random(0)
+        for points in [
+                [(x, y) for x in xrange(4) for y in xrange(4)],
+                [(x, y) for x in xrange(5) for y in xrange(5)],
+                [(rng.randint(0, 6), rng.randint(0, 6))
+                 for _ in xrange(25)]]:
+            graph = problem_generator.build_graph_lazy(points, rng)
+            self.assertEqual(len(points), len(graph))
+            self.assert_planar_and_maximal(points, graph)
 
-            self.assertAlmostEqual(distance, connecting_line.distance)
+    def test_face_corners_overlapping_edges(self):
+        """
+        Tests that the walk around a face stops when overlapping edges
+        keep it from coming back to the edge it started from
+        """
+        points = [(0, 0), (1, 0), (2, 0), (1, 1)]
+        graph = [[1, 2], [0, 2, 3], [0, 1, 3], [1, 2]]
+        self.assertIsNone(
+            problem_generator.face_corners(graph, points, 0, 2)
+        )
+        self.assertEqual(
+            float('inf'),
+            problem_generator.enclosing_distance(graph, points, 0)
+        )
+
+    def test_enclosing_distance(self):
+        """
+        Tests the enclosing distance of points inside, on the corner of
+        and outside of a triangle
+        """
+        points = [(0.0, 0.0), (4.0, 0.0), (0.0, 4.0), (1.0, 1.0), (9.0, 9.0)]
+        graph = [[1, 2, 3], [0, 2, 3], [0, 1, 3], [0, 1, 2], []]
+
+        self.assertAlmostEqual(
+            line.point_distance(points[3], points[1]),
+            problem_generator.enclosing_distance(graph, points, 3)
+        )
+        for index in [0, 4]:
             self.assertEqual(
-                frozenset(map(lambda i: points[i], pair)),
-                frozenset([connecting_line.left_point,
-                           connecting_line.right_point])
+                float('inf'),
+                problem_generator.enclosing_distance(graph, points, index)
             )
-            connecting_line.free()  # should not raise any errors
 
-    def test_create_distance_list(self):
+    def test_thin_edges(self):
         """
-        Tests certain properties hold for the distance list:
-        - Lines in a linked-list are ordered by distance
-        - Each line described in a list uses the correct indexes
-        - Freeing a line removes it from the line-map and both of
-          the linked-lists in the distance-list
+        Tests that thinning removes the given fraction of edges without
+        leaving any vertex unconnected
         """
-        points = [(0.0, 0.0), (0.0, 3.0), (1.0, 1.0), (1.0, 5.0)]
-        lines = problem_generator.create_lines(points)
-        distance_list = problem_generator.create_distance_list(
-            lines, len(points)
+        graph = problem_generator.generate_graph(100, 'triangulation', 1)
+        num_edges = sum(len(connections) for connections in graph) / 2
+
+        thinned = problem_generator.generate_graph(
+            100, 'triangulation', 1, thinning=0.25
+        )
+        self.assertEqual(
+            num_edges - int(round(num_edges * 0.25)),
+            sum(len(connections) for connections in thinned) / 2
         )
+        for connections, thinned_connections in zip(graph, thinned):
+            self.assertGreater(len(thinned_connections), 0)
+            self.assertTrue(set(thinned_connections) <= set(connections))
 
-        for src_index, connections in enumerate(distance_list):
-            distances = map(lambda i: i[1].distance, connections)
-            self.assertTrue(all(
-                distances[i] <= distances[i + 1]
-                for i in xrange(len(distances) - 1)
-            ))
+        star = [[1, 2, 3], [0], [0], [0]]
+        problem_generator.thin_edges(star, 1.0)
+        self.assertEqual([[1, 2, 3], [0], [0], [0]], star)
 
-            for dst_index, connecting_line in connections:
-                self.assertEqual(
-                    frozenset(map(lambda i: points[i],
-                                  [src_index, dst_index])),
-                    frozenset([connecting_line.left_point,
-                               connecting_line.right_point])
+    def test_grow_graph(self):
+        """
+        Tests that growing a graph keeps its edges, and the grown graph is
+        planar and maximal
+        """
+        points = problem_generator.scatter_points(40, 6)
+        new_points = problem_generator.scatter_points(25, 7)
+        for build_mode in problem_generator.build_modes.values():
+            graph = build_mode(points)
+            grown_graph = problem_generator.grow_graph(
+                graph, points, new_points
+            )
+
+            self.assertEqual(65, len(grown_graph))
+            for connections, grown_connections in zip(graph, grown_graph):
+                self.assertTrue(set(connections) <= set(grown_connections))
+            self.assert_planar_and_maximal(points + new_points, grown_graph)
+
+    def test_generate_nested_graphs(self):
+        """
+        Tests that each nested graph contains the one before it
+        """
+        previous_graph = []
+        for size, (points, graph) in zip(
+                [0, 10, 20, 40], problem_generator.generate_nested_graphs(
+                    [0, 10, 20, 40], 8, random.Random())):
+            self.assertEqual(size, len(points))
+            self.assertEqual(size, len(graph))
+            for connections, previous_connections in zip(
+                    graph, previous_graph):
+                self.assertTrue(
+                    set(previous_connections) <= set(connections)
                 )
+            self.assert_planar_and_maximal(points, graph)
+            previous_graph = graph
+
+    def test_grow_graph_integer_points(self):
+        """
+        Tests growing nested graphs the way generate_nested_graphs does
+        from the points of a grid and repeated integer points, some of
+        which land on edges already in the graph
+        """
+        rng = random.Random(2)
+        all_points = [(x, y) for x in xrange(5) for y in xrange(5)]
+        rng.shuffle(all_points)
+        all_points.extend(
+            (rng.randint(0, 6), rng.randint(0, 6)) for _ in xrange(15)
+        )
 
-        for connections in distance_list:
-            for other_index, connecting_line in connections:
-                first_list_size = len(connections)
-                other_list_size = len(distance_list[other_index])
-                lines_size = len(lines)
+        points, graph = [], []
+        for size in [5, 15, 25, 40]:
+            grown_graph = problem_generator.grow_graph(
+                graph, points, all_points[len(points):size], rng
+            )
+            self.assertEqual(size, len(grown_graph))
+            for connections, grown_connections in zip(graph, grown_graph):
+                self.assertTrue(set(connections) <= set(grown_connections))
+            points, graph = all_points[:size], grown_graph
+            self.assert_planar(points, graph)
+
+    def assert_planar(self, points, graph):
+        edges = [
+            line.Line(points[from_index], points[to_index])
+            for from_index, connections in enumerate(graph)
+            for to_index in connections if from_index < to_index
+        ]
+        for edge_a, edge_b in combinations(edges, 2):
+            self.assertFalse(edge_a.intersects(edge_b))
+        return edges
 
-                connecting_line.free()
+    def assert_planar_and_maximal(self, points, graph):
+        edges = self.assert_planar(points, graph)
 
-                self.assertEqual(first_list_size - 1, len(connections))
-                self.assertEqual(other_list_size - 1,
-                                 len(distance_list[other_index]))
-                self.assertEqual(lines_size - 1, len(lines))
-            self.assertEquals(0, len(connections))
-        self.assertEquals(0, len(lines))
+        for from_index, to_index in combinations(xrange(len(points)), 2):
+            if to_index not in graph[from_index]:
+                unconnected = line.Line(points[from_index], points[to_index])
+                self.assertTrue(any(
+                    unconnected.intersects(edge) for edge in edges
+                ))
+
+    def test_generate_graph_seeded(self):
+        """
+        Tests that graphs generated with the same seed are the same,
+        whatever the state of the global random number generator
+        """
+        for mode in problem_generator.build_modes:
+            graph = problem_generator.generate_graph(
+                50, mode, 5, random.Random()
+            )
+            random.seed(1)
+            self.assertEqual(graph, problem_generator.generate_graph(
+                50, mode, 5, random.Random()
+            ))
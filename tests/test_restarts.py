@@ -0,0 +1,30 @@
+import itertools
+import unittest
+
+from ai_graph_color.algorithms.restarts import luby, restart_schedule
+
+
+class TestRestarts(unittest.TestCase):
+    def test_luby(self):
+        """
+        Tests the start of the Luby sequence
+        """
+        self.assertEqual(
+            [1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8, 1],
+            [luby(index) for index in xrange(16)]
+        )
+
+    def test_restart_schedule(self):
+        """
+        Tests the run lengths of each kind of schedule
+        """
+        self.assertIsNone(restart_schedule(None, 100, 1.5))
+        self.assertEqual(
+            [10, 10, 20, 10, 10, 20, 40],
+            list(itertools.islice(restart_schedule('luby', 10, 1.5), 7))
+        )
+        self.assertEqual(
+            [10, 15, 22, 33],
+            list(itertools.islice(restart_schedule('geometric', 10, 1.5), 4))
+        )
+        self.assertRaises(Exception, restart_schedule, 'linear', 10, 1.5)
@@ -0,0 +1,69 @@
+import random
+import unittest
+
+from ai_graph_color.algorithms.saturation import SaturationQueue
+from ai_graph_color.graph import Graph
+
+
+def scan_next_vertex(graph, coloring):
+    """
+    Finds the vertex the queue should pick by scanning every vertex
+    """
+    candidates = [
+        (len(set(coloring[neighbor] for neighbor in graph[vertex]
+                 if neighbor in coloring)),
+         graph.degrees[vertex], vertex)
+        for vertex in xrange(len(graph)) if vertex not in coloring
+    ]
+    return max(candidates)[2] if candidates else None
+
+
+class TestSaturationQueue(unittest.TestCase):
+    def test_next_vertex_matches_scan(self):
+        """
+        Tests that the queue picks the same vertex as scanning the graph
+        while vertices are colored, recolored and uncolored
+        """
+        graph = Graph([[1, 2, 3], [0, 2], [0, 1, 3, 4], [0, 2], [2], []])
+        queue = SaturationQueue(graph, 3)
+        steps = [('assign', 2, 0), ('assign', 0, 1), ('assign', 3, 2),
+                 ('assign', 0, 2), ('unassign', 2), ('assign', 5, 1),
+                 ('unassign', 0), ('assign', 1, 1), ('assign', 4, 0)]
+
+        self.assertEqual(2, queue.next_vertex())
+        for step in steps:
+            getattr(queue, step[0])(*step[1:])
+            self.assertEqual(
+                scan_next_vertex(graph, queue.coloring), queue.next_vertex()
+            )
+
+    def test_rebuild_when_stale(self):
+        """
+        Tests that out of date entries are cleared out
+        """
+        graph = Graph([[1], [0]])
+        queue = SaturationQueue(graph, 2)
+        for _ in xrange(200):
+            queue.assign(0, 0)
+            queue.assign(0, 1)
+            queue.unassign(0)
+        self.assertLessEqual(queue.num_entries, 2 * len(graph) + 65)
+        self.assertEqual(1, queue.next_vertex())
+        queue.assign(1, 0)
+        queue.assign(0, 1)
+        self.assertIsNone(queue.next_vertex())
+
+    def test_randomize_ties(self):
+        """
+        Tests that randomized ties still pick a vertex with the highest
+        saturation and degree, and can pick each of the tied vertices
+        """
+        graph = Graph([[1, 2, 3], [0], [0], [0], [5], [4]])
+        queue = SaturationQueue(graph, 3)
+        queue.assign(0, 0)
+        picked = set()
+        random.seed(0)
+        for _ in xrange(50):
+            queue.randomize_ties()
+            picked.add(queue.next_vertex())
+        self.assertEqual(set([1, 2, 3]), picked)
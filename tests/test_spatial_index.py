@@ -0,0 +1,141 @@
+import unittest
+from itertools import combinations
+
+from ai_graph_color import problem_generator
+from ai_graph_color.line import Line, LineStore, point_distance
+from ai_graph_color.spatial_index import LineGrid, PointGrid, SegmentGrid
+
+
+class TestSegmentGrid(unittest.TestCase):
+    def test_init_degenerate_points(self):
+        """
+        Tests that a grid can be made when the points have no area
+        """
+        for points in [[], [(0, 0)], [(1, 1), (1, 1)], [(0, 0), (0, 5)]]:
+            grid = SegmentGrid(points)
+            self.assertGreater(grid.cell_width, 0)
+            self.assertGreater(grid.cell_height, 0)
+            self.assertFalse(grid.crosses(Line((0, 0), (1, 1))))
+
+    def test_column_and_row_clamped(self):
+        """
+        Tests that coordinates outside of the grid map to its border
+        """
+        grid = SegmentGrid([(0, 0), (1, 1)], 4)
+        self.assertEqual(0, grid.column(-10))
+        self.assertEqual(3, grid.column(10))
+        self.assertEqual(0, grid.row(-10))
+        self.assertEqual(3, grid.row(10))
+        self.assertEqual(1, grid.column(0.3))
+        self.assertEqual(2, grid.row(0.6))
+
+    def test_crosses(self):
+        """
+        Tests crossings are found, while touching segments don't cross
+        """
+        grid = SegmentGrid([(0, 0), (1, 1)], 8)
+        grid.add(Line((0, 0), (1, 1)))
+
+        self.assertTrue(grid.crosses(Line((0, 1), (1, 0))))
+        self.assertTrue(grid.crosses(Line((0.4, 0.6), (0.6, 0.4))))
+        self.assertFalse(grid.crosses(Line((0, 1), (0.4, 0.6))))
+        self.assertFalse(grid.crosses(Line((0, 0), (1, 0))))
+        self.assertFalse(grid.crosses(Line((0.5, 0.5), (1, 0))))
+
+    def test_crosses_matches_brute_force(self):
+        """
+        Tests that the grid agrees with checking every stored segment
+        """
+        points = problem_generator.scatter_points(40, 7)
+        segments = [
+            Line(points[a], points[b])
+            for a, b in combinations(xrange(len(points)), 2)
+        ]
+
+        grid = SegmentGrid(points)
+        stored = segments[::37]
+        for segment in stored:
+            grid.add(segment)
+
+        for segment in segments:
+            self.assertEqual(
+                any(segment.intersects(other) for other in stored),
+                grid.crosses(segment)
+            )
+
+
+class TestPointGrid(unittest.TestCase):
+    def test_closest_in_order(self):
+        """
+        Tests that every other point is generated, closest first
+        """
+        points = problem_generator.scatter_points(60, 3)
+        grid = PointGrid(points)
+
+        for index, point in enumerate(points):
+            self.assertEqual(
+                sorted(
+                    (point_distance(point, other), other_index)
+                    for other_index, other in enumerate(points)
+                    if other_index != index
+                ),
+                list(grid.closest(index))
+            )
+
+    def test_closest_degenerate_points(self):
+        """
+        Tests closest points when the points have no area
+        """
+        self.assertEqual([], list(PointGrid([(0, 0)]).closest(0)))
+        self.assertEqual(
+            [(0, 1)], list(PointGrid([(1, 1), (1, 1)]).closest(0))
+        )
+
+    def test_ring(self):
+        """
+        Tests that rings are clipped to the grid
+        """
+        grid = PointGrid([(0, 0), (1, 1)], 3)
+        self.assertEqual([4], list(grid.ring(1, 1, 0)))
+        self.assertEqual(
+            [0, 1, 2, 3, 5, 6, 7, 8], sorted(grid.ring(1, 1, 1))
+        )
+        self.assertEqual([2, 5, 6, 7, 8], sorted(grid.ring(0, 0, 2)))
+        self.assertEqual([], list(grid.ring(1, 1, 2)))
+
+
+class TestLineGrid(unittest.TestCase):
+    def test_intersecting_matches_line_store(self):
+        """
+        Tests that the grid finds the same lines as checking every line
+        left in the store, as lines are freed
+        """
+        points = problem_generator.scatter_points(60, 5)
+        points += [(0.5, 0.5), (0.5, 0.9), (0.1, 0.5)]
+        for cells_per_side in [None, 1, 7]:
+            store = LineStore(points)
+            grid = LineGrid(LineStore(points), cells_per_side)
+            for index in xrange(0, len(store), 13):
+                segment = store.line(index)
+                self.assertEqual(
+                    list(store.intersecting(segment)),
+                    list(grid.intersecting(segment))
+                )
+                grid.lines.free(grid.intersecting(segment))
+                store.free(store.intersecting(segment))
+
+    def test_degenerate_points(self):
+        """
+        Tests that lines between points with no area are bucketed
+        """
+        for points in [[], [(0, 0)], [(1, 1), (1, 1)],
+                       [(0, 0), (0, 5), (0, 2)], [(0, 0), (3, 0), (1, 0)]]:
+            grid = LineGrid(LineStore(points), 4)
+            self.assertEqual(
+                len(LineStore(points)),
+                len(set().union(*(cell.tolist() for cell in grid.cells)))
+            )
+            for index in xrange(len(grid.lines)):
+                self.assertEqual(
+                    [], list(grid.intersecting(grid.lines.line(index)))
+                )
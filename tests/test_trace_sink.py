@@ -0,0 +1,92 @@
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+
+from ai_graph_color import trace_sink
+from ai_graph_color.algorithms import backtracking
+from ai_graph_color.graph import Graph
+from ai_graph_color.setup import TestRun
+from ai_graph_color.trace_sink import (
+    TraceHandler, TraceWriter, chunk_path, format_event, read_trace
+)
+
+
+class TestTraceSink(unittest.TestCase):
+    def setUp(self):
+        self.trace_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.trace_dir, 'trace.jsonl.gz')
+
+    def tearDown(self):
+        shutil.rmtree(self.trace_dir)
+
+    def log_events(self, writer, num_events):
+        logger = logging.getLogger(self.path)
+        logger.setLevel(logging.DEBUG)
+        logger.propagate = False
+        handler = TraceHandler(writer)
+        logger.addHandler(handler)
+        try:
+            for index in range(num_events):
+                logger.debug('Coloring node: %s color: %s', index, 2,
+                             extra={'event': 'decision'})
+            logger.debug('Finished, final coloring: %s', {0: 1})
+        finally:
+            handler.close()
+            logger.removeHandler(handler)
+
+    def test_is_trace_path(self):
+        """
+        Tests that only paths ending in .jsonl.gz are traces
+        """
+        self.assertTrue(trace_sink.is_trace_path('run.jsonl.gz'))
+        self.assertFalse(trace_sink.is_trace_path('run.txt'))
+        self.assertEqual('run.0012.jsonl.gz', chunk_path('run.jsonl.gz', 12))
+
+    def test_read_trace(self):
+        """
+        Tests that events are read back in order, with their arguments
+        """
+        self.log_events(TraceWriter(self.path), 2500)
+
+        events = list(read_trace(self.path))
+        self.assertEqual(2501, len(events))
+        self.assertEqual('decision', events[7]['event'])
+        self.assertEqual([7, 2], events[7]['args'])
+        self.assertEqual('Coloring node: 7 color: 2', format_event(events[7]))
+        self.assertEqual('message', events[-1]['event'])
+        # logging unpacks a lone dict, and JSON only has string keys
+        self.assertEqual({'0': 1}, events[-1]['args'])
+
+    def test_chunks(self):
+        """
+        Tests that a trace is split into chunks once one is full, and that
+        the chunks of an older trace at the same path are removed
+        """
+        self.log_events(TraceWriter(self.path, chunk_bytes=1000), 3000)
+        self.assertTrue(os.path.exists(chunk_path(self.path, 2)))
+        self.assertEqual(3001, len(list(read_trace(self.path))))
+
+        self.log_events(TraceWriter(self.path), 10)
+        self.assertFalse(os.path.exists(chunk_path(self.path, 1)))
+        self.assertEqual(11, len(list(read_trace(self.path))))
+
+    def test_test_run(self):
+        """
+        Tests that a TestRun given a trace path writes the algorithm's
+        decisions to the trace
+        """
+        test_run = TestRun(self.path)
+        graph = Graph([[1, 2], [0, 2], [0, 1]])
+        coloring = next(backtracking.run(
+            graph, test_run, dict(backtracking.params, colors=3)
+        ))
+        test_run.close()
+
+        self.assertEqual(3, len(coloring))
+        events = [event['event'] for event in read_trace(self.path)]
+        # every decision that didn't stand was backtracked out of
+        self.assertEqual(
+            3, events.count('decision') - events.count('backtrack')
+        )
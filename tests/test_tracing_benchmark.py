@@ -0,0 +1,54 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from ai_graph_color import problem_generator, tracing_benchmark
+from ai_graph_color.algorithms import backtracking, min_conflicts
+from ai_graph_color.graph import Graph
+from ai_graph_color.setup import Evaluation, TestRun
+from ai_graph_color.trace_sink import read_trace
+
+
+class TestTracingBenchmark(unittest.TestCase):
+    def setUp(self):
+        self.trace_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.trace_dir)
+
+    def test_tracing(self):
+        """
+        Tests that only a TestRun traces
+        """
+        test_run = TestRun(os.path.join(self.trace_dir, 'trace.txt'))
+        self.assertTrue(test_run.tracing)
+        self.assertFalse(Evaluation().tracing)
+        test_run.close()
+
+    def test_compare_setups(self):
+        """
+        Tests that each algorithm is measured with every setup, and the
+        TestRuns write their traces
+        """
+        problem = Graph(problem_generator.generate_graph(30, 'lazy', 1))
+        results = tracing_benchmark.compare_setups(
+            [backtracking, min_conflicts], problem, {'colors': 4}, 200,
+            self.trace_dir
+        )
+
+        self.assertEqual(['backtracking', 'min_conflicts'], sorted(results))
+        for name, result in results.items():
+            for setup_name in ['evaluation', 'test_run', 'trace_sink']:
+                self.assertLessEqual(
+                    result[setup_name]['iterations'], 200
+                )
+                self.assertGreater(result[setup_name]['per_second'], 0)
+            for setup_name in ['test_run', 'trace_sink']:
+                self.assertGreater(result[setup_name]['slowdown'], 0)
+            self.assertGreater(os.path.getsize(
+                os.path.join(self.trace_dir, '{}.txt'.format(name))
+            ), 0)
+            self.assertGreater(len(list(read_trace(
+                os.path.join(self.trace_dir, name + '.jsonl.gz')
+            ))), 0)
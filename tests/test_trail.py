@@ -0,0 +1,41 @@
+import unittest
+
+from ai_graph_color.algorithms.saturation import SaturationQueue
+from ai_graph_color.algorithms.trail import Trail
+from ai_graph_color.graph import Graph
+
+
+class TestTrail(unittest.TestCase):
+    def test_undo_to_mark(self):
+        """
+        Tests that undoing to a mark reverses only the changes made
+        after it, including repeated changes to one domain
+        """
+        graph = Graph([[1, 2], [0, 2], [0, 1]])
+        queue = SaturationQueue(graph, 3)
+        trail = Trail([7, 7, 7], queue)
+
+        trail.assign(0, 0)
+        trail.set_domain(0, 1)
+        first = trail.mark()
+        trail.set_domain(1, 6)
+        trail.assign(1, 1)
+        trail.set_domain(2, 4)
+        trail.set_domain(1, 2)
+        second = trail.mark()
+        trail.assign(2, 2)
+
+        trail.undo(second)
+        self.assertEqual({0: 0, 1: 1}, queue.coloring)
+        self.assertEqual([1, 2, 4], trail.domains)
+
+        trail.undo(first)
+        self.assertEqual({0: 0}, queue.coloring)
+        self.assertEqual([1, 7, 7], trail.domains)
+        self.assertEqual(1, queue.saturation[1])
+        self.assertEqual(first, trail.mark())
+
+        trail.undo(0)
+        self.assertEqual({}, queue.coloring)
+        self.assertEqual([7, 7, 7], trail.domains)
+        self.assertEqual([0, 0, 0], queue.saturation)
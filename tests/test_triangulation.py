@@ -0,0 +1,99 @@
+import unittest
+from itertools import combinations
+
+from ai_graph_color import problem_generator
+from ai_graph_color.line import Line
+from ai_graph_color.triangulation import (
+    Triangulation, delaunay_graph, insertion_order
+)
+
+
+def hull_size(points):
+    """
+    Counts the corners of the convex hull of a set of points
+    """
+    def turn(a, b, c):
+        return (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+
+    points = sorted(set(points))
+    chains = []
+    for ordered in [points, points[::-1]]:
+        chain = []
+        for point in ordered:
+            while len(chain) >= 2 and turn(chain[-2], chain[-1], point) <= 0:
+                chain.pop()
+            chain.append(point)
+        chains.append(chain)
+    return len(chains[0]) + len(chains[1]) - 2
+
+
+class TestTriangulation(unittest.TestCase):
+    def test_delaunay_graph(self):
+        """
+        Tests that the triangulation is planar, has every edge of a
+        triangulation and has empty circumcircles
+        """
+        for seed in xrange(5):
+            points = problem_generator.scatter_points(60, seed)
+            triangulation = Triangulation(points)
+            graph = triangulation.graph()
+
+            edges = [
+                Line(points[from_index], points[to_index])
+                for from_index, connections in enumerate(graph)
+                for to_index in connections if from_index < to_index
+            ]
+            self.assertEqual(3 * 60 - 3 - hull_size(points), len(edges))
+            for edge_a, edge_b in combinations(edges, 2):
+                self.assertFalse(edge_a.intersects(edge_b))
+
+            vertices = triangulation.vertices
+            for position in xrange(0, len(vertices), 3):
+                corners = vertices[position:position + 3]
+                if max(corners) < len(points):
+                    self.assertFalse(any(
+                        triangulation.in_circle(*(corners + [index]))
+                        for index in xrange(len(points))
+                    ))
+
+    def test_delaunay_graph_hull_edges(self):
+        """
+        Tests that large triangulations keep every edge of the convex
+        hull, however thin the triangles along it are
+        """
+        for seed in [1, 3]:
+            points = problem_generator.scatter_points(10000, seed)
+            graph = delaunay_graph(points)
+            self.assertEqual(
+                3 * 10000 - 3 - hull_size(points),
+                sum(len(connections) for connections in graph) / 2
+            )
+
+    def test_delaunay_graph_degenerate_points(self):
+        """
+        Tests triangulating too few points, duplicate points, collinear
+        points and a grid of cocircular points
+        """
+        self.assertEqual([], delaunay_graph([]))
+        self.assertEqual([[]], delaunay_graph([(1, 1)]))
+        self.assertEqual([[1], [0]], delaunay_graph([(0, 0), (1, 1)]))
+        self.assertEqual(
+            [[1], [0], []], delaunay_graph([(0, 0), (1, 1), (1, 1)])
+        )
+        self.assertEqual(
+            [[1], [0, 2], [1]], delaunay_graph([(0, 0), (1, 0), (2, 0)])
+        )
+
+        points = [(x, y) for x in xrange(6) for y in xrange(6)]
+        graph = delaunay_graph(points)
+        self.assertEqual(
+            3 * 36 - 3 - 20, sum(len(connections) for connections in graph) / 2
+        )
+
+    def test_insertion_order(self):
+        """
+        Tests that every point is inserted once
+        """
+        points = problem_generator.scatter_points(100, 1)
+        self.assertEqual(range(100), sorted(insertion_order(points)))
+        self.assertEqual([], insertion_order([]))